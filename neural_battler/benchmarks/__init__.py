@@ -0,0 +1 @@
+# neural_battler/benchmarks/__init__.py
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# neural_battler/benchmarks/bench.py
+"""
+Micro-benchmarks des chemins chauds de la simulation.
+
+Chaque scénario est construit avec une graine fixe, exécuté `iterations` fois
+(meilleur de `repeat` essais) et mesuré en opérations par seconde. Les résultats
+sont écrits en JSON et comparés à une référence (baseline.json): un scénario
+régresse si son débit tombe de plus de `threshold` (fraction) sous la référence.
+Les débits ne sont comparables que sur la machine de la référence (bloc "machine"):
+ailleurs, les ratios sont affichés à titre indicatif et aucune régression n'est signalée.
+
+    python benchmarks/bench.py                      # exécute et compare à baseline.json
+    python benchmarks/bench.py --only tissue_update # sous-ensemble (préfixe de nom)
+    python benchmarks/bench.py --update-baseline    # enregistre la référence de cette machine
+    BENCH_TIMING=1 python -m pytest benchmarks      # un test par scénario (sinon ignorés)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.game.world.tissue import Tissue  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "latest.json")
+DEFAULT_THRESHOLD = 0.25
+SEED = 1234
+WIDTH, HEIGHT = 800, 600
+
+
+def _seed(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    return np.random.default_rng(seed)
+
+
+def _populated_tissue(num_pathogens, engine="object", seed=SEED):
+    """Tissu avec un lymphocyte au centre et `num_pathogens` pathogènes placés au hasard"""
+    rng = _seed(seed)
+    tissue = Tissue(WIDTH, HEIGHT, engine=engine)
+    tissue.add_immune_cell(WIDTH / 2, HEIGHT / 2, "t_cell")
+    for x, y in zip(rng.uniform(50, WIDTH - 50, num_pathogens), rng.uniform(50, HEIGHT - 50, num_pathogens)):
+        tissue.add_pathogen(float(x), float(y), "bacteria")
+    return tissue
+
+
+# ----------------------------------------------------------------------
+# Scénarios: setup() → (opération, opérations par appel)
+# ----------------------------------------------------------------------
+def tissue_update(num_pathogens, engine):
+    def setup():
+        return _populated_tissue(num_pathogens, engine).update, 1
+    return setup
+
+
+def nearby_queries(num_pathogens=200, num_queries=1000, radius=100):
+    def setup():
+        tissue = _populated_tissue(num_pathogens)
+        rng = np.random.default_rng(SEED + 1)
+        points = np.column_stack([rng.uniform(0, WIDTH, num_queries), rng.uniform(0, HEIGHT, num_queries)]).tolist()
+
+        def run():
+            for x, y in points:
+                tissue.get_nearby_pathogens(x, y, radius)
+        return run, num_queries
+    return setup
+
+
+def dense_projectiles(num_projectiles=2000, num_pathogens=200):
+    def setup():
+        tissue = _populated_tissue(num_pathogens)
+        rng = np.random.default_rng(SEED + 2)
+        pool = tissue.projectiles
+
+        def refill():
+            # Dégâts nuls: les pathogènes restent en place, seuls les projectiles sortis ou ayant touché sont remplacés
+            missing = num_projectiles - len(pool)
+            xs, ys = rng.uniform(0, WIDTH, missing), rng.uniform(0, HEIGHT, missing)
+            angles = rng.uniform(0, 2 * np.pi, missing)
+            for x, y, angle in zip(xs.tolist(), ys.tolist(), angles.tolist()):
+                pool.spawn(x, y, 3 * np.cos(angle), 3 * np.sin(angle), 0, 5)
+
+        def run():
+            refill()
+            tissue.update_projectiles()
+        return run, 1
+    return setup
+
+
+def agent_get_state(num_pathogens=20):
+    def setup():
+        from src.ai.models.immune_cell_model import ImmuneCellAgent
+        tissue = _populated_tissue(num_pathogens)
+        agent = ImmuneCellAgent(28, memory_size=1)
+        cell = tissue.immune_cells[0]
+        pathogens = tissue.pathogens
+
+        def run():
+            agent.get_state(cell, pathogens, WIDTH, HEIGHT)
+        return run, 1
+    return setup
+
+
+def threaded_tissues(num_threads=16, ticks=100, server=False, num_pathogens=20):
+    """
+    num_threads tissus avec un lymphocyte IA (politique torch), chacun avancé dans son thread.
+    server=True: décisions regroupées par un InferenceServer commun (un forward par lot
+    au lieu d'un par tissu et par tick).
+    """
+    def setup():
+        import tempfile
+        import threading
+        from src.ai.inference import ImmuneCellController, InferenceServer, get_model_registry
+        from src.ai.models.immune_cell_model import ImmuneCellAgent
+
+        _seed(SEED)
+        with tempfile.TemporaryDirectory() as directory:
+            model_path = os.path.join(directory, "model.pt")
+            ImmuneCellAgent(28, memory_size=1).save(model_path)
+            inference_server = (InferenceServer(get_model_registry().get(model_path, "torch"), max_wait=0.0)
+                                if server else None)
+            tissues = []
+            for i in range(num_threads):
+                tissue = _populated_tissue(num_pathogens, seed=SEED + i)
+                cell = tissue.immune_cells[0]
+                cell.controller = ImmuneCellController(model_path, backend="torch", server=inference_server)
+                cell.ai_controlled = True
+                tissues.append(tissue)
+
+        def advance(tissue):
+            for _ in range(ticks):
+                tissue.update()
+
+        def run():
+            threads = [threading.Thread(target=advance, args=(tissue,)) for tissue in tissues]
+            if inference_server is not None:
+                inference_server.start()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if inference_server is not None:
+                inference_server.stop()
+        return run, num_threads * ticks
+    return setup
+
+
+# nom → (setup, itérations, unité)
+SCENARIOS = {}
+for _engine in ("object", "vectorized"):
+    for _count, _iterations in ((5, 2000), (20, 1000), (200, 300), (2000, 50)):
+        SCENARIOS[f"tissue_update[{_engine},p={_count}]"] = (tissue_update(_count, _engine), _iterations, "ticks/s")
+SCENARIOS["get_nearby_pathogens[p=200]"] = (nearby_queries(), 20, "requêtes/s")
+SCENARIOS["update_projectiles[q=2000,p=200]"] = (dense_projectiles(), 200, "mises à jour/s")
+SCENARIOS["agent_get_state[p=20]"] = (agent_get_state(), 5000, "appels/s")
+SCENARIOS["threaded_tissues[torch,t=16,direct]"] = (threaded_tissues(), 5, "ticks/s")
+SCENARIOS["threaded_tissues[torch,t=16,server]"] = (threaded_tissues(server=True), 5, "ticks/s")
+
+
+def run_scenario(name, repeat=3):
+    """Meilleur débit (opérations/s) sur `repeat` essais, chacun reconstruit avec la même graine"""
+    setup, iterations, unit = SCENARIOS[name]
+    best = 0.0
+    for _ in range(repeat):
+        run, ops_per_call = setup()
+        for _ in range(3):  # Échauffement (caches, allocations paresseuses)
+            run()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - start
+        best = max(best, iterations * ops_per_call / elapsed)
+    return {"rate": best, "unit": unit}
+
+
+def run_benchmarks(names=None, repeat=3):
+    names = list(SCENARIOS) if names is None else names
+    return {name: run_scenario(name, repeat) for name in names}
+
+
+def machine_info():
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "processor": platform.processor() or platform.platform()}
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def load_baseline_machine(path=BASELINE_PATH):
+    """Bloc "machine" de la référence (None si absent)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("machine")
+
+
+def same_machine(reference):
+    """Vrai si la référence a été mesurée sur une machine identique à celle-ci"""
+    return reference == machine_info()
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": datetime.now().isoformat(timespec="seconds"), "seed": SEED,
+                   "machine": machine_info(), "results": results}, f, indent=4, ensure_ascii=False)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """{nom: ratio débit/référence} des scénarios en régression de plus de `threshold`"""
+    regressions = {}
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference and result["rate"] < reference["rate"] * (1 - threshold):
+            regressions[name] = result["rate"] / reference["rate"]
+    return regressions
+
+
+def format_results(results, baseline):
+    lines = [f"{'scénario':>36} {'débit':>14} {'référence':>14} {'ratio':>7}"]
+    for name, result in results.items():
+        reference = baseline.get(name)
+        ratio = f"{result['rate'] / reference['rate']:>7.2f}" if reference else f"{'-':>7}"
+        reference = f"{reference['rate']:>14,.0f}" if reference else f"{'-':>14}"
+        lines.append(f"{name:>36} {result['rate']:>14,.0f} {reference} {ratio}  {result['unit']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de la simulation")
+    parser.add_argument("--only", type=str, nargs="+", default=None,
+                        help="Préfixes des scénarios à exécuter (par défaut: tous)")
+    parser.add_argument("--repeat", type=int, default=3, help="Essais par scénario (meilleur retenu)")
+    parser.add_argument("--output", type=str, default=RESULTS_PATH, help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", type=str, default=BASELINE_PATH, help="Fichier JSON de référence")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Baisse de débit tolérée avant de signaler une régression (fraction)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Enregistrer ces résultats comme nouvelle référence")
+    args = parser.parse_args(argv)
+
+    names = [name for name in SCENARIOS if args.only is None or any(name.startswith(p) for p in args.only)]
+    results = run_benchmarks(names, args.repeat)
+    write_results(results, args.output)
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+    print(f"Résultats écrits dans: {args.output}")
+
+    if args.update_baseline:
+        write_results(dict(baseline, **results), args.baseline)
+        print(f"Référence mise à jour: {args.baseline}")
+        return 0
+
+    reference_machine = load_baseline_machine(args.baseline)
+    if baseline and not same_machine(reference_machine):
+        print(f"Référence mesurée sur une autre machine ({reference_machine}): ratios indicatifs, "
+              f"régressions non vérifiées")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, ratio in regressions.items():
+        print(f"Régression: {name} à {ratio:.0%} de la référence (seuil {1 - args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
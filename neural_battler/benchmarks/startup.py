@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# neural_battler/benchmarks/startup.py
+"""
+Budget de démarrage à froid des points d'entrée.
+
+Chaque entrée est lancée dans un interpréteur neuf avec `python -X importtime`;
+le temps d'import retenu est la somme des durées cumulées des imports de premier
+niveau (meilleur de `repeat` lancements). Deux vérifications:
+- aucun module lourd interdit pour l'entrée n'est chargé (torch, matplotlib, pygame...);
+- le temps d'import ne dépasse pas le budget (startup_budget.json) de plus de `threshold`.
+La seconde n'a de sens que sur la machine du budget (bloc "machine"): ailleurs, seuls
+les modules interdits sont vérifiés.
+
+    python benchmarks/startup.py                    # mesure et compare au budget
+    python benchmarks/startup.py --update-budget    # enregistre le budget de cette machine
+    python -m pytest benchmarks/test_startup.py     # modules interdits (+ budget avec BENCH_TIMING=1)
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_PATH = os.path.join(BENCH_DIR, "startup_budget.json")
+DEFAULT_THRESHOLD = 0.5  # Les temps d'import sont bruités: seules les régressions nettes comptent
+
+HEAVY = ("torch", "matplotlib", "pygame", "sympy", "tqdm")
+
+# nom → (arguments de l'interpréteur, modules de premier niveau interdits)
+ENTRIES = {
+    "train_all --help": (["train_all.py", "--help"], HEAVY),
+    "import training.environment": (["-c", "import src.ai.training.environment"], HEAVY),
+    "import training.evaluate": (["-c", "import src.ai.training.evaluate"], HEAVY),
+    "import inference.immune_cell_controller": (["-c", "import src.ai.inference.immune_cell_controller"], HEAVY),
+    "import world.tissue": (["-c", "import src.game.world.tissue"], HEAVY),
+    "import main": (["-c", "import src.main"], ("torch", "matplotlib", "tqdm")),
+}
+
+
+def parse_importtime(stderr):
+    """(temps d'import total en secondes, noms des modules importés) depuis la sortie de -X importtime"""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("| imported package"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # Imbrication: deux espaces par niveau, après l'espace de séparation
+        if len(name) - len(name.lstrip(" ")) == 1:
+            total_us += int(cumulative)
+        modules.add(name.strip())
+    return total_us / 1e6, modules
+
+
+def measure(name, repeat=5):
+    """Meilleur temps d'import (s) et modules lourds chargés par l'entrée `name`"""
+    args, forbidden = ENTRIES[name]
+    best = float("inf")
+    loaded = set()
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT,
+                                   capture_output=True, text=True, check=True)
+        seconds, modules = parse_importtime(completed.stderr)
+        best = min(best, seconds)
+        loaded = {module for module in forbidden if module in modules}
+    return {"import_ms": best * 1e3, "forbidden": sorted(loaded)}
+
+
+def measure_all(names=None, repeat=5):
+    names = list(ENTRIES) if names is None else names
+    return {name: measure(name, repeat) for name in names}
+
+
+def machine_info():
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "processor": platform.processor() or platform.platform()}
+
+
+def load_budget(path=BUDGET_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def load_budget_machine(path=BUDGET_PATH):
+    """Bloc "machine" du budget (None si absent)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("machine")
+
+
+def same_machine(reference):
+    """Vrai si le budget a été mesuré sur une machine identique à celle-ci"""
+    return reference == machine_info()
+
+
+def write_budget(results, path=BUDGET_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": datetime.now().isoformat(timespec="seconds"), "machine": machine_info(),
+                   "results": {name: {"import_ms": r["import_ms"]} for name, r in results.items()}},
+                  f, indent=4, ensure_ascii=False)
+
+
+def check(results, budget, threshold=DEFAULT_THRESHOLD):
+    """{nom: problème} des entrées qui chargent un module interdit ou dépassent leur budget"""
+    failures = {}
+    for name, result in results.items():
+        if result["forbidden"]:
+            failures[name] = f"charge {', '.join(result['forbidden'])}"
+            continue
+        reference = budget.get(name)
+        if reference and result["import_ms"] > reference["import_ms"] * (1 + threshold):
+            failures[name] = (f"{result['import_ms']:.1f} ms d'import pour un budget de "
+                              f"{reference['import_ms']:.1f} ms (+{threshold:.0%} toléré)")
+    return failures
+
+
+def format_results(results, budget):
+    lines = [f"{'entrée':>40} {'import (ms)':>12} {'budget (ms)':>12}  modules interdits"]
+    for name, result in results.items():
+        reference = budget.get(name)
+        reference = f"{reference['import_ms']:>12.1f}" if reference else f"{'-':>12}"
+        lines.append(f"{name:>40} {result['import_ms']:>12.1f} {reference}  "
+                     f"{', '.join(result['forbidden']) or '-'}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Budget de démarrage à froid des points d'entrée")
+    parser.add_argument("--only", type=str, nargs="+", default=None,
+                        help="Préfixes des entrées à mesurer (par défaut: toutes)")
+    parser.add_argument("--repeat", type=int, default=5, help="Lancements par entrée (meilleur retenu)")
+    parser.add_argument("--budget", type=str, default=BUDGET_PATH, help="Fichier JSON du budget")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Dépassement du budget toléré (fraction)")
+    parser.add_argument("--update-budget", action="store_true",
+                        help="Enregistrer ces mesures comme nouveau budget")
+    args = parser.parse_args(argv)
+
+    names = [name for name in ENTRIES if args.only is None or any(name.startswith(p) for p in args.only)]
+    results = measure_all(names, args.repeat)
+    budget = load_budget(args.budget)
+    print(format_results(results, budget))
+
+    if args.update_budget:
+        write_budget(dict(budget, **results), args.budget)
+        print(f"Budget mis à jour: {args.budget}")
+        return 0
+
+    reference_machine = load_budget_machine(args.budget)
+    if budget and not same_machine(reference_machine):
+        print(f"Budget mesuré sur une autre machine ({reference_machine}): seuls les modules interdits "
+              f"sont vérifiés")
+        budget = {}
+
+    failures = check(results, budget, args.threshold)
+    for name, problem in failures.items():
+        print(f"Régression: {name} {problem}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# neural_battler/benchmarks/test_benchmarks.py
+"""
+Scénarios de bench.py exécutés par pytest, un test par scénario.
+Les débits dépendent de la machine: les tests ne s'exécutent qu'avec BENCH_TIMING=1 et
+sur la machine de baseline.json (bloc "machine"); sinon ils sont ignorés.
+Seuil de régression: variable d'environnement BENCH_THRESHOLD (fraction, 0.25 par défaut).
+Aucun fichier n'est écrit (bench.py --output pour enregistrer des résultats).
+"""
+import os
+
+import pytest
+
+from .bench import (DEFAULT_THRESHOLD, SCENARIOS, compare, load_baseline, load_baseline_machine,
+                    run_scenario, same_machine)
+
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", DEFAULT_THRESHOLD))
+BASELINE = load_baseline()
+
+pytestmark = [
+    pytest.mark.skipif(not os.environ.get("BENCH_TIMING"), reason="Mesures de débit désactivées (BENCH_TIMING=1)"),
+    pytest.mark.skipif(not same_machine(load_baseline_machine()),
+                       reason="baseline.json mesurée sur une autre machine (bench.py --update-baseline)"),
+]
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_benchmark(name):
+    if name not in BASELINE:
+        pytest.skip(f"Pas de référence pour {name} (bench.py --update-baseline)")
+    result = run_scenario(name)
+    regressions = compare({name: result}, BASELINE, THRESHOLD)
+    assert not regressions, (f"{name}: {result['rate']:,.0f} {result['unit']}, "
+                             f"{regressions[name]:.0%} de la référence ({BASELINE[name]['rate']:,.0f})")
@@ -0,0 +1,33 @@
+# neural_battler/benchmarks/test_startup.py
+"""
+Vérifications de startup.py exécutées par pytest, deux tests par point d'entrée:
+- aucun module lourd interdit n'est chargé (toujours exécuté, indépendant de la machine);
+- le temps d'import respecte le budget: seulement avec BENCH_TIMING=1 et sur la machine
+  de startup_budget.json (bloc "machine"), sinon ignoré.
+Dépassement toléré: variable d'environnement STARTUP_THRESHOLD (fraction, 0.5 par défaut).
+"""
+import os
+
+import pytest
+
+from .startup import DEFAULT_THRESHOLD, ENTRIES, check, load_budget, load_budget_machine, measure, same_machine
+
+THRESHOLD = float(os.environ.get("STARTUP_THRESHOLD", DEFAULT_THRESHOLD))
+BUDGET = load_budget()
+
+
+@pytest.mark.parametrize("name", list(ENTRIES))
+def test_no_heavy_imports(name):
+    result = measure(name, repeat=1)
+    assert not result["forbidden"], f"{name}: charge {', '.join(result['forbidden'])}"
+
+
+@pytest.mark.skipif(not os.environ.get("BENCH_TIMING"), reason="Mesures de temps désactivées (BENCH_TIMING=1)")
+@pytest.mark.skipif(not same_machine(load_budget_machine()),
+                    reason="startup_budget.json mesuré sur une autre machine (startup.py --update-budget)")
+@pytest.mark.parametrize("name", list(ENTRIES))
+def test_startup_budget(name):
+    if name not in BUDGET:
+        pytest.skip(f"Pas de budget pour {name} (startup.py --update-budget)")
+    failures = check({name: measure(name)}, BUDGET, THRESHOLD)
+    assert not failures, f"{name}: {failures[name]}"
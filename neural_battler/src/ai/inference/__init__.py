@@ -1 +1,24 @@
-from .immune_cell_controller import ImmuneCellController
\ No newline at end of file
+# neural_battler/src/ai/inference/__init__.py
+# Imports paresseux (voir src/ai/models/__init__.py): le contrôleur et NumpyPolicy n'importent pas torch
+import importlib
+
+_EXPORTS = {
+    "ImmuneCellController": ".immune_cell_controller",
+    "InferenceServer": ".inference_server",
+    "ModelRegistry": ".model_registry",
+    "get_model_registry": ".model_registry",
+    "NumpyPolicy": ".policy",
+    "TorchPolicy": ".policy",
+    "load_policy": ".policy",
+    "export_numpy_policy": ".policy",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
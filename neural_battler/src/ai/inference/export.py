@@ -0,0 +1,157 @@
+# neural_battler/src/ai/inference/export.py
+import importlib.util
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from ..models.actions import NUM_ACTIONS
+from ..models.observation import num_pathogens_for
+from .policy import NumpyPolicy, load_policy
+
+FORMATS = ("torchscript", "onnx", "numpy")
+MANIFEST_SUFFIX = ".manifest.json"
+_EXTENSIONS = {"torchscript": ".ts", "onnx": ".onnx", "numpy": ".npz"}
+
+
+def state_layout(num_pathogens):
+    """Description lisible du vecteur d'état (voir ObservationEncoder)"""
+    layout = ["x/largeur", "y/hauteur", "mur gauche", "mur droit", "mur haut", "mur bas"]
+    for i in range(num_pathogens):
+        layout += [f"pathogène {i}: distance/diagonale", f"pathogène {i}: dx/largeur",
+                   f"pathogène {i}: dy/hauteur", f"pathogène {i}: santé relative"]
+    return layout + ["santé relative", "capacité spéciale prête"]
+
+
+def load_network(model_path):
+    """ImmuneCellNetwork (mode évaluation) et state_dict du policy_network d'un checkpoint"""
+    import torch
+    from ..models.immune_cell_model import ImmuneCellNetwork
+
+    state_dict = torch.load(model_path)['policy_network']
+    network = ImmuneCellNetwork(state_dict['fc1.weight'].shape[1], state_dict['fc1.weight'].shape[0],
+                                state_dict['fc3.weight'].shape[0])
+    network.load_state_dict(state_dict)
+    network.eval()
+    return network, state_dict
+
+
+def artifact_stem(model_path, output_dir=None, suffix=""):
+    """Chemin de base des artefacts exportés (sans extension)"""
+    output_dir = output_dir or os.path.dirname(model_path) or "."
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(model_path))[0] + suffix)
+
+
+def write_manifest(stem, model_path, network, artifacts, **extra):
+    """Écrit le manifeste d'un export (format de l'état, artefacts); retourne son chemin"""
+    state_size = network.fc1.in_features
+    action_size = network.fc3.out_features
+    num_pathogens = num_pathogens_for(state_size)
+    manifest = {
+        "source": os.path.abspath(model_path),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "state_size": state_size,
+        "hidden_size": network.fc1.out_features,
+        "action_size": action_size,
+        "num_pathogens": num_pathogens,
+        "state_dtype": "float32",
+        "state_layout": state_layout(num_pathogens),
+        "actions": "0-7: directions, 8: immobile, 9: capacité spéciale" if action_size == NUM_ACTIONS else None,
+        "artifacts": artifacts,
+    }
+    manifest.update(extra)
+    manifest_path = stem + MANIFEST_SUFFIX
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    return manifest_path
+
+
+def export_model(model_path, output_dir=None, formats=FORMATS):
+    """
+    Exporte le policy_network d'un checkpoint en artefacts d'inférence figés
+    (sans optimiseur), accompagnés d'un manifeste décrivant le format de l'état.
+    Un format dont la dépendance manque (onnx) est ignoré avec un avertissement.
+    Retourne le chemin du manifeste.
+    """
+    import torch
+
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Formats d'export inconnus: {sorted(unknown)}")
+
+    network, state_dict = load_network(model_path)
+    stem = artifact_stem(model_path, output_dir)
+
+    artifacts = {}
+    if "torchscript" in formats:
+        # Graphe figé: poids repliés en constantes, aucun état d'entraînement
+        scripted = torch.jit.freeze(torch.jit.script(network))
+        path = stem + _EXTENSIONS["torchscript"]
+        torch.jit.save(scripted, path)
+        artifacts["torchscript"] = os.path.basename(path)
+
+    if "onnx" in formats:
+        if importlib.util.find_spec("onnx") is None:
+            print("Export ONNX ignoré: le paquet 'onnx' n'est pas installé")
+        else:
+            path = stem + _EXTENSIONS["onnx"]
+            torch.onnx.export(network, torch.zeros(1, network.fc1.in_features), path,
+                              input_names=["state"], output_names=["q_values"],
+                              dynamic_axes={"state": {0: "batch"}, "q_values": {0: "batch"}},
+                              do_constant_folding=True)
+            artifacts["onnx"] = os.path.basename(path)
+
+    if "numpy" in formats:
+        path = stem + _EXTENSIONS["numpy"]
+        NumpyPolicy.from_state_dict(state_dict).save(path)
+        artifacts["numpy"] = os.path.basename(path)
+
+    return write_manifest(stem, model_path, network, artifacts)
+
+
+def benchmark_loading(model_path, manifest_path, calls=2000):
+    """
+    Compare le temps de chargement et la latence par décision du chemin historique
+    (ImmuneCellAgent complet + optimiseur) et de chaque backend exporté.
+    Le premier Adam construit dans un processus charge des sous-modules de torch:
+    le chemin historique inclut ce coût de démarrage à froid, que les exports évitent.
+    Retourne {nom: {"load_ms": ..., "call_us": ...}}.
+    """
+    import torch
+    from ..models.immune_cell_model import ImmuneCellAgent
+
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    states = np.random.rand(calls, manifest["state_size"]).astype(np.float32)
+    # torch est déjà importé: on mesure la construction et le chargement, pas l'import
+
+    def measure(load, act):
+        start = time.perf_counter()
+        policy = load()
+        load_ms = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        for state in states:
+            act(policy, state)
+        return {"load_ms": load_ms, "call_us": (time.perf_counter() - start) / calls * 1e6}
+
+    def load_agent():
+        agent = ImmuneCellAgent(manifest["state_size"], manifest["action_size"])
+        agent.load(model_path)
+        agent.policy_network.eval()
+        return agent
+
+    def act_agent(agent, state):
+        with torch.no_grad():
+            return torch.argmax(agent.policy_network(torch.from_numpy(state))).item()
+
+    results = {"agent (checkpoint)": measure(load_agent, act_agent)}
+    for backend in ["torch"] + list(manifest["artifacts"]):
+        try:
+            path = model_path if backend == "torch" else manifest_path
+            results[backend] = measure(lambda: load_policy(path, backend), lambda p, s: p.act(s))
+        except ImportError as error:
+            print(f"Backend {backend} ignoré: {error}")
+    return results
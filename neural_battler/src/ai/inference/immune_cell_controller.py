@@ -1,46 +1,73 @@
 # neural_battler/src/ai/inference/immune_cell_controller.py
-import torch
-from ..models import ImmuneCellAgent
+import numpy as np
+
+from ..models.actions import IDLE_ACTION, NUM_ACTIONS, SPECIAL_ACTION, action_to_movement
+from ..models.observation import ObservationEncoder, num_pathogens_for
+from .model_registry import ModelRegistry, get_model_registry
+from .policy import load_policy
+from ...utils.profiler import profiled
 
 
 class ImmuneCellController:
-    def __init__(self, model_path, state_size=28, action_size=10):
+    def __init__(self, model_path, state_size=None, action_size=10, backend="auto", registry=None, shared=True,
+                 server=None):
         """
-        Contrôleur qui utilise un modèle entraîné pour diriger un lymphocyte
+        backend: "auto" (NumPy; torch seulement pour convertir un .pt non exporté), "numpy" ou "torch" (voir load_policy)
+        state_size / action_size: déduites des poids du modèle, vérifiées si fournies
+        shared: politique en lecture seule partagée via le ModelRegistry du processus
+                (ou `registry`); sinon chargée pour ce seul contrôleur
+        server: InferenceServer démarré qui évalue les décisions à la place de la politique,
+                regroupées avec celles des autres contrôleurs (par exemple d'autres tissus
+                simulés dans des threads); sa politique doit être celle de model_path
         """
-        self.agent = ImmuneCellAgent(state_size, action_size)
-        self.agent.load(model_path)
-        self.agent.policy_network.eval()  # Passe en mode évaluation
+        if shared:
+            self.policy = (registry or get_model_registry()).get(model_path, backend)
+        else:
+            self.policy = load_policy(model_path, backend)
+        # Les cellules dont les contrôleurs ont la même clé sont évaluées ensemble par le Tissue
+        self.model_key = ModelRegistry.key_for(model_path, backend)
+        self.server = server
+        if server is not None and server.state_size != self.policy.state_size:
+            raise ValueError(f"Le serveur attend des états de taille {server.state_size}, "
+                             f"pas {self.policy.state_size}")
+        if state_size is not None and state_size != self.policy.state_size:
+            raise ValueError(f"Le modèle attend des états de taille {self.policy.state_size}, pas {state_size}")
+        if action_size != self.policy.action_size:
+            raise ValueError(f"Le modèle a {self.policy.action_size} actions, pas {action_size}")
+        self.encoder = ObservationEncoder(num_pathogens_for(self.policy.state_size))
         # Définir une vitesse par défaut pour le contrôleur
         self.default_speed = 1.0
+        # Déplacement (dx, dy) de chaque action; la capacité spéciale ne bouge pas
+        self.movements = np.array([action_to_movement(IDLE_ACTION if a == SPECIAL_ACTION else a,
+                                                      self.default_speed)
+                                   for a in range(NUM_ACTIONS)], dtype=np.float64)
+
+    def _act(self, state):
+        return self.policy.act(state) if self.server is None else self.server.get_action(state)
 
-    def get_action(self, immune_cell, pathogens, tissue_width, tissue_height):
+    @profiled("controller.get_action")
+    def get_action(self, immune_cell, pathogens, tissue_width, tissue_height, geometry=None):
         """
         Détermine l'action à prendre pour le lymphocyte basé sur l'état actuel
         """
-        state = self.agent.get_state(immune_cell, pathogens, tissue_width, tissue_height)
-        with torch.no_grad():
-            q_values = self.agent.policy_network(state)
-            action = torch.argmax(q_values).item()
-
-        return action
+        state = self.encoder.encode(immune_cell, pathogens, tissue_width, tissue_height, geometry)
+        return self._act(state)
 
     def update(self, immune_cell, pathogens, tissue):
         """
         Met à jour le comportement du lymphocyte en fonction du modèle
         """
-        state = self.agent.get_state(immune_cell, pathogens, tissue.width, tissue.height)
-        with torch.no_grad():
-            q_values = self.agent.policy_network(state)
-            action_idx = torch.argmax(q_values).item()
+        state = self.encoder.encode(immune_cell, pathogens, tissue.width, tissue.height,
+                                    tissue.geometry.for_cell(immune_cell))
+        action_idx = self._act(state)
 
         # Séparation des actions de mouvement et de capacité spéciale
         # Action 0-8: mouvement, Action 9: utiliser capacité spéciale + ne pas bouger
-        use_special = action_idx == 9
-        movement_idx = 8 if use_special else action_idx  # Si spécial, ne pas bouger (action 8)
+        use_special = action_idx == SPECIAL_ACTION
+        movement_idx = IDLE_ACTION if use_special else action_idx  # Si spécial, ne pas bouger (action 8)
 
         # Utiliser la vitesse par défaut
-        dx, dy = self.agent.action_to_movement(movement_idx, self.default_speed)
+        dx, dy = action_to_movement(movement_idx, self.default_speed)
 
         # Mettre à jour la position du lymphocyte
         new_x = immune_cell.x + dx
@@ -51,4 +78,36 @@ class ImmuneCellController:
             immune_cell.x = new_x
             immune_cell.y = new_y
 
-        return {"use_special": use_special}
\ No newline at end of file
+        return {"use_special": use_special}
+
+    def update_batch(self, immune_cells, tissue):
+        """
+        Comme update, pour plusieurs lymphocytes partageant ce modèle: les observations
+        sont encodées et évaluées en un seul forward, les mouvements appliqués en bloc.
+        Retourne le tableau (n,) des use_special.
+        """
+        n = len(immune_cells)
+        cell_positions = np.array([(cell.x, cell.y) for cell in immune_cells], dtype=np.float64)
+        health_ratios = np.array([cell.health / cell.max_health for cell in immune_cells], dtype=np.float64)
+        special_ready = np.array([cell.special_ready for cell in immune_cells], dtype=np.float64)
+
+        pathogen_positions, _ = tissue.get_pathogen_arrays()
+        num_pathogens = len(pathogen_positions)
+        states = self.encoder.encode_batch(
+            cell_positions, health_ratios, special_ready,
+            np.broadcast_to(pathogen_positions, (n, num_pathogens, 2)),
+            np.broadcast_to(tissue.get_pathogen_health_ratios(), (n, num_pathogens)),
+            np.ones((n, num_pathogens), dtype=bool),
+            tissue.width, tissue.height)
+        actions = self.policy.act_batch(states) if self.server is None else self.server.submit_batch(states).result()
+
+        # Même règle que is_valid_position, évaluée pour toutes les cellules
+        new_positions = cell_positions + self.movements[actions]
+        x, y = new_positions[:, 0], new_positions[:, 1]
+        valid = (x >= 0) & (x < tissue.width) & (y >= 0) & (y < tissue.height)
+        for cell, (new_x, new_y), move in zip(immune_cells, new_positions.tolist(), valid.tolist()):
+            if move:
+                cell.x = new_x
+                cell.y = new_y
+
+        return actions == SPECIAL_ACTION
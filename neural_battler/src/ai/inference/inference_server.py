@@ -0,0 +1,167 @@
+# neural_battler/src/ai/inference/inference_server.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from ...utils.histogram import Histogram
+
+
+class InferenceServer:
+    """
+    Service d'inférence batchée dans un thread.
+
+    Les appelants (ImmuneCellController de plusieurs tissus simulés dans des threads,
+    environnements) soumettent une observation, ou un bloc d'observations, et reçoivent
+    un Future. Le thread regroupe les demandes en attente et les évalue en un seul appel
+    à policy.act_batch dès que `max_batch` observations sont réunies ou que la plus
+    ancienne attend depuis `max_wait` secondes.
+    Le Future reçoit l'action, ou le tableau des actions pour un bloc.
+
+    policy: toute politique de policy.py (act_batch, state_size), par exemple celle
+    du ModelRegistry; torch n'est importé que si la politique l'utilise.
+    Latence (soumission → résultat) et taille des batchs sont suivies dans des
+    histogrammes pour régler max_wait. La politique ne doit pas être modifiée pendant
+    que le serveur tourne (utiliser une copie du réseau d'un apprenant).
+    Soumettre avant start() ou après stop() lève RuntimeError; les demandes encore en
+    attente à l'arrêt sont annulées.
+    """
+
+    def __init__(self, policy, max_batch=64, max_wait=0.002):
+        self.policy = policy
+        self.state_size = policy.state_size
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._requests = queue.Queue()
+        self._batch = np.zeros((max_batch, self.state_size), dtype=np.float32)
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()  # Soumission et arrêt exclusifs: aucune demande après la vidange finale
+
+        self.latency = Histogram(min_value=1e-6, max_value=10.0)
+        self.batch_sizes = Histogram(min_value=1, max_value=max(max_batch, 2), buckets_per_decade=20)
+
+    @classmethod
+    def from_agent(cls, agent, **kwargs):
+        """Serveur du réseau torch d'un ImmuneCellAgent (voir TorchPolicy)"""
+        from .policy import TorchPolicy
+        return cls(TorchPolicy(agent.policy_network), **kwargs)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._serve, name="InferenceServer", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+            self._requests.put(None)  # Réveille le thread en attente de demande
+        if thread is not None:
+            thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, state):
+        """Soumet une observation (state_size,); retourne un Future de l'action"""
+        # Copie: l'observation vient souvent d'un buffer réutilisé par l'encodeur
+        return self._submit(np.array(state, dtype=np.float32).reshape(1, -1), True)
+
+    def submit_batch(self, states):
+        """
+        Soumet un bloc d'observations (n, state_size), par exemple les N environnements
+        d'un VecTrainingEnvironment; retourne un Future du tableau des n actions
+        """
+        return self._submit(np.array(states, dtype=np.float32), False)
+
+    def _submit(self, states, single):
+        future = Future()
+        with self._lock:
+            if self._thread is None:
+                raise RuntimeError("InferenceServer arrêté: appeler start() avant de soumettre")
+            self._requests.put((states, future, time.perf_counter(), single))
+        return future
+
+    def get_action(self, state):
+        """Appel bloquant: soumet l'observation et attend l'action"""
+        return self.submit(state).result()
+
+    def _collect(self):
+        """Attend une première demande puis complète le batch jusqu'à max_batch lignes ou max_wait"""
+        try:
+            first = self._requests.get(timeout=0.05)
+        except queue.Empty:
+            return [], 0
+        if first is None:
+            return [], 0
+        pending = [first]
+        rows = len(first[0])
+        deadline = first[2] + self.max_wait
+        while rows < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = (self._requests.get(timeout=remaining) if remaining > 0
+                           else self._requests.get_nowait())
+            except queue.Empty:
+                break
+            if request is None:
+                break
+            pending.append(request)
+            rows += len(request[0])
+        return pending, rows
+
+    def _serve(self):
+        while not self._stop.is_set():
+            pending, rows = self._collect()
+            if not pending:
+                continue
+
+            # Buffer préalloué (agrandi si un bloc dépasse max_batch)
+            if rows > len(self._batch):
+                self._batch = np.zeros((rows, self.state_size), dtype=np.float32)
+            start = 0
+            for states, _, _, _ in pending:
+                self._batch[start:start + len(states)] = states
+                start += len(states)
+
+            try:
+                actions = self.policy.act_batch(self._batch[:rows])
+            except Exception as error:
+                for _, future, _, _ in pending:
+                    future.set_exception(error)
+                continue
+
+            now = time.perf_counter()
+            start = 0
+            for states, future, submitted, single in pending:
+                n = len(states)
+                future.set_result(int(actions[start]) if single else actions[start:start + n].copy())
+                start += n
+                self.latency.record(now - submitted, n)
+            self.batch_sizes.record(rows)
+
+        # Demandes restantes à l'arrêt
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request[1].cancel()
+
+    def stats(self):
+        return {"latency": self.latency.summary(), "batch_size": self.batch_sizes.summary()}
+
+    def report(self):
+        return (f"Latence: {self.latency.format(1e3, 'ms')}\n"
+                f"Taille des batchs: {self.batch_sizes.format()}")
@@ -0,0 +1,104 @@
+# neural_battler/src/ai/inference/model_registry.py
+import os
+import threading
+from collections import OrderedDict
+
+from .policy import load_policy
+
+
+def policy_nbytes(policy, model_path):
+    """Mémoire occupée par les poids d'une politique (taille du fichier à défaut)"""
+    if hasattr(policy, "weights"):
+        arrays = policy.weights + policy.biases + [s for s in policy.scales if s is not None]
+        return sum(array.nbytes for array in arrays)
+    if hasattr(policy, "network"):
+        nbytes = sum(t.numel() * t.element_size() for t in policy.network.state_dict().values())
+        if nbytes:
+            return nbytes
+    return os.path.getsize(model_path)
+
+
+def _make_read_only(policy):
+    """Les poids partagés entre cellules ne doivent plus être modifiés"""
+    if hasattr(policy, "weights"):
+        for array in policy.weights + policy.biases + [s for s in policy.scales if s is not None]:
+            array.flags.writeable = False
+    elif hasattr(policy, "network"):
+        for parameter in policy.network.parameters():
+            parameter.requires_grad_(False)
+
+
+class ModelRegistry:
+    """
+    Cache des politiques d'inférence chargées, partagé par le processus.
+
+    Clé: (chemin absolu, backend, mtime): un checkpoint réécrit est rechargé, l'ancienne
+    entrée sortant du cache par LRU. Au-delà de `max_bytes` (poids cumulés) ou de
+    `max_entries`, les entrées les moins récemment demandées sont évincées; les cellules
+    qui les utilisent gardent leur politique. Les politiques servies sont en lecture seule.
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20, max_entries=32):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # clé → (politique, octets)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(model_path, backend="auto"):
+        path = os.path.abspath(model_path)
+        return path, backend, os.stat(path).st_mtime_ns
+
+    def get(self, model_path, backend="auto"):
+        """Politique partagée pour ce fichier; chargée au premier appel (ou si le fichier a changé)"""
+        key = self.key_for(model_path, backend)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            # Chargement sous le verrou: deux cellules créées en même temps ne lisent pas deux fois
+            self.misses += 1
+            policy = load_policy(model_path, backend)
+            _make_read_only(policy)
+            nbytes = policy_nbytes(policy, model_path)
+            self._entries[key] = (policy, nbytes)
+            self.nbytes += nbytes
+            self._evict()
+            return policy
+
+    def _evict(self):
+        # La dernière entrée (celle qui vient d'être chargée) n'est jamais évincée
+        while len(self._entries) > 1 and (self.nbytes > self.max_bytes or len(self._entries) > self.max_entries):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.nbytes -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, model_path):
+        return any(key[0] == os.path.abspath(model_path) for key in self._entries)
+
+    def stats(self):
+        return {"entries": len(self._entries), "nbytes": self.nbytes, "hits": self.hits, "misses": self.misses}
+
+
+_default_registry = None
+
+
+def get_model_registry():
+    """Registre du processus, créé au premier usage"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
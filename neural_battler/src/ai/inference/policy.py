@@ -0,0 +1,259 @@
+# neural_battler/src/ai/inference/policy.py
+import os
+
+import numpy as np
+
+# Couches de ImmuneCellNetwork dans l'ordre du forward (ReLU entre chaque couche)
+LAYERS = ("fc1", "fc2", "fc3")
+BACKENDS = ("auto", "numpy", "torch", "torchscript", "onnx")
+# Ordre de préférence du backend "auto" pour un manifeste d'export
+MANIFEST_PREFERENCE = ("numpy", "onnx", "torchscript")
+
+
+class NumpyPolicy:
+    """
+    Forward de ImmuneCellNetwork en NumPy pur (float32), sans torch.
+    Pour ce petit MLP, éviter le dispatch torch réduit nettement la latence par décision.
+    Un modèle quantifié garde ses poids en mémoire dans leur format réduit: float16, ou
+    int8 avec une échelle par neurone de sortie (`scales`), appliquée à la sortie de la
+    couche. Les activations restent en float32.
+    """
+
+    backend = "numpy"
+
+    def __init__(self, weights, biases, scales=None):
+        # (entrées, sorties); int8 et float16 conservés tels quels, le reste en float32
+        self.weights = [np.ascontiguousarray(w.T, dtype=w.dtype if w.dtype in (np.int8, np.float16) else np.float32)
+                        for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.scales = [None if scale is None else np.asarray(scale, dtype=np.float32)
+                       for scale in (scales or [None] * len(self.weights))]
+        self.state_size = self.weights[0].shape[0]
+        self.action_size = self.weights[-1].shape[1]
+        self.quantization = "none"
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            count = int(data["num_layers"])
+            quantization = str(data["quantization"]) if "quantization" in data else "none"
+            weights = [data[f"weight_{i}"] for i in range(count)]
+            # Poids int8 symétriques, une échelle par neurone de sortie
+            scales = [data[f"scale_{i}"] for i in range(count)] if quantization == "int8" else None
+            policy = cls(weights, [data[f"bias_{i}"] for i in range(count)], scales)
+        policy.quantization = quantization
+        return policy
+
+    @classmethod
+    def from_state_dict(cls, state_dict):
+        return cls([state_dict[f"{name}.weight"].detach().cpu().numpy() for name in LAYERS],
+                   [state_dict[f"{name}.bias"].detach().cpu().numpy() for name in LAYERS])
+
+    def float_weights(self):
+        """Poids déquantifiés en float32, convention nn.Linear (sorties, entrées)"""
+        return [(weight.astype(np.float32) if scale is None else weight * scale).T
+                for weight, scale in zip(self.weights, self.scales)]
+
+    def save(self, path, quantization="none"):
+        """
+        quantization: "none" (float32), "float16" (poids en demi-précision) ou "int8"
+        (poids int8 symétriques par neurone de sortie). Les poids sont rechargés dans
+        ce format (voir load); le calcul se fait en float32.
+        """
+        arrays = {"num_layers": np.array(len(self.weights)), "quantization": np.array(quantization)}
+        for i, (weight, bias) in enumerate(zip(self.float_weights(), self.biases)):
+            if quantization == "int8":
+                scale = np.abs(weight).max(axis=1) / 127.0
+                scale[scale == 0] = 1.0
+                arrays[f"weight_{i}"] = np.round(weight / scale[:, None]).astype(np.int8)
+                arrays[f"scale_{i}"] = scale.astype(np.float32)
+            elif quantization == "float16":
+                arrays[f"weight_{i}"] = weight.astype(np.float16)
+            elif quantization == "none":
+                arrays[f"weight_{i}"] = weight
+            else:
+                raise ValueError(f"Quantification inconnue: {quantization}")
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    def forward(self, states):
+        """Q-valeurs pour un état (state_size,) ou un lot (N, state_size)"""
+        x = np.asarray(states, dtype=np.float32)
+        last = len(self.weights) - 1
+        for i, (weight, bias, scale) in enumerate(zip(self.weights, self.biases, self.scales)):
+            x = np.matmul(x, weight, dtype=np.float32)
+            if scale is not None:
+                x *= scale
+            x += bias
+            if i < last:
+                np.maximum(x, 0.0, out=x)
+        return x
+
+    def act(self, state):
+        return int(np.argmax(self.forward(state)))
+
+    def act_batch(self, states):
+        return np.argmax(self.forward(states), axis=1)
+
+
+class TorchPolicy:
+    """Politique servie par le ImmuneCellNetwork torch d'un checkpoint"""
+
+    backend = "torch"
+
+    def __init__(self, network):
+        import torch
+        self._torch = torch
+        self.network = network.eval()
+        self.state_size = network.fc1.in_features
+        self.action_size = network.fc3.out_features
+
+    @classmethod
+    def load(cls, path):
+        import torch
+        from ..models.immune_cell_model import ImmuneCellNetwork
+        state_dict = torch.load(path)['policy_network']
+        network = ImmuneCellNetwork(state_dict['fc1.weight'].shape[1], state_dict['fc1.weight'].shape[0],
+                                    state_dict['fc3.weight'].shape[0])
+        network.load_state_dict(state_dict)
+        return cls(network)
+
+    def forward(self, states):
+        x = np.asarray(states, dtype=np.float32)
+        single = x.ndim == 1
+        # Toujours un lot: les Linear quantifiés dynamiques exigent une entrée 2D
+        with self._torch.no_grad():
+            q_values = self.network(self._torch.from_numpy(x[None] if single else x)).numpy()
+        return q_values[0] if single else q_values
+
+    def act(self, state):
+        return int(np.argmax(self.forward(state)))
+
+    def act_batch(self, states):
+        return np.argmax(self.forward(states), axis=1)
+
+
+class TorchScriptPolicy(TorchPolicy):
+    """Graphe TorchScript figé exporté par `train_all.py export` (chargé par torch.jit)"""
+
+    backend = "torchscript"
+
+    def __init__(self, module, state_size, action_size):
+        import torch
+        self._torch = torch
+        self.network = module
+        self.state_size = state_size
+        self.action_size = action_size
+
+    @classmethod
+    def load(cls, path, state_size, action_size):
+        import torch
+        return cls(torch.jit.load(path), state_size, action_size)
+
+
+class OnnxPolicy:
+    """Graphe ONNX exporté par `train_all.py export`, exécuté par ONNX Runtime"""
+
+    backend = "onnx"
+
+    def __init__(self, path):
+        import onnxruntime
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        inputs = self.session.get_inputs()[0]
+        self._input_name = inputs.name
+        self.state_size = inputs.shape[1]
+        self.action_size = self.session.get_outputs()[0].shape[1]
+
+    def forward(self, states):
+        x = np.asarray(states, dtype=np.float32)
+        single = x.ndim == 1
+        q_values = self.session.run(None, {self._input_name: x[None] if single else x})[0]
+        return q_values[0] if single else q_values
+
+    def act(self, state):
+        return int(np.argmax(self.forward(state)))
+
+    def act_batch(self, states):
+        return np.argmax(self.forward(states), axis=1)
+
+
+def numpy_path_for(model_path):
+    """Chemin du .npz exporté à côté d'un checkpoint .pt"""
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def export_numpy_policy(model_path, output_path=None):
+    """Convertit les poids `policy_network` d'un checkpoint torch en .npz compact"""
+    import torch
+    output_path = output_path or numpy_path_for(model_path)
+    policy = NumpyPolicy.from_state_dict(torch.load(model_path)['policy_network'])
+    policy.save(output_path)
+    return output_path, policy
+
+
+def _load_manifest(manifest_path, backend):
+    """Politique décrite par un manifeste d'export; "auto" prend le premier artefact disponible"""
+    import importlib.util
+    import json
+
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(manifest_path)
+    artifacts = {name: os.path.join(directory, file) for name, file in manifest["artifacts"].items()}
+
+    if backend == "auto":
+        # NumPy d'abord: le plus rapide pour ce petit MLP et sans dépendance (voir benchmark_loading)
+        available = {"numpy": True,
+                     "onnx": importlib.util.find_spec("onnxruntime") is not None,
+                     "torchscript": importlib.util.find_spec("torch") is not None}
+        candidates = [name for name in MANIFEST_PREFERENCE if name in artifacts and available[name]]
+        if not candidates:
+            raise ImportError(f"Aucun artefact de {manifest_path} n'est utilisable ici")
+        backend = candidates[0]
+    if backend not in artifacts:
+        raise ValueError(f"Le manifeste {manifest_path} ne contient pas d'artefact {backend}")
+
+    if backend == "numpy":
+        return NumpyPolicy.load(artifacts["numpy"])
+    if backend == "onnx":
+        return OnnxPolicy(artifacts["onnx"])
+    return TorchScriptPolicy.load(artifacts["torchscript"], manifest["state_size"], manifest["action_size"])
+
+
+def load_policy(model_path, backend="auto"):
+    """
+    Charge une politique d'inférence.
+
+    model_path: checkpoint .pt, export .npz / .ts / .onnx, ou manifeste *.manifest.json
+    backend="numpy": .npz, ou checkpoint .pt converti à la volée
+    backend="torch": checkpoint .pt servi par torch (sans optimiseur)
+    backend="torchscript" / "onnx": artefact exporté par `train_all.py export`
+    backend="auto": selon le fichier; pour un checkpoint, NumPy. Un .npz à jour exporté à côté
+                    du .pt (export_numpy_policy) est lu sans importer torch; sinon la conversion
+                    se fait en mémoire, sans rien écrire (ModelRegistry la garde en cache)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend d'inférence inconnu: {backend}")
+
+    if model_path.endswith(".manifest.json"):
+        return _load_manifest(model_path, backend)
+    if model_path.endswith(".ts"):
+        raise ValueError(f"Charger {model_path} via son manifeste (taille d'état et d'actions)")
+    if model_path.endswith(".onnx"):
+        return OnnxPolicy(model_path)
+
+    if model_path.endswith(".npz"):
+        if backend == "torch":
+            raise ValueError(f"{model_path} est un export NumPy, pas un checkpoint torch")
+        return NumpyPolicy.load(model_path)
+
+    if backend == "torch":
+        return TorchPolicy.load(model_path)
+    if backend in ("torchscript", "onnx"):
+        raise ValueError(f"Le backend {backend} nécessite un manifeste d'export, pas {model_path}")
+
+    exported = numpy_path_for(model_path)
+    if os.path.exists(exported) and os.path.getmtime(exported) >= os.path.getmtime(model_path):
+        return NumpyPolicy.load(exported)
+    import torch
+    return NumpyPolicy.from_state_dict(torch.load(model_path)['policy_network'])
@@ -0,0 +1,143 @@
+# neural_battler/src/ai/inference/quantization.py
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from ..models.observation import num_pathogens_for
+from .export import artifact_stem, load_network, write_manifest
+from .model_registry import policy_nbytes
+from .policy import NumpyPolicy, load_policy
+
+MODES = ("int8", "float16")
+
+
+def quantize_model(model_path, mode="int8", output_dir=None):
+    """
+    Quantification post-entraînement du policy_network d'un checkpoint.
+
+    int8: nn.Linear dynamiques int8 (torch.ao, graphe TorchScript: calcul en int8) et poids
+          NumPy int8 symétriques par neurone de sortie (gardés en int8 au chargement)
+    float16: poids NumPy en demi-précision (gardés en float16 au chargement)
+    Écrit les artefacts et un manifeste (chargeable par ImmuneCellController); retourne son chemin.
+    """
+    import torch
+
+    if mode not in MODES:
+        raise ValueError(f"Mode de quantification inconnu: {mode}")
+
+    network, state_dict = load_network(model_path)
+    stem = artifact_stem(model_path, output_dir, f".{mode}")
+
+    artifacts = {}
+    path = stem + ".npz"
+    NumpyPolicy.from_state_dict(state_dict).save(path, quantization=mode)
+    artifacts["numpy"] = os.path.basename(path)
+
+    if mode == "int8":
+        if "fbgemm" not in torch.backends.quantized.supported_engines and \
+                "qnnpack" not in torch.backends.quantized.supported_engines:
+            print("Quantification torch int8 ignorée: aucun moteur quantifié disponible")
+        else:
+            quantized = torch.ao.quantization.quantize_dynamic(network, {torch.nn.Linear}, dtype=torch.qint8)
+            path = stem + ".ts"
+            torch.jit.save(torch.jit.script(quantized), path)
+            artifacts["torchscript"] = os.path.basename(path)
+
+    return write_manifest(stem, model_path, network, artifacts, quantization=mode)
+
+
+def collect_states(policy, num_states=5000, max_steps=1000, seed=0):
+    """États rencontrés par la politique de référence dans TrainingEnvironment (copies)"""
+    from ..training.environment import TrainingEnvironment
+
+    random.seed(seed)
+    np.random.seed(seed)
+    env = TrainingEnvironment(max_steps=max_steps, num_pathogens=num_pathogens_for(policy.state_size))
+    states = np.zeros((num_states, policy.state_size), dtype=np.float32)
+    state = env.reset()
+    for i in range(num_states):
+        states[i] = state
+        state, _, done = env.step(policy.act(states[i]))
+        if done:
+            state = env.reset()
+    return states
+
+
+def quantization_report(model_path, manifest_paths, num_states=5000, episodes=10, max_steps=1000, seed=0):
+    """
+    Compare chaque artefact quantifié au modèle float32 d'origine:
+    - taux d'accord des actions et écart max des Q-valeurs sur des états de rollouts
+    - métriques de evaluate_model (mêmes graines pour tous les modèles)
+    - taille de l'artefact d'inférence, mémoire des poids chargés (NumPy: int8 ou float16
+      conservés tels quels), latence par décision et par lot de 64 états; la référence
+      float32 est mesurée sur son export NumPy (.npz), pas sur le checkpoint complet
+    Retourne {nom: métriques}.
+    """
+    from ..training.evaluate import evaluate_model
+
+    reference = load_policy(model_path, "numpy")
+    states = collect_states(reference, num_states, max_steps, seed)
+    reference_q = reference.forward(states)
+    reference_actions = np.argmax(reference_q, axis=1)
+
+    def latency_us(policy):
+        start = time.perf_counter()
+        for state in states[:1000]:
+            policy.act(state)
+        return (time.perf_counter() - start) / min(len(states), 1000) * 1e6
+
+    def batch_latency_us(policy, batch_size=64, repeat=200):
+        batch = states[:batch_size]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            policy.act_batch(batch)
+        return (time.perf_counter() - start) / repeat * 1e6
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "float32.npz")
+        reference.save(path)
+        reference_size = os.path.getsize(path)
+
+    report = {"float32": {
+        "agreement": 1.0,
+        "max_q_error": 0.0,
+        "size_bytes": reference_size,
+        "weights_bytes": policy_nbytes(reference, model_path),
+        "call_us": latency_us(reference),
+        "batch_us": batch_latency_us(reference),
+        "evaluation": evaluate_model(model_path, episodes, max_steps, backend="numpy", seed=seed),
+    }}
+
+    for manifest_path in manifest_paths:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        directory = os.path.dirname(manifest_path)
+        for backend, file in manifest["artifacts"].items():
+            policy = load_policy(manifest_path, backend)
+            q_values = policy.forward(states)
+            report[f"{manifest['quantization']} ({backend})"] = {
+                "agreement": float(np.mean(np.argmax(q_values, axis=1) == reference_actions)),
+                "max_q_error": float(np.abs(q_values - reference_q).max()),
+                "size_bytes": os.path.getsize(os.path.join(directory, file)),
+                "weights_bytes": policy_nbytes(policy, os.path.join(directory, file)),
+                "call_us": latency_us(policy),
+                "batch_us": batch_latency_us(policy),
+                "evaluation": evaluate_model(manifest_path, episodes, max_steps, backend=backend, seed=seed),
+            }
+    return report
+
+
+def format_report(report):
+    lines = [f"{'modèle':>22} {'accord':>8} {'err. Q':>8} {'taille':>9} {'poids':>9} {'us/appel':>9} "
+             f"{'us/lot64':>9} {'survie (s)':>11} {'récompense':>11}"]
+    for name, metrics in report.items():
+        evaluation = metrics["evaluation"]
+        lines.append(f"{name:>22} {metrics['agreement']:>8.2%} {metrics['max_q_error']:>8.4f} "
+                     f"{metrics['size_bytes'] / 1024:>7.1f}ko {metrics['weights_bytes'] / 1024:>7.1f}ko "
+                     f"{metrics['call_us']:>9.1f} {metrics['batch_us']:>9.1f} "
+                     f"{evaluation['avg_survival_time']:>11.2f} {evaluation['avg_reward']:>11.2f}")
+    return "\n".join(lines)
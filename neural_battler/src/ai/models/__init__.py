@@ -1 +1,27 @@
-from .immune_cell_model import ImmuneCellAgent, ImmuneCellNetwork
\ No newline at end of file
+# neural_battler/src/ai/models/__init__.py
+# Imports paresseux: les modules sans torch (observation, actions) restent utilisables
+# par le jeu et l'inférence NumPy sans charger torch
+import importlib
+
+_EXPORTS = {
+    "ImmuneCellAgent": ".immune_cell_model",
+    "ImmuneCellNetwork": ".immune_cell_model",
+    "ObservationEncoder": ".observation",
+    "state_size_for": ".observation",
+    "num_pathogens_for": ".observation",
+    "ReplayBuffer": ".replay_buffer",
+    "PrioritizedReplayBuffer": ".replay_buffer",
+    "SumTree": ".replay_buffer",
+    "MemmapReplayStore": ".replay_store",
+    "CheckpointManager": ".checkpoint",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,25 @@
+# neural_battler/src/ai/models/actions.py
+
+# Actions: 0=haut, 1=droite, 2=bas, 3=gauche, 4=haut-droite, 5=bas-droite,
+#          6=bas-gauche, 7=haut-gauche, 8=immobile, 9=capacité spéciale (sans bouger)
+MOVEMENTS = (
+    (0, -1),  # haut
+    (1, 0),  # droite
+    (0, 1),  # bas
+    (-1, 0),  # gauche
+    (0.7, -0.7),  # haut-droite
+    (0.7, 0.7),  # bas-droite
+    (-0.7, 0.7),  # bas-gauche
+    (-0.7, -0.7),  # haut-gauche
+    (0, 0),
+    (0, 0),
+)
+NUM_ACTIONS = len(MOVEMENTS)
+SPECIAL_ACTION = 9
+IDLE_ACTION = 8
+
+
+def action_to_movement(action, speed=1.0):
+    """Convertit l'action (indice) en mouvement (dx, dy)"""
+    dx, dy = MOVEMENTS[action]
+    return dx * speed, dy * speed
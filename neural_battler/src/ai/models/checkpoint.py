@@ -0,0 +1,126 @@
+# neural_battler/src/ai/models/checkpoint.py
+import json
+import os
+import queue
+import tempfile
+import threading
+
+import torch
+
+
+def atomic_torch_save(state, path):
+    """torch.save dans un fichier temporaire du même dossier puis renommage: jamais de .pt tronqué"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            torch.save(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class CheckpointManager:
+    """
+    Checkpoints écrits en arrière-plan, de façon atomique, avec politique de rétention.
+
+    `save` copie l'état de l'agent en mémoire (agent.snapshot) dans le thread appelant
+    puis rend la main: la sérialisation et l'écriture se font dans un thread dédié.
+    Au plus `max_pending` copies attendent leur écriture (au-delà, `save` attend).
+
+    Rétention: parmi les checkpoints de ce gestionnaire, seuls les `keep_last` plus
+    récents et les `keep_best` de meilleur score sont conservés; les checkpoints
+    `pinned` (modèle final) ne sont jamais supprimés. L'index
+    `<prefix>.checkpoints.json` (chemins, scores) survit au redémarrage du processus.
+    """
+
+    def __init__(self, directory, prefix, keep_last=3, keep_best=2, max_pending=2):
+        self.directory = directory
+        self.prefix = prefix
+        self.keep_last = keep_last
+        self.keep_best = keep_best
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, f"{prefix}.checkpoints.json")
+        self.checkpoints = []  # {"path", "score", "pinned"} dans l'ordre d'écriture
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.checkpoints = [c for c in json.load(f) if os.path.exists(c["path"])]
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._writer_loop, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def path_for(self, name):
+        return os.path.join(self.directory, f"{self.prefix}_{name}.pt")
+
+    def save(self, agent, name, score=None, pinned=False):
+        """Planifie l'écriture de `<prefix>_<name>.pt`; score: plus grand = meilleur (None: hors classement)"""
+        self._raise_pending_error()
+        path = self.path_for(name)
+        self._queue.put((agent.snapshot(), path, score, pinned))
+        return path
+
+    def _writer_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                state, path, score, pinned = item
+                atomic_torch_save(state, path)
+                self._record(path, score, pinned)
+            except Exception as error:  # Signalé au prochain save/wait du thread d'entraînement
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _record(self, path, score, pinned):
+        self.checkpoints = [c for c in self.checkpoints if c["path"] != path]
+        self.checkpoints.append({"path": path, "score": score, "pinned": pinned})
+
+        candidates = [c for c in self.checkpoints if not c["pinned"]]
+        keep = {c["path"] for c in candidates[-self.keep_last:]} if self.keep_last else set()
+        scored = sorted((c for c in candidates if c["score"] is not None), key=lambda c: c["score"], reverse=True)
+        keep.update(c["path"] for c in scored[:self.keep_best])
+        for checkpoint in candidates:
+            if checkpoint["path"] not in keep and os.path.exists(checkpoint["path"]):
+                os.remove(checkpoint["path"])
+        self.checkpoints = [c for c in self.checkpoints if c["pinned"] or c["path"] in keep]
+
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoints, f, indent=4)
+        os.replace(tmp_path, self.index_path)
+
+    def best(self):
+        """Chemin du checkpoint conservé de meilleur score (None si aucun n'est noté)"""
+        self.wait()
+        scored = [c for c in self.checkpoints if c["score"] is not None]
+        return max(scored, key=lambda c: c["score"])["path"] if scored else None
+
+    def wait(self):
+        """Attend la fin des écritures en cours"""
+        self._queue.join()
+        self._raise_pending_error()
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Échec de l'écriture d'un checkpoint") from error
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_pending_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,9 +1,17 @@
 # neural_battler/src/ai/models/immune_cell_model.py
+import copy
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 
+from .actions import action_to_movement
+from .checkpoint import atomic_torch_save
+from .observation import ObservationEncoder, num_pathogens_for
+from .replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from ...utils.profiler import profiled
+
 
 class ImmuneCellNetwork(nn.Module):
     def __init__(self, input_size, hidden_size, output_size):
@@ -24,17 +32,26 @@ class ImmuneCellNetwork(nn.Module):
 
 
 class ImmuneCellAgent:
-    def __init__(self, state_size, action_size=10, hidden_size=64, learning_rate=0.001):
+    def __init__(self, state_size, action_size=10, hidden_size=64, learning_rate=0.001,
+                 memory_size=10000, memory_dtype=np.float32, prioritized=False, memory=None):
         """
         Initialiser avec 10 actions:
         0-7: 8 directions de mouvement
         8: ne pas bouger
         9: utiliser capacité spéciale (sans bouger)
+
+        memory_size / memory_dtype: capacité et type de stockage des observations
+        de la mémoire d'expériences (np.float16 pour les très grands buffers)
+        prioritized: échantillonnage par priorités (PrioritizedReplayBuffer) au lieu d'uniforme
+        memory: mémoire fournie par l'appelant (par exemple un MemmapReplayStore partagé)
         """
 
         self.state_size = state_size
         self.action_size = action_size
 
+        # Encodeur d'observations (nombre de pathogènes observés déduit de la taille d'état)
+        self.encoder = ObservationEncoder(num_pathogens_for(state_size))
+
         # Réseau de neurones principal
         self.policy_network = ImmuneCellNetwork(state_size, hidden_size, action_size)
 
@@ -42,59 +59,26 @@ class ImmuneCellAgent:
         self.optimizer = torch.optim.Adam(self.policy_network.parameters(), lr=learning_rate)
 
         # Mémoire pour stocker les expériences
-        self.memory = []
-        self.gamma = 0.99  # Facteur de remise pour les récompenses futures
-
-    def get_state(self, immune_cell, pathogens, tissue_width, tissue_height):
-        # Position normalisée du lymphocyte (entre 0 et 1)
-        cell_pos = [immune_cell.x / tissue_width, immune_cell.y / tissue_height]
-
-        # Informations sur la distance aux murs
-        wall_distances = [
-            immune_cell.x / tissue_width,
-            (tissue_width - immune_cell.x) / tissue_width,
-            immune_cell.y / tissue_height,
-            (tissue_height - immune_cell.y) / tissue_height
-        ]
-
-        # Informations sur les pathogènes proches
-        pathogen_info = []
-
-        if pathogens:
-            # Calculer distances à tous les pathogènes
-            distances = []
-            for pathogen in pathogens:
-                dx = pathogen.x - immune_cell.x
-                dy = pathogen.y - immune_cell.y
-                distance = np.sqrt(dx ** 2 + dy ** 2)
-                distances.append((distance, dx / tissue_width, dy / tissue_height,
-                                  pathogen.health / pathogen.max_health))
-
-            # Trier par distance
-            distances.sort(key=lambda x: x[0])
-
-            # Prendre les 5 plus proches (ou moins s'il y en a moins)
-            for i in range(min(5, len(distances))):
-                dist, dx, dy, health_ratio = distances[i]
-                # Normaliser la distance
-                norm_dist = dist / np.sqrt(tissue_width ** 2 + tissue_height ** 2)
-                pathogen_info.extend([norm_dist, dx, dy, health_ratio])
-
-            # Remplir avec des zéros si moins de 5 pathogènes
-            padding = 5 - min(5, len(distances))
-            pathogen_info.extend([0.0] * (padding * 4))
+        self.prioritized = prioritized
+        if memory is not None:
+            if prioritized and not isinstance(memory, PrioritizedReplayBuffer):
+                raise ValueError("Le mode prioritaire nécessite un PrioritizedReplayBuffer")
+            self.memory = memory
+        elif prioritized:
+            self.memory = PrioritizedReplayBuffer(memory_size, state_size, memory_dtype)
         else:
-            # Aucun pathogène, remplir avec des zéros
-            pathogen_info = [0.0] * 20  # 5 pathogènes * 4 informations
-
-        # Santé relative du lymphocyte et état de la capacité spéciale
-        health_info = [immune_cell.health / immune_cell.max_health]
-        special_ready = [1.0 if immune_cell.special_ready else 0.0]
+            self.memory = ReplayBuffer(memory_size, state_size, memory_dtype)
+        self.gamma = 0.99  # Facteur de remise pour les récompenses futures
 
-        # Combinaison de toutes les informations
-        state = cell_pos + wall_distances + pathogen_info + health_info + special_ready
-        return torch.FloatTensor(state)
+    def get_state(self, immune_cell, pathogens, tissue_width, tissue_height, geometry=None):
+        """
+        geometry: CellGeometry déjà calculée pour cette cellule (cache du Tissue),
+        alignée sur `pathogens`; recalculée si absente.
+        Retourne une vue sur le buffer de l'encodeur, réécrit à l'appel suivant.
+        """
+        return self.encoder.encode_tensor(immune_cell, pathogens, tissue_width, tissue_height, geometry)
 
+    @profiled("agent.select_action")
     def select_action(self, state, epsilon=0.1):
         # Ajoutez ce debug pour voir ce qui se passe
         random_val = np.random.random()
@@ -110,38 +94,35 @@ class ImmuneCellAgent:
                 action = torch.argmax(q_values).item()
                 return action
 
+    def select_actions(self, states, epsilon=0.1):
+        """
+        Version batchée de select_action: un seul forward pour un lot d'états (N, state_size)
+        """
+        with torch.no_grad():
+            actions = torch.argmax(self.policy_network(states), dim=1).numpy()
+
+        # Exploration indépendante pour chaque état
+        explore = np.random.random(len(actions)) < epsilon
+        actions[explore] = np.random.randint(0, self.action_size, explore.sum())
+        return actions
+
     def action_to_movement(self, action, speed=1.0):
         """
         Convertit l'action (indice) en mouvement (dx, dy)
         Actions: 0=haut, 1=droite, 2=bas, 3=gauche, 4=haut-droite, 5=bas-droite,
                  6=bas-gauche, 7=haut-gauche, 8=immobile
         """
-        movements = [
-            (0, -1),  # haut
-            (1, 0),  # droite
-            (0, 1),  # bas
-            (-1, 0),  # gauche
-            (0.7, -0.7),  # haut-droite
-            (0.7, 0.7),  # bas-droite
-            (-0.7, 0.7),  # bas-gauche
-            (-0.7, -0.7),  # haut-gauche
-            (0, 0),
-            (0,0 )
-        ]
-
-        dx, dy = movements[action]
-        return dx * speed, dy * speed
+        return action_to_movement(action, speed)
 
+    @profiled("agent.store")
     def store_experience(self, state, action, reward, next_state, done):
         """
         Stocke une expérience dans la mémoire
         """
-        self.memory.append((state, action, reward, next_state, done))
-
-        # Limiter la taille de la mémoire
-        if len(self.memory) > 10000:
-            self.memory.pop(0)
+        # Les états sont copiés dans le buffer circulaire (la plus ancienne expérience est écrasée)
+        self.memory.add(state, action, reward, next_state, done)
 
+    @profiled("agent.train")
     def train(self, batch_size=64):
         """
         Entraîne le réseau sur un mini-batch d'expériences
@@ -149,16 +130,12 @@ class ImmuneCellAgent:
         if len(self.memory) < batch_size:
             return
 
-        # Échantillonner un mini-batch
-        batch = np.random.choice(len(self.memory), batch_size, replace=False)
-        states, actions, rewards, next_states, dones = zip(*[self.memory[i] for i in batch])
-
-        # Convertir en tenseurs
-        states = torch.stack(states)
-        actions = torch.LongTensor(actions).unsqueeze(1)
-        rewards = torch.FloatTensor(rewards).unsqueeze(1)
-        next_states = torch.stack(next_states)
-        dones = torch.FloatTensor(dones).unsqueeze(1)
+        # Échantillonner un mini-batch (directement sous forme de tenseurs)
+        if self.prioritized:
+            indices, weights = self.memory.sample_prioritized(batch_size)
+        else:
+            indices, weights = self.memory.sample_indices(batch_size), None
+        states, actions, rewards, next_states, dones = self.memory.get_batch(indices)
 
         # Calculer les valeurs Q courantes
         current_q_values = self.policy_network(states).gather(1, actions)
@@ -170,8 +147,14 @@ class ImmuneCellAgent:
         # Calculer les valeurs Q cibles avec l'équation de Bellman
         target_q_values = rewards + self.gamma * next_q_values * (1 - dones)
 
-        # Calculer la perte
-        loss = F.smooth_l1_loss(current_q_values, target_q_values)
+        # Calculer la perte (pondérée par les poids d'importance en mode prioritaire)
+        if weights is None:
+            loss = F.smooth_l1_loss(current_q_values, target_q_values)
+        else:
+            losses = F.smooth_l1_loss(current_q_values, target_q_values, reduction='none')
+            loss = (losses * weights).mean()
+            td_errors = (target_q_values - current_q_values).detach().squeeze(1).numpy()
+            self.memory.update_priorities(indices, td_errors)
 
         # Mettre à jour le réseau
         self.optimizer.zero_grad()
@@ -180,11 +163,24 @@ class ImmuneCellAgent:
 
         return loss.item()
 
+    @profiled("checkpoint.snapshot")
+    def snapshot(self):
+        """
+        Copie de l'état sauvegardé (réseau et optimiseur), indépendante des mises à jour
+        suivantes: elle peut être écrite par un autre thread (voir CheckpointManager)
+        """
+        return {
+            'policy_network': {name: tensor.detach().clone()
+                               for name, tensor in self.policy_network.state_dict().items()},
+            'optimizer': copy.deepcopy(self.optimizer.state_dict()),
+        }
+
+    @profiled("checkpoint.save")
     def save(self, path):
         """
-        Sauvegarde le modèle
+        Sauvegarde le modèle (écriture atomique: fichier temporaire puis renommage)
         """
-        torch.save({
+        atomic_torch_save({
             'policy_network': self.policy_network.state_dict(),
             'optimizer': self.optimizer.state_dict(),
         }, path)
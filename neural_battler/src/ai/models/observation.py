@@ -0,0 +1,156 @@
+# neural_battler/src/ai/models/observation.py
+import numpy as np
+
+
+def state_size_for(num_pathogens):
+    """Taille de l'état: position (2) + murs (4) + k pathogènes × 4 + santé (1) + capacité spéciale (1)"""
+    return 8 + 4 * num_pathogens
+
+
+def num_pathogens_for(state_size):
+    """Nombre de pathogènes observés correspondant à une taille d'état"""
+    if state_size < 8 or (state_size - 8) % 4:
+        raise ValueError(f"Taille d'état invalide: {state_size}")
+    return (state_size - 8) // 4
+
+
+class ObservationEncoder:
+    """
+    Encode l'état d'un lymphocyte dans des buffers float32 préalloués.
+
+    Layout: [x/w, y/h, murs gauche/droite/haut/bas,
+             k × (distance normalisée, dx/w, dy/h, santé relative),
+             santé relative du lymphocyte, capacité spéciale prête]
+    Les k pathogènes les plus proches sont sélectionnés par argpartition puis triés.
+
+    Les buffers sont réutilisés à tour de rôle: un état retourné reste valide pendant
+    les num_buffers - 1 appels suivants. Un environnement qui rend `state` et
+    `next_state` en même temps utilise donc num_buffers=2.
+    """
+
+    def __init__(self, num_pathogens=5, num_buffers=1):
+        self.num_pathogens = num_pathogens
+        self.state_size = state_size_for(num_pathogens)
+        self._buffers = [np.zeros(self.state_size, dtype=np.float32) for _ in range(num_buffers)]
+        self._batch_buffers = [np.zeros((0, self.state_size), dtype=np.float32) for _ in range(num_buffers)]
+        self._tensors = {}
+        self._next = 0
+        self._next_batch = 0
+
+    def _take_buffer(self):
+        buffer = self._buffers[self._next]
+        self._next = (self._next + 1) % len(self._buffers)
+        return buffer
+
+    def _take_batch_buffer(self, batch_size):
+        index = self._next_batch
+        self._next_batch = (index + 1) % len(self._batch_buffers)
+        if self._batch_buffers[index].shape[0] != batch_size:
+            self._batch_buffers[index] = np.zeros((batch_size, self.state_size), dtype=np.float32)
+        return self._batch_buffers[index]
+
+    def as_tensor(self, array):
+        """Vue torch (sans copie) d'un buffer de l'encodeur, mise en cache par buffer"""
+        tensor = self._tensors.get(id(array))
+        if tensor is None or tensor.data_ptr() != array.ctypes.data:
+            import torch
+            tensor = torch.from_numpy(array)
+            self._tensors[id(array)] = tensor
+        return tensor
+
+    def encode(self, immune_cell, pathogens, width, height, geometry=None):
+        """
+        Encode l'état d'une cellule. geometry: CellGeometry alignée sur `pathogens`
+        (cache du Tissue); recalculée à partir des positions si absente.
+        """
+        state = self._take_buffer()
+        x, y = immune_cell.x, immune_cell.y
+        k = self.num_pathogens
+
+        state[0] = x / width
+        state[1] = y / height
+        state[2] = x / width
+        state[3] = (width - x) / width
+        state[4] = y / height
+        state[5] = (height - y) / height
+
+        block = state[6:6 + 4 * k].reshape(k, 4)
+        block[:] = 0.0
+        if pathogens:
+            if geometry is not None:
+                dx, dy, distances = geometry.dx, geometry.dy, geometry.distances
+            else:
+                dx = np.array([p.x for p in pathogens], dtype=np.float64) - x
+                dy = np.array([p.y for p in pathogens], dtype=np.float64) - y
+                distances = np.sqrt(dx ** 2 + dy ** 2)
+
+            closest = self._closest(distances, k)
+            m = len(closest)
+            block[:m, 0] = distances[closest] / np.sqrt(width ** 2 + height ** 2)
+            block[:m, 1] = dx[closest] / width
+            block[:m, 2] = dy[closest] / height
+            block[:m, 3] = [pathogens[i].health / pathogens[i].max_health for i in closest.tolist()]
+
+        state[6 + 4 * k] = immune_cell.health / immune_cell.max_health
+        state[7 + 4 * k] = 1.0 if immune_cell.special_ready else 0.0
+        return state
+
+    def encode_tensor(self, immune_cell, pathogens, width, height, geometry=None):
+        """Comme encode, mais retourne une vue torch du buffer (aucune allocation de données)"""
+        return self.as_tensor(self.encode(immune_cell, pathogens, width, height, geometry))
+
+    @staticmethod
+    def _closest(distances, k):
+        """Indices des k plus petites distances, triés (argpartition puis tri de k éléments)"""
+        if len(distances) > k:
+            candidates = np.argpartition(distances, k - 1)[:k]
+            return candidates[np.argsort(distances[candidates], kind="stable")]
+        return np.argsort(distances, kind="stable")
+
+    def encode_batch(self, cell_positions, cell_health_ratios, special_ready,
+                     pathogen_positions, pathogen_health_ratios, pathogen_mask, width, height):
+        """
+        Encode B observations d'un coup (plusieurs cellules ou plusieurs environnements).
+        cell_positions (B, 2), cell_health_ratios (B,), special_ready (B,),
+        pathogen_positions (B, P, 2), pathogen_health_ratios (B, P), pathogen_mask (B, P)
+        Retourne un buffer (B, state_size) float32.
+        """
+        batch_size = len(cell_positions)
+        k = self.num_pathogens
+        states = self._take_batch_buffer(batch_size)
+
+        x, y = cell_positions[:, 0], cell_positions[:, 1]
+        states[:, 0] = x / width
+        states[:, 1] = y / height
+        states[:, 2] = x / width
+        states[:, 3] = (width - x) / width
+        states[:, 4] = y / height
+        states[:, 5] = (height - y) / height
+
+        block = states[:, 6:6 + 4 * k].reshape(batch_size, k, 4)
+        block[:] = 0.0
+
+        num_slots = pathogen_positions.shape[1]
+        if num_slots:
+            delta = pathogen_positions - cell_positions[:, None, :]
+            distances = np.where(pathogen_mask, np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2), np.inf)
+
+            m = min(k, num_slots)
+            if num_slots > k:
+                candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            else:
+                candidates = np.broadcast_to(np.arange(num_slots), (batch_size, num_slots))
+            order = np.argsort(np.take_along_axis(distances, candidates, axis=1), axis=1, kind="stable")
+            closest = np.take_along_axis(candidates, order, axis=1)
+
+            rows = np.arange(batch_size)[:, None]
+            selected = distances[rows, closest]
+            valid = np.isfinite(selected)
+            block[:, :m, 0] = np.where(valid, selected / np.sqrt(width ** 2 + height ** 2), 0.0)
+            block[:, :m, 1] = np.where(valid, delta[rows, closest, 0] / width, 0.0)
+            block[:, :m, 2] = np.where(valid, delta[rows, closest, 1] / height, 0.0)
+            block[:, :m, 3] = np.where(valid, pathogen_health_ratios[rows, closest], 0.0)
+
+        states[:, 6 + 4 * k] = cell_health_ratios
+        states[:, 7 + 4 * k] = special_ready
+        return states
@@ -0,0 +1,240 @@
+# neural_battler/src/ai/models/replay_buffer.py
+import numpy as np
+import torch
+
+
+class ReplayBuffer:
+    """
+    Mémoire d'expériences circulaire à tableaux préalloués.
+
+    Les transitions sont écrites en place à l'index courant (l'ancienne est écrasée
+    quand le buffer est plein) et un batch est extrait par indexation directe
+    des tableaux, sans tuples ni torch.stack.
+    obs_dtype: type de stockage des observations (np.float16 divise la mémoire par deux;
+    les batchs sont toujours rendus en float32).
+    """
+
+    def __init__(self, capacity, state_size, obs_dtype=np.float32):
+        self.capacity = capacity
+        self.state_size = state_size
+        self.obs_dtype = np.dtype(obs_dtype)
+
+        self.states = np.zeros((capacity, state_size), dtype=self.obs_dtype)
+        self.next_states = np.zeros((capacity, state_size), dtype=self.obs_dtype)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+
+        self.position = 0  # Prochain index écrit
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les tableaux"""
+        return sum(array.nbytes for array in (self.states, self.next_states, self.actions, self.rewards, self.dones))
+
+    def add(self, state, action, reward, next_state, done):
+        """Ajoute une transition (les états sont copiés: l'appelant peut réutiliser ses buffers)"""
+        index = self.position
+        self.states[index] = np.asarray(state)
+        self.next_states[index] = np.asarray(next_state)
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.dones[index] = done
+
+        self.position = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return index
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Ajoute n transitions d'un coup (par exemple un step de VecTrainingEnvironment)"""
+        n = len(actions)
+        indices = (self.position + np.arange(n)) % self.capacity
+        self.states[indices] = np.asarray(states)
+        self.next_states[indices] = np.asarray(next_states)
+        self.actions[indices] = np.asarray(actions)
+        self.rewards[indices] = np.asarray(rewards)
+        self.dones[indices] = np.asarray(dones)
+
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return indices
+
+    def sample_indices(self, batch_size):
+        """Index distincts tirés uniformément, en O(batch_size) pour les grands buffers"""
+        if self.size < 4 * batch_size:
+            return np.random.choice(self.size, batch_size, replace=False)
+        # Tirage avec remise puis nouveau tirage en cas de doublon (rare)
+        indices = np.random.randint(0, self.size, batch_size)
+        while len(np.unique(indices)) < batch_size:
+            indices = np.random.randint(0, self.size, batch_size)
+        return indices
+
+    def get_batch(self, indices):
+        """Tenseurs (states, actions, rewards, next_states, dones) prêts pour l'apprentissage"""
+        return (
+            torch.from_numpy(self.states[indices]).float(),
+            torch.from_numpy(self.actions[indices]).unsqueeze(1),
+            torch.from_numpy(self.rewards[indices]).unsqueeze(1),
+            torch.from_numpy(self.next_states[indices]).float(),
+            torch.from_numpy(self.dones[indices]).unsqueeze(1),
+        )
+
+    def sample(self, batch_size):
+        return self.get_batch(self.sample_indices(batch_size))
+
+    def flush(self):
+        """Mémoire en RAM: rien à persister (voir MemmapReplayStore)"""
+
+    def _saved_arrays(self):
+        n = self.size
+        return {"capacity": np.array(self.capacity), "position": np.array(self.position), "size": np.array(n),
+                "states": self.states[:n], "next_states": self.next_states[:n], "actions": self.actions[:n],
+                "rewards": self.rewards[:n], "dones": self.dones[:n]}
+
+    def save(self, path):
+        """
+        Écrit le contenu dans un .npz non compressé: seules les transitions présentes,
+        observations dans leur type de stockage (voir load)
+        """
+        with open(path, "wb") as f:
+            np.savez(f, **self._saved_arrays())
+
+    def load(self, path):
+        """Restaure un contenu écrit par save (même capacité et même taille d'état)"""
+        with np.load(path) as data:
+            if int(data["capacity"]) != self.capacity or data["states"].shape[1:] != (self.state_size,):
+                raise ValueError(f"{path}: capacité {int(data['capacity'])} et état {data['states'].shape[1:]} "
+                                 f"incompatibles avec cette mémoire ({self.capacity}, {self.state_size})")
+            n = int(data["size"])
+            for name in ("states", "next_states", "actions", "rewards", "dones"):
+                getattr(self, name)[:n] = data[name]
+            self.position = int(data["position"])
+            self.size = n
+            self._load_extra(data)
+
+    def _load_extra(self, data):
+        pass
+
+
+class SumTree:
+    """
+    Arbre de sommes stocké dans un tableau: les feuilles [size, 2*size) contiennent
+    les priorités, chaque nœud i la somme de ses enfants 2i et 2i+1 (racine en 1).
+    Tirage proportionnel et mise à jour en O(log n), vectorisés sur un lot d'index.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.size = 1 << max(0, int(capacity - 1).bit_length())  # Puissance de deux >= capacity
+        self.depth = self.size.bit_length() - 1
+        self.tree = np.zeros(2 * self.size, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        """Fixe la priorité des feuilles `indices` puis remonte les sommes jusqu'à la racine"""
+        nodes = np.atleast_1d(np.asarray(indices, dtype=np.int64)) + self.size
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def get(self, indices):
+        return self.tree[np.asarray(indices, dtype=np.int64) + self.size]
+
+    def find(self, values):
+        """
+        Feuilles dont l'intervalle de somme cumulée contient chaque valeur de `values`.
+        Un sous-arbre de somme nulle n'est jamais choisi, même si l'arrondi des sommes
+        partielles fait dépasser la valeur: seules des feuilles de priorité > 0 sont rendues.
+        """
+        nodes = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = (values > left_sum) & (self.tree[left + 1] > 0)
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self.size
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Mémoire d'expériences à priorités (Schaul et al., 2016).
+    Une transition est tirée avec une probabilité proportionnelle à (|erreur TD| + epsilon)^alpha;
+    le biais introduit est corrigé par des poids d'importance (N * P)^-beta normalisés,
+    beta étant augmenté progressivement jusqu'à 1.
+    Les nouvelles transitions reçoivent la priorité maximale observée.
+    """
+
+    def __init__(self, capacity, state_size, obs_dtype=np.float32, alpha=0.6, beta=0.4,
+                 beta_increment=1e-4, epsilon=1e-5):
+        super().__init__(capacity, state_size, obs_dtype)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(capacity)
+
+    def add(self, state, action, reward, next_state, done):
+        index = super().add(state, action, reward, next_state, done)
+        self.tree.update(index, self.max_priority ** self.alpha)
+        return index
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        indices = super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, self.max_priority ** self.alpha)
+        return indices
+
+    def sample_prioritized(self, batch_size):
+        """
+        Tirage stratifié (un tirage par segment de la somme totale).
+        Retourne (indices, poids d'importance (batch_size, 1)).
+        """
+        total = self.tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + np.random.random(batch_size)) * segment
+        # Priorités toutes >= epsilon^alpha (voir update_priorities): feuilles remplies uniquement,
+        # probabilités et poids finis
+        indices = self.tree.find(np.minimum(values, np.nextafter(total, 0)))
+
+        probabilities = self.tree.get(indices) / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return indices, torch.from_numpy(weights.astype(np.float32)).unsqueeze(1)
+
+    def _saved_arrays(self):
+        arrays = super()._saved_arrays()
+        arrays.update(priorities=self.tree.get(np.arange(self.size)), max_priority=np.array(self.max_priority),
+                      beta=np.array(self.beta))
+        return arrays
+
+    def _load_extra(self, data):
+        # Contenu d'une mémoire uniforme: priorité maximale pour toutes les transitions
+        prioritized = "priorities" in data
+        self.max_priority = float(data["max_priority"]) if prioritized else 1.0
+        self.beta = float(data["beta"]) if prioritized else self.beta
+        self.tree.tree[:] = 0.0
+        if self.size:
+            priorities = data["priorities"] if prioritized else np.full(self.size, self.max_priority ** self.alpha)
+            self.tree.update(np.arange(self.size), np.maximum(priorities, self.epsilon ** self.alpha))
+
+    def update_priorities(self, indices, td_errors):
+        """
+        Met à jour les priorités à partir des erreurs TD du dernier apprentissage.
+        Priorité >= epsilon (erreur non finie comprise): une transition garde une probabilité
+        de tirage non nulle et un poids d'importance fini.
+        """
+        errors = np.nan_to_num(np.abs(np.asarray(td_errors, dtype=np.float64)).reshape(-1), nan=0.0)
+        priorities = errors + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
@@ -0,0 +1,168 @@
+# neural_battler/src/ai/models/replay_store.py
+import json
+import os
+
+import numpy as np
+import torch
+
+META_FILE = "meta.json"
+_FIELDS = ("states", "next_states", "actions", "rewards", "dones")
+
+
+class MemmapReplayStore:
+    """
+    Mémoire d'expériences sur disque (np.memmap) partageable entre processus.
+
+    Le store est découpé en `num_segments` segments circulaires de `segment_capacity`
+    transitions. Chaque processus écrivain possède son segment (pas de verrou:
+    un seul écrivain par segment) et tous les processus échantillonnent
+    uniformément sur l'ensemble des segments. Positions et tailles des segments
+    sont elles aussi stockées dans un memmap: rouvrir le store après un redémarrage
+    retrouve instantanément l'expérience persistée, sans la relire.
+
+    Même interface que ReplayBuffer (add, add_batch, sample_indices, get_batch, sample).
+    """
+
+    def __init__(self, path, writer=0):
+        """Ouvre un store existant; utiliser `open` ou `create` pour le créer"""
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+
+        self.state_size = self.meta["state_size"]
+        self.obs_dtype = np.dtype(self.meta["obs_dtype"])
+        self.num_segments = self.meta["num_segments"]
+        self.segment_capacity = self.meta["segment_capacity"]
+        self.capacity = self.num_segments * self.segment_capacity
+        if not 0 <= writer < self.num_segments:
+            raise ValueError(f"Écrivain {writer} hors des {self.num_segments} segments du store {path}")
+        self.writer = writer
+
+        shapes = self._shapes(self.capacity, self.state_size, self.obs_dtype)
+        for name, (shape, dtype) in shapes.items():
+            setattr(self, name, np.memmap(os.path.join(path, f"{name}.dat"), dtype=dtype, mode="r+", shape=shape))
+        # counters[segment] = (prochaine position écrite, nombre de transitions)
+        self.counters = np.memmap(os.path.join(path, "counters.dat"), dtype=np.int64, mode="r+",
+                                  shape=(self.num_segments, 2))
+        self._offset = self.writer * self.segment_capacity
+
+    @staticmethod
+    def _shapes(capacity, state_size, obs_dtype):
+        return {
+            "states": ((capacity, state_size), obs_dtype),
+            "next_states": ((capacity, state_size), obs_dtype),
+            "actions": ((capacity,), np.int64),
+            "rewards": ((capacity,), np.float32),
+            "dones": ((capacity,), np.float32),
+        }
+
+    @classmethod
+    def create(cls, path, state_size, segment_capacity=1_000_000, num_segments=1, obs_dtype=np.float16,
+               overwrite=False):
+        """Crée les fichiers du store; un store existant au même chemin n'est écrasé qu'avec overwrite=True"""
+        if not overwrite and os.path.exists(os.path.join(path, META_FILE)):
+            raise FileExistsError(f"Un store existe déjà dans {path} "
+                                  f"(open pour le rouvrir, overwrite=True pour l'écraser)")
+        os.makedirs(path, exist_ok=True)
+        capacity = num_segments * segment_capacity
+        for name, (shape, dtype) in cls._shapes(capacity, state_size, np.dtype(obs_dtype)).items():
+            # Fichiers creux: l'espace disque n'est consommé qu'à l'écriture
+            np.memmap(os.path.join(path, f"{name}.dat"), dtype=dtype, mode="w+", shape=shape).flush()
+        np.memmap(os.path.join(path, "counters.dat"), dtype=np.int64, mode="w+", shape=(num_segments, 2)).flush()
+
+        meta = {
+            "state_size": state_size,
+            "obs_dtype": np.dtype(obs_dtype).name,
+            "num_segments": num_segments,
+            "segment_capacity": segment_capacity,
+        }
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump(meta, f, indent=4)
+        return cls(path)
+
+    @classmethod
+    def open(cls, path, state_size, writer=0, segment_capacity=1_000_000, num_segments=1, obs_dtype=np.float16):
+        """Rouvre le store s'il existe (les paramètres de création sont alors ignorés), sinon le crée"""
+        if not os.path.exists(os.path.join(path, META_FILE)):
+            cls.create(path, state_size, segment_capacity, num_segments, obs_dtype)
+        store = cls(path, writer)
+        if store.state_size != state_size:
+            raise ValueError(f"Le store {path} contient des états de taille {store.state_size}, pas {state_size}")
+        return store
+
+    def __len__(self):
+        return int(self.counters[:, 1].sum())
+
+    @property
+    def position(self):
+        return int(self.counters[self.writer, 0])
+
+    @property
+    def size(self):
+        return int(self.counters[self.writer, 1])
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in _FIELDS)
+
+    def add(self, state, action, reward, next_state, done):
+        index = self._offset + self.position
+        self.states[index] = np.asarray(state)
+        self.next_states[index] = np.asarray(next_state)
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.dones[index] = done
+        self._advance(1)
+        return index
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        n = len(actions)
+        indices = self._offset + (self.position + np.arange(n)) % self.segment_capacity
+        self.states[indices] = np.asarray(states)
+        self.next_states[indices] = np.asarray(next_states)
+        self.actions[indices] = np.asarray(actions)
+        self.rewards[indices] = np.asarray(rewards)
+        self.dones[indices] = np.asarray(dones)
+        self._advance(n)
+        return indices
+
+    def _advance(self, n):
+        # Compteurs mis à jour après les données: un lecteur ne voit que des lignes écrites
+        self.counters[self.writer, 0] = (self.position + n) % self.segment_capacity
+        self.counters[self.writer, 1] = min(self.size + n, self.segment_capacity)
+
+    def sample_indices(self, batch_size):
+        """Index tirés uniformément (avec remise) parmi les transitions de tous les segments"""
+        sizes = np.array(self.counters[:, 1])
+        ends = np.cumsum(sizes)
+        draws = np.random.randint(0, ends[-1], batch_size)
+        segments = np.searchsorted(ends, draws, side="right")
+        return segments * self.segment_capacity + draws - (ends[segments] - sizes[segments])
+
+    def get_batch(self, indices):
+        """Transitions `indices`, lignes dans l'ordre demandé (alignées sur des poids d'importance)"""
+        # Lecture des pages du fichier dans l'ordre des index, puis remise dans l'ordre demandé
+        order = np.argsort(indices, kind="stable")
+        sorted_indices = np.asarray(indices)[order]
+        rows = np.empty_like(order)
+        rows[order] = np.arange(len(order))
+
+        def gather(array, dtype=None):
+            return torch.from_numpy(np.asarray(array[sorted_indices], dtype=dtype)[rows])
+
+        return (
+            gather(self.states, np.float32),
+            gather(self.actions).unsqueeze(1),
+            gather(self.rewards).unsqueeze(1),
+            gather(self.next_states, np.float32),
+            gather(self.dones).unsqueeze(1),
+        )
+
+    def sample(self, batch_size):
+        return self.get_batch(self.sample_indices(batch_size))
+
+    def flush(self):
+        """Force l'écriture sur disque (sauvegarde périodique, fin d'entraînement)"""
+        for name in _FIELDS:
+            getattr(self, name).flush()
+        self.counters.flush()
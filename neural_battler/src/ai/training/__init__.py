@@ -1,4 +1,27 @@
-from .environment import TrainingEnvironment
-from .train import train_immune_cell
-from .evaluate import evaluate_model
-from .batch_training import run_batch_training, run_parallel_training
\ No newline at end of file
+# neural_battler/src/ai/training/__init__.py
+# Imports paresseux (voir src/ai/models/__init__.py)
+import importlib
+
+_EXPORTS = {
+    "TrainingEnvironment": ".environment",
+    "VecTrainingEnvironment": ".vec_environment",
+    "train_immune_cell": ".train",
+    "train_vectorized": ".vec_train",
+    "evaluate_model": ".evaluate",
+    "run_batch_training": ".batch_training",
+    "run_parallel_training": ".batch_training",
+    "train_distributed": ".distributed",
+    "run_throughput_benchmark": ".throughput",
+    "plot_run": ".report",
+    "summarize_run": ".report",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
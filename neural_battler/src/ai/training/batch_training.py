@@ -7,6 +7,7 @@ import time
 import json
 from datetime import datetime
 from ...ai.training.train import train_immune_cell
+from ..models import MemmapReplayStore, state_size_for
 
 
 def run_batch_training(config):
@@ -34,7 +35,10 @@ def run_batch_training(config):
             "episodes": config["episodes"],
             "batch_size": config["batch_size"],
             "save_interval": config["save_interval"],
-            "model_path": config.get("base_model_path", None)
+            "model_path": config.get("base_model_path", None),
+            "replay_path": config.get("replay_path", None),
+            "replay_writer": config.get("replay_writer", 0),
+            "action_repeat": config.get("action_repeat", 1),
         }
 
         # Démarrer l'entraînement
@@ -43,7 +47,11 @@ def run_batch_training(config):
             episodes=session_config["episodes"],
             batch_size=session_config["batch_size"],
             save_interval=session_config["save_interval"],
-            model_path=session_config["model_path"]
+            model_path=session_config["model_path"],
+            replay_path=session_config["replay_path"],
+            replay_writer=session_config["replay_writer"],
+            replay_capacity=config.get("replay_capacity", 1_000_000),
+            action_repeat=session_config["action_repeat"]
         )
         end_time = time.time()
 
@@ -93,8 +101,20 @@ def run_parallel_training(config, num_processes):
         if num_sessions > 0:
             sub_config = config.copy()
             sub_config["num_sessions"] = num_sessions
+            # Chaque processus écrit dans son propre segment de la mémoire partagée
+            sub_config["replay_writer"] = len(sub_configs)
             sub_configs.append(sub_config)
 
+    # La mémoire sur disque est créée avant le lancement (un segment par processus)
+    replay_path = config.get("replay_path")
+    if replay_path:
+        store = MemmapReplayStore.open(replay_path, state_size_for(5),
+                                       segment_capacity=config.get("replay_capacity", 1_000_000),
+                                       num_segments=len(sub_configs))
+        if store.num_segments < len(sub_configs):
+            raise ValueError(f"Le store {replay_path} n'a que {store.num_segments} segments "
+                             f"pour {len(sub_configs)} processus")
+
     # Créer et démarrer les processus
     processes = []
     for sub_config in sub_configs:
@@ -115,6 +135,10 @@ if __name__ == "__main__":
     parser.add_argument("--save-interval", type=int, default=100, help="Intervalle de sauvegarde du modèle")
     parser.add_argument("--base-model", type=str, default=None, help="Modèle de base pour toutes les sessions")
     parser.add_argument("--parallel", type=int, default=1, help="Nombre de processus parallèles")
+    parser.add_argument("--replay-dir", type=str, default=None,
+                        help="Mémoire d'expériences sur disque partagée par les processus")
+    parser.add_argument("--replay-capacity", type=int, default=1_000_000,
+                        help="Capacité de la mémoire sur disque par processus")
 
     args = parser.parse_args()
 
@@ -123,7 +147,9 @@ if __name__ == "__main__":
         "episodes": args.episodes,
         "batch_size": args.batch_size,
         "save_interval": args.save_interval,
-        "base_model_path": args.base_model
+        "base_model_path": args.base_model,
+        "replay_path": args.replay_dir,
+        "replay_capacity": args.replay_capacity
     }
 
     print("Configuration de l'entraînement en lot:")
@@ -0,0 +1,261 @@
+# neural_battler/src/ai/training/distributed.py
+import os
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from ..models import CheckpointManager, ImmuneCellAgent, ImmuneCellNetwork
+from .environment import TrainingEnvironment
+from .evaluate import evaluate_agent
+
+
+class ExperienceRing:
+    """
+    File circulaire d'expériences en mémoire partagée (un producteur, un consommateur).
+
+    Les tableaux sont des tenseurs partagés transmis une seule fois à l'acteur au
+    lancement; ensuite aucune donnée n'est sérialisée. counters = (transitions écrites,
+    transitions lues): le producteur écrit les données avant d'avancer le compteur
+    d'écriture, le consommateur ne lit donc que des lignes complètes.
+    """
+
+    def __init__(self, capacity, state_size):
+        self.capacity = capacity
+        self.states = torch.zeros(capacity, state_size).share_memory_()
+        self.next_states = torch.zeros(capacity, state_size).share_memory_()
+        self.actions = torch.zeros(capacity, dtype=torch.int64).share_memory_()
+        self.rewards = torch.zeros(capacity).share_memory_()
+        self.dones = torch.zeros(capacity).share_memory_()
+        self.counters = torch.zeros(2, dtype=torch.int64).share_memory_()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_arrays", None)
+        return state
+
+    def _views(self):
+        """Vues numpy des tenseurs partagés (créées une fois par processus)"""
+        arrays = self.__dict__.get("_arrays")
+        if arrays is None:
+            arrays = self._arrays = tuple(t.numpy() for t in (self.states, self.actions, self.rewards,
+                                                               self.next_states, self.dones, self.counters))
+        return arrays
+
+    def push(self, state, action, reward, next_state, done):
+        """Ajoute une transition; retourne False si la file est pleine"""
+        states, actions, rewards, next_states, dones, counters = self._views()
+        written, read = counters
+        if written - read >= self.capacity:
+            return False
+        index = written % self.capacity
+        states[index] = np.asarray(state)
+        next_states[index] = np.asarray(next_state)
+        actions[index] = action
+        rewards[index] = reward
+        dones[index] = done
+        counters[0] = written + 1
+        return True
+
+    def drain(self, memory):
+        """Transfère toutes les transitions disponibles dans une mémoire d'expériences"""
+        states, actions, rewards, next_states, dones, counters = self._views()
+        written, read = int(counters[0]), int(counters[1])
+        n = written - read
+        if n == 0:
+            return 0
+        indices = (read + np.arange(n)) % self.capacity
+        memory.add_batch(states[indices], actions[indices], rewards[indices], next_states[indices], dones[indices])
+        counters[1] = written
+        return n
+
+
+class SharedPolicy:
+    """
+    Poids de la politique diffusés par l'apprenant aux acteurs via des tenseurs partagés.
+    L'apprenant copie ses poids en place (pas de sérialisation du modèle) et incrémente
+    la version; chaque acteur recharge ses poids locaux quand la version change.
+    """
+
+    def __init__(self, network, lock):
+        self.network = network
+        for parameter in self.network.parameters():
+            parameter.requires_grad_(False)
+        self.network.share_memory()
+        self.version = torch.zeros(1, dtype=torch.int64).share_memory_()
+        self.lock = lock
+
+    def publish(self, source):
+        with self.lock:
+            self.network.load_state_dict(source.state_dict())
+            self.version += 1
+
+    def pull(self, target, known_version):
+        """Met à jour `target` si une nouvelle version est disponible; retourne la version connue"""
+        version = int(self.version)
+        if version != known_version:
+            with self.lock:
+                target.load_state_dict(self.network.state_dict())
+                version = int(self.version)
+        return version
+
+
+def _actor_loop(actor_id, ring, policy, stats, stop_event, config):
+    """Processus acteur: simule TrainingEnvironment avec la dernière politique publiée"""
+    torch.set_num_threads(1)
+    seed = config["seed"] + actor_id
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    env = TrainingEnvironment(engine=config["engine"], num_pathogens=config["num_pathogens"],
+                              action_repeat=config["action_repeat"])
+    agent = ImmuneCellAgent(env.state_size, config["action_size"], memory_size=1)
+    agent.policy_network.eval()
+    version = policy.pull(agent.policy_network, -1)
+
+    epsilon = 1.0
+    state = env.reset()
+    episode_reward = 0.0
+    episode_step = 0
+    local_steps = 0
+    while not stop_event.is_set():
+        # Les 10 premières étapes de chaque épisode sont aléatoires (comme train_immune_cell)
+        if episode_step < 10:
+            action = random.randint(0, config["action_size"] - 1)
+        else:
+            action = agent.select_action(state, epsilon)
+        next_state, reward, done = env.step(action)
+
+        # Attente active si l'apprenant est en retard (contre-pression)
+        while not ring.push(state, action, reward, next_state, done):
+            if stop_event.is_set():
+                return
+            time.sleep(0.0005)
+
+        state = next_state
+        episode_reward += reward
+        episode_step += 1
+        local_steps += 1
+        if done:
+            stats[actor_id, 1] += 1
+            stats[actor_id, 2] += episode_reward
+            stats[actor_id, 3] += env.current_step
+            epsilon = max(config["epsilon_min"], epsilon * config["epsilon_decay"])
+            state = env.reset()
+            episode_reward = 0.0
+            episode_step = 0
+
+        if local_steps % config["pull_interval"] == 0:
+            stats[actor_id, 0] = local_steps
+            version = policy.pull(agent.policy_network, version)
+    stats[actor_id, 0] = local_steps
+
+
+def _check_actors(actors):
+    """Lève une erreur si un acteur s'est arrêté avant la fin (plantage, signal): l'apprenant attendrait sinon indéfiniment"""
+    for i, actor in enumerate(actors):
+        if actor.exitcode is not None:
+            raise RuntimeError(f"L'acteur {i} s'est arrêté prématurément (code de sortie {actor.exitcode})")
+
+
+def train_distributed(num_actors=4, total_steps=1_000_000, batch_size=64, sync_interval=100,
+                      ring_capacity=4096, model_path=None, engine="object", num_pathogens=5,
+                      prioritized=False, memory_size=100_000, save_interval=100_000, seed=0, action_repeat=1,
+                      keep_last=3, keep_best=2, eval_episodes=3):
+    """
+    Entraînement acteurs–apprenant: `num_actors` processus simulent des environnements
+    pendant que ce processus entraîne le réseau.
+
+    - l'expérience transite par une ExperienceRing en mémoire partagée par acteur
+    - les poids sont publiés toutes les `sync_interval` mises à jour (SharedPolicy)
+    - arrêt après `total_steps` pas d'environnement cumulés (un pas = `action_repeat` ticks)
+    - checkpoints écrits en arrière-plan (CheckpointManager), notés par la récompense
+      moyenne de `eval_episodes` épisodes d'évaluation gloutonne (evaluate_agent; 0: non notés)
+    - si un acteur s'arrête avant la fin, les autres sont arrêtés et RuntimeError est levée
+    """
+    action_size = 10
+    state_size = TrainingEnvironment(engine=engine, num_pathogens=num_pathogens).state_size
+    agent = ImmuneCellAgent(state_size, action_size, memory_size=memory_size, prioritized=prioritized)
+    if model_path and os.path.exists(model_path):
+        print(f"Chargement du modèle: {model_path}")
+        agent.load(model_path)
+
+    ctx = mp.get_context("spawn")
+    policy = SharedPolicy(ImmuneCellNetwork(state_size, 64, action_size), ctx.Lock())
+    policy.publish(agent.policy_network)
+    rings = [ExperienceRing(ring_capacity, state_size) for _ in range(num_actors)]
+    # stats[acteur] = (pas simulés, épisodes terminés, récompense cumulée, durée cumulée des épisodes)
+    stats = torch.zeros(num_actors, 4, dtype=torch.float64).share_memory_()
+    stop_event = ctx.Event()
+    config = {
+        "engine": engine,
+        "num_pathogens": num_pathogens,
+        "action_repeat": action_repeat,
+        "action_size": action_size,
+        "epsilon_min": 0.5,
+        "epsilon_decay": 0.9999,
+        "pull_interval": 50,
+        "seed": seed,
+    }
+
+    actors = [ctx.Process(target=_actor_loop, args=(i, rings[i], policy, stats, stop_event, config), daemon=True)
+              for i in range(num_actors)]
+    for actor in actors:
+        actor.start()
+
+    run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_distributed"
+    checkpoints = CheckpointManager(os.path.join("data", "neural_networks"), f"immune_cell_model_{run_id}",
+                                    keep_last=keep_last, keep_best=keep_best)
+
+    updates = 0
+    steps = 0
+    next_save = save_interval
+    next_report = time.time() + 10
+    start_time = time.time()
+    try:
+        while steps < total_steps:
+            _check_actors(actors)
+            received = sum(ring.drain(agent.memory) for ring in rings)
+            steps += received
+
+            if len(agent.memory) > batch_size:
+                agent.train(batch_size)
+                updates += 1
+                if updates % sync_interval == 0:
+                    policy.publish(agent.policy_network)
+            elif received == 0:
+                time.sleep(0.001)
+
+            if steps >= next_save:
+                score = evaluate_agent(agent, eval_episodes, engine=engine, num_pathogens=num_pathogens,
+                                       action_repeat=action_repeat) if eval_episodes else None
+                checkpoints.save(agent, f"step{steps}", score=score)
+                next_save += save_interval
+
+            if time.time() >= next_report:
+                elapsed = time.time() - start_time
+                episodes = stats[:, 1].sum().item()
+                mean_length = stats[:, 3].sum().item() / episodes if episodes else 0.0
+                print(f"Pas: {steps} ({steps / elapsed:.0f}/s), mises à jour: {updates} ({updates / elapsed:.0f}/s), "
+                      f"épisodes: {episodes:.0f}, durée moyenne: {mean_length:.0f}")
+                next_report += 10
+    finally:
+        stop_event.set()
+        for actor in actors:
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+
+    elapsed = time.time() - start_time
+    print(f"Entraînement distribué terminé: {steps} pas en {elapsed:.1f}s "
+          f"({steps / elapsed:.0f} pas/s, {updates / elapsed:.0f} mises à jour/s)")
+
+    final_path = checkpoints.save(agent, "final", pinned=True)
+    agent.memory.flush()
+    checkpoints.close()
+    print(f"Modèle final sauvegardé: {final_path}")
+    return agent, final_path
@@ -1,25 +1,32 @@
 import numpy as np
 import random
 
-from sympy.physics.units import action
-
 from ...game.world.tissue import Tissue
-from ..models import ImmuneCellAgent
+from ..models.actions import action_to_movement
+from ..models.observation import ObservationEncoder
+from ...utils.profiler import profiled
 
 
 class TrainingEnvironment:
     """Environnement d'entraînement pour un agent lymphocyte par renforcement"""
 
-    def __init__(self, width=800, height=600, max_steps=3000):
+    def __init__(self, width=800, height=600, max_steps=3000, engine="object", num_pathogens=5, action_repeat=1):
+        if action_repeat < 1:
+            raise ValueError(f"action_repeat doit être >= 1, pas {action_repeat}")
         self.width = width
         self.height = height
-        self.max_steps = max_steps
+        self.max_steps = max_steps  # En ticks du Tissue, quel que soit action_repeat
+        self.engine = engine  # Moteur de simulation du Tissue ("object" ou "vectorized")
+        # Nombre de ticks du Tissue pendant lesquels chaque action est répétée (frame-skip)
+        self.action_repeat = action_repeat
         self.current_step = 0
         self.tissue = None
         self.immune_cell = None
         self.default_speed = 1.0
         self.wall_stuck_counter = 0
-        self.helper_agent = ImmuneCellAgent(28, 10)
+        # Deux buffers: `state` et `next_state` d'une transition ne partagent pas leur mémoire
+        self.encoder = ObservationEncoder(num_pathogens, num_buffers=2)
+        self.state_size = self.encoder.state_size
         self.center_x = width / 2
         self.center_y = height / 2
         self.reset()
@@ -28,7 +35,7 @@ class TrainingEnvironment:
         """Réinitialise l'environnement pour un nouvel épisode"""
         self.current_step = 0
         self.wall_stuck_counter = 0
-        self.tissue = Tissue(self.width, self.height)
+        self.tissue = Tissue(self.width, self.height, engine=self.engine)
 
         # Placer le lymphocyte au centre
         self.immune_cell = self.tissue.add_immune_cell(self.center_x, self.center_y, "t_cell")
@@ -48,19 +55,36 @@ class TrainingEnvironment:
 
         return self._get_state()
 
+    @profiled("env.get_state")
     def _get_state(self):
         """Récupère l'état actuel pour l'agent"""
-        return self.helper_agent.get_state(
+        return self.encoder.encode_tensor(
             self.immune_cell,
             self.tissue.pathogens,
             self.width,
-            self.height
+            self.height,
+            geometry=self.tissue.geometry.for_cell(self.immune_cell)
         )
 
+    @profiled("env.step")
     def step(self, action):
-        """Effectue une action et retourne le nouvel état, la récompense, et si l'épisode est terminé"""
+        """
+        Effectue une action et retourne le nouvel état, la récompense, et si l'épisode est terminé.
+        L'action est répétée pendant `action_repeat` ticks (arrêt anticipé en fin d'épisode):
+        la récompense est la somme des récompenses des ticks, seul l'état final est encodé.
+        """
+        total_reward = 0.0
+        for _ in range(self.action_repeat):
+            reward, done = self._tick(action)
+            total_reward += reward
+            if done:
+                break
+        return self._get_state(), total_reward, done
+
+    def _tick(self, action):
+        """Applique l'action pendant un tick du Tissue; retourne (récompense, terminé)"""
         # Obtenir le vecteur de mouvement
-        dx, dy = self.helper_agent.action_to_movement(action, self.default_speed)
+        dx, dy = action_to_movement(action, self.default_speed)
 
         # Sauvegarder l'état précédent
         prev_health = self.immune_cell.health
@@ -97,7 +121,7 @@ class TrainingEnvironment:
         if len(self.tissue.pathogens) == 0:
             self._spawn_random_pathogen()
 
-        return self._get_state(), reward, done
+        return reward, done
 
     def _is_near_wall(self):
         """Vérifie si le lymphocyte est proche d'un mur"""
@@ -109,6 +133,7 @@ class TrainingEnvironment:
                 self.immune_cell.y > self.height - margin
         )
 
+    @profiled("env.spawn")
     def _spawn_random_pathogen(self):
         """Génère un pathogène à une position aléatoire loin des murs"""
         margin = 100
@@ -116,6 +141,7 @@ class TrainingEnvironment:
         y = random.uniform(margin, self.height - margin)
         self.tissue.add_pathogen(x, y, "bacteria")
 
+    @profiled("env.spawn")
     def _spawn_pathogen_near_wall(self):
         """Génère un pathogène près du mur le plus proche du lymphocyte"""
         distances = [
@@ -153,6 +179,7 @@ class TrainingEnvironment:
             self.immune_cell.x += (dir_x / dist) * force
             self.immune_cell.y += (dir_y / dist) * force
 
+    @profiled("env.reward")
     def _calculate_reward(self, prev_health, prev_num_pathogens, dx, dy):
         reward = 0.0
 
@@ -201,19 +228,16 @@ class TrainingEnvironment:
             reward -= 0.05
 
         # 3. Récompenses basées sur la proximité des pathogènes
+        geometry = self.tissue.geometry.for_cell(self.immune_cell)
         if self.tissue.pathogens:
-            # Trouver le pathogène le plus proche
-            closest_dist = float('inf')
-            for pathogen in self.tissue.pathogens:
-                dist = ((pathogen.x - self.immune_cell.x) ** 2 + (pathogen.y - self.immune_cell.y) ** 2) ** 0.5
-                if dist < closest_dist:
-                    closest_dist = dist
+            # Distance au pathogène le plus proche (cache géométrique partagé avec l'observation)
+            closest_dist = geometry.closest_distance
 
             # Si un pathogène est dangeureusement proche
             danger_zone = 30
             if closest_dist < danger_zone:
                 # Vérifier si le mouvement nous éloigne du pathogène le plus proche
-                if prev_dist_to_closest is not None and closest_dist > prev_dist_to_closest:
+                if self.prev_dist_to_closest is not None and closest_dist > self.prev_dist_to_closest:
                     reward += 0.2  # Bonus pour esquiver
 
             # Maintenir une distance optimale pour tirer (ni trop près, ni trop loin)
@@ -229,7 +253,7 @@ class TrainingEnvironment:
             # Si la capacité était prête mais ne l'est plus maintenant (a été utilisée)
             if getattr(self, 'prev_special_ready', True) and not self.immune_cell.special_ready:
                 # Vérifier si des pathogènes sont à proximité pour que l'utilisation soit pertinente
-                nearby_pathogens = len(self.tissue.get_nearby_pathogens(self.immune_cell.x, self.immune_cell.y, 100))
+                nearby_pathogens = len(geometry.within(100))
                 if nearby_pathogens >= 2:
                     reward += 0.5  # Bonus important si utilisé contre plusieurs pathogènes
                 else:
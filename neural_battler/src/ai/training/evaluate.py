@@ -2,19 +2,31 @@
 import os
 import json
 import argparse
-import matplotlib.pyplot as plt
+import random
 import numpy as np
-from tqdm import tqdm
 from .environment import TrainingEnvironment
 from ..inference.immune_cell_controller import ImmuneCellController
+from ...utils.profiler import profiler
 
-def evaluate_model(model_path, num_episodes=50, max_steps=30000, render=False):
+def evaluate_model(model_path, num_episodes=50, max_steps=30000, render=False, backend="auto", seed=None,
+                   profile_interval=0):
     """
     Évalue un modèle entraîné sur plusieurs épisodes
+    backend: backend d'inférence du contrôleur (voir load_policy)
+    seed: graine des générateurs aléatoires, pour comparer plusieurs modèles sur les mêmes épisodes
+    profile_interval: si > 0, temps par phase (voir utils.profiler) affichés tous les N épisodes
     """
-    # Créer l'environnement et le contrôleur
-    env = TrainingEnvironment(max_steps=max_steps)
-    controller = ImmuneCellController(model_path)
+    from tqdm import tqdm
+
+    if profile_interval > 0:
+        profiler.enable()
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+    # Créer le contrôleur et l'environnement (même nombre de pathogènes observés que le modèle)
+    controller = ImmuneCellController(model_path, backend=backend)
+    env = TrainingEnvironment(max_steps=max_steps, num_pathogens=controller.encoder.num_pathogens)
 
     # Suivi des métriques
     episode_rewards = []
@@ -35,7 +47,8 @@ def evaluate_model(model_path, num_episodes=50, max_steps=30000, render=False):
                 env.immune_cell,
                 env.tissue.pathogens,
                 env.width,
-                env.height
+                env.height,
+                env.tissue.geometry.for_cell(env.immune_cell)
             )
 
             # Exécuter l'action
@@ -61,6 +74,10 @@ def evaluate_model(model_path, num_episodes=50, max_steps=30000, render=False):
         survival_times.append(env.current_step / 60)  # Conversion en secondes (à 60 FPS)
         pathogen_counts.append(len(env.tissue.pathogens))
 
+        if profile_interval > 0 and (episode + 1) % profile_interval == 0:
+            print("\n" + profiler.report(f"Profil des épisodes {episode + 2 - profile_interval}-{episode + 1}"))
+            profiler.reset()
+
     # Calculer les statistiques
     results = {
         "model_path": model_path,
@@ -80,7 +97,34 @@ def evaluate_model(model_path, num_episodes=50, max_steps=30000, render=False):
     return results
 
 
-def evaluate_multiple_models(model_paths, num_episodes=30, max_steps=1000):
+def evaluate_agent(agent, num_episodes=3, max_steps=3000, seed=0, **env_kwargs):
+    """
+    Récompense moyenne de la politique gloutonne (epsilon = 0) d'un agent en mémoire.
+    Les épisodes utilisent toujours la même graine: des checkpoints successifs sont
+    notés sur les mêmes épisodes. Les générateurs aléatoires sont ensuite restaurés,
+    l'entraînement en cours n'est donc pas perturbé.
+    env_kwargs: paramètres de TrainingEnvironment (engine, num_pathogens, action_repeat)
+    """
+    from .snapshot import rng_state, set_rng_state
+
+    saved = rng_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    env = TrainingEnvironment(max_steps=max_steps, **env_kwargs)
+    total_reward = 0.0
+    try:
+        for _ in range(num_episodes):
+            state = env.reset()
+            done = False
+            while not done:
+                state, reward, done = env.step(agent.select_action(state, epsilon=0.0))
+                total_reward += reward
+    finally:
+        set_rng_state(saved)
+    return total_reward / num_episodes
+
+
+def evaluate_multiple_models(model_paths, num_episodes=30, max_steps=1000, profile_interval=0):
     """
     Évalue plusieurs modèles et compare leurs performances
     """
@@ -89,7 +133,7 @@ def evaluate_multiple_models(model_paths, num_episodes=30, max_steps=1000):
     for model_path in model_paths:
         print(f"\nÉvaluation du modèle: {model_path}")
         model_name = os.path.basename(model_path)
-        results = evaluate_model(model_path, num_episodes, max_steps)
+        results = evaluate_model(model_path, num_episodes, max_steps, profile_interval=profile_interval)
         all_results[model_name] = results
 
     # Sauvegarder les résultats
@@ -118,6 +162,8 @@ def create_comparison_plots(results, timestamp):
         ("avg_reward", "Récompense moyenne"),
         ("avg_pathogen_count", "Nombre moyen de pathogènes en fin d'épisode")
     ]
+    # matplotlib n'est chargé que si un graphique est écrit
+    import matplotlib.pyplot as plt
 
     # Créer un graphique pour chaque métrique
     for metric_key, metric_label in metrics:
@@ -162,6 +208,8 @@ if __name__ == "__main__":
     parser.add_argument("--episodes", type=int, default=30, help="Nombre d'épisodes d'évaluation")
     parser.add_argument("--steps", type=int, default=1000, help="Nombre maximum de pas par épisode")
     parser.add_argument("--render", action="store_true", help="Afficher le rendu de l'évaluation")
+    parser.add_argument("--profile", type=int, default=0, metavar="N",
+                        help="Afficher le temps par phase tous les N épisodes (0: désactivé)")
 
     args = parser.parse_args()
 
@@ -185,7 +233,8 @@ if __name__ == "__main__":
 
     if len(model_paths) == 1 and args.render:
         # Évaluation détaillée d'un seul modèle avec rendu
-        results = evaluate_model(model_paths[0], args.episodes, args.steps, args.render)
+        results = evaluate_model(model_paths[0], args.episodes, args.steps, args.render,
+                                 profile_interval=args.profile)
         print("\nRésultats:")
         for key, value in results.items():
             if isinstance(value, float):
@@ -194,4 +243,4 @@ if __name__ == "__main__":
                 print(f"{key}: {value}")
     else:
         # Évaluation comparative de plusieurs modèles
-        evaluate_multiple_models(model_paths, args.episodes, args.steps)
\ No newline at end of file
+        evaluate_multiple_models(model_paths, args.episodes, args.steps, args.profile)
\ No newline at end of file
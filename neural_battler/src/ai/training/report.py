@@ -0,0 +1,105 @@
+# neural_battler/src/ai/training/report.py
+import glob
+import os
+
+import numpy as np
+
+from ...utils.metrics import RollingStats, metrics_segments, read_metrics
+
+# Sans torch ni matplotlib à l'import: utilisable pendant qu'un entraînement tourne
+METRICS_DIR = os.path.join("data", "metrics")
+EPISODE_FIELDS = ("episode", "reward", "length", "loss", "epsilon", "env_steps", "updates", "time")
+
+
+def latest_run(directory=METRICS_DIR):
+    """Préfixe du journal de métriques le plus récemment écrit"""
+    segments = glob.glob(os.path.join(directory, "*.[0-9][0-9][0-9][0-9].jsonl"))
+    if not segments:
+        raise FileNotFoundError(f"Aucun journal de métriques dans {directory}")
+    return max(segments, key=os.path.getmtime).rsplit(".", 2)[0]
+
+
+def resolve_run(run=None, directory=METRICS_DIR):
+    """run: None (dernier run), identifiant (run_YYYYmmdd_HHMMSS) ou préfixe de chemin"""
+    if run is None:
+        return latest_run(directory)
+    prefix = run if metrics_segments(run) else os.path.join(directory, run)
+    if not metrics_segments(prefix):
+        raise FileNotFoundError(f"Aucun journal de métriques pour {run}")
+    return prefix
+
+
+def load_episodes(prefix):
+    """Colonnes des enregistrements "episode" ({champ: tableau}); perte NaN avant la première mise à jour"""
+    columns = {field: [] for field in EPISODE_FIELDS}
+    for record in read_metrics(prefix, "episode"):
+        for field in EPISODE_FIELDS:
+            value = record.get(field)
+            columns[field].append(np.nan if value is None else value)
+    return {field: np.asarray(values, dtype=np.float64) for field, values in columns.items()}
+
+
+def summarize_run(prefix, window=100):
+    """Dernier état d'un run (lecture en flux, mémoire constante): moyennes glissantes sur `window` épisodes"""
+    rewards, lengths, losses = RollingStats(window), RollingStats(window), RollingStats(window)
+    last = None
+    for last in read_metrics(prefix, "episode"):
+        rewards.record(last["reward"])
+        lengths.record(last["length"])
+        if last["loss"] is not None:
+            losses.record(last["loss"])
+    if last is None:
+        return {"episodes": 0}
+    return {"episodes": last["episode"], "env_steps": last["env_steps"], "updates": last["updates"],
+            "epsilon": last["epsilon"], "time": last["time"],
+            "reward": rewards.summary(), "length": lengths.summary(), "loss": losses.summary()}
+
+
+def format_summary(summary, window=100):
+    if not summary["episodes"]:
+        return "Aucun épisode terminé"
+    return (f"Épisode {summary['episodes']} ({summary['env_steps']} pas, {summary['updates']} mises à jour, "
+            f"{summary['time']:.0f}s, epsilon {summary['epsilon']:.3f})\n"
+            f"  Sur les {min(window, summary['reward']['count'])} derniers épisodes: "
+            f"récompense {summary['reward']['mean']:.2f} ± {summary['reward']['std']:.2f}, "
+            f"durée {summary['length']['mean']:.0f} ticks, perte {summary['loss']['mean']:.4f}")
+
+
+def _rolling_mean(episodes, values, window):
+    """(épisodes, moyenne glissante) sur les valeurs présentes (la perte manque avant la première mise à jour)"""
+    present = ~np.isnan(values)
+    episodes, values = episodes[present], values[present]
+    window = min(window, len(values))
+    if not window:
+        return episodes, values
+    return episodes[window - 1:], np.convolve(values, np.ones(window) / window, mode="valid")
+
+
+def plot_run(prefix, output_path=None, window=100):
+    """Courbes de récompense, durée et perte par épisode (moyenne glissante superposée)"""
+    import matplotlib.pyplot as plt
+
+    episodes = load_episodes(prefix)
+    if output_path is None:
+        output_path = os.path.join("data", "stats", f"training_performance_{os.path.basename(prefix)}.png")
+
+    plt.figure(figsize=(15, 5))
+    panels = (("reward", "Récompenses par épisode", "Récompense totale"),
+              ("length", "Durée des épisodes", "Nombre de pas"),
+              ("loss", "Perte moyenne par épisode", "Perte"))
+    for i, (field, title, label) in enumerate(panels, start=1):
+        plt.subplot(1, 3, i)
+        plt.plot(episodes["episode"], episodes[field], alpha=0.4)
+        x, mean = _rolling_mean(episodes["episode"], episodes[field], window)
+        if len(mean):
+            plt.plot(x, mean, label=f"moyenne sur {window}")
+            plt.legend()
+        plt.title(title)
+        plt.xlabel('Épisode')
+        plt.ylabel(label)
+
+    plt.tight_layout()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    plt.savefig(output_path)
+    plt.close()
+    return output_path
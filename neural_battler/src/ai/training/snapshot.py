@@ -0,0 +1,92 @@
+# neural_battler/src/ai/training/snapshot.py
+import glob
+import os
+import random
+
+import numpy as np
+import torch
+
+from ..models.checkpoint import atomic_torch_save
+from ..models.replay_store import MemmapReplayStore
+
+# Un dossier par run: trainer.pt (poids, optimiseur, compteurs, générateurs) et replay_<épisode>.npz
+SNAPSHOT_DIR = os.path.join("data", "resume")
+TRAINER_FILE = "trainer.pt"
+
+
+def rng_state():
+    """États des générateurs random, NumPy (global) et torch, en types simples (compatibles weights_only)"""
+    name, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+    return {"python": random.getstate(), "numpy": (name, keys.tolist(), position, has_gauss, cached_gaussian),
+            "torch": torch.get_rng_state()}
+
+
+def set_rng_state(state):
+    version, internal, gauss = state["python"]
+    random.setstate((version, tuple(internal), gauss))
+    name, keys, position, has_gauss, cached_gaussian = state["numpy"]
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), position, has_gauss, cached_gaussian))
+    torch.set_rng_state(state["torch"])
+
+
+def snapshot_dir_for(run_id, root=SNAPSHOT_DIR):
+    return os.path.join(root, run_id)
+
+
+def save_snapshot(directory, agent, trainer_state):
+    """
+    Instantané complet d'un entraînement, pris entre deux épisodes.
+
+    trainer_state: compteurs, epsilon, statistiques... (types Python simples).
+    La mémoire d'expériences est écrite dans un nouveau fichier, puis trainer.pt (renommage
+    atomique) qui la référence, puis l'ancienne mémoire est supprimée: un arrêt à n'importe
+    quel moment laisse le dossier dans un état cohérent. Un MemmapReplayStore est déjà sur
+    disque: il est seulement vidé sur disque (il contient aussi les transitions écrites
+    après l'instantané).
+    """
+    os.makedirs(directory, exist_ok=True)
+    replay_file = None
+    if isinstance(agent.memory, MemmapReplayStore):
+        agent.memory.flush()
+    else:
+        replay_file = f"replay_{trainer_state['episode']:08d}.npz"
+        tmp_path = os.path.join(directory, f".{replay_file}.tmp")
+        agent.memory.save(tmp_path)
+        os.replace(tmp_path, os.path.join(directory, replay_file))
+
+    atomic_torch_save({"agent": agent.snapshot(), "trainer": trainer_state, "rng": rng_state(),
+                       "replay": replay_file}, os.path.join(directory, TRAINER_FILE))
+
+    for path in glob.glob(os.path.join(directory, "replay_*.npz")):
+        if os.path.basename(path) != replay_file:
+            os.remove(path)
+
+
+def read_snapshot(directory):
+    return torch.load(os.path.join(directory, TRAINER_FILE))
+
+
+def restore_agent(directory, snapshot, agent):
+    """Poids, optimiseur et mémoire d'expériences de l'instantané (les générateurs sont restaurés à part)"""
+    agent.policy_network.load_state_dict(snapshot["agent"]["policy_network"])
+    agent.optimizer.load_state_dict(snapshot["agent"]["optimizer"])
+    if snapshot["replay"] is not None:
+        agent.memory.load(os.path.join(directory, snapshot["replay"]))
+
+
+def find_snapshot(resume, root=SNAPSHOT_DIR):
+    """
+    resume: dossier d'instantané, identifiant de run, ou "latest" (instantané le plus récent
+    s'il n'est pas celui d'un run terminé). Retourne le dossier, ou None pour "latest" sans
+    run à reprendre.
+    """
+    if resume == "latest":
+        candidates = glob.glob(os.path.join(root, "*", TRAINER_FILE))
+        if not candidates:
+            return None
+        directory = os.path.dirname(max(candidates, key=os.path.getmtime))
+        return None if read_snapshot(directory)["trainer"].get("completed") else directory
+    for directory in (resume, snapshot_dir_for(resume, root)):
+        if os.path.exists(os.path.join(directory, TRAINER_FILE)):
+            return directory
+    raise FileNotFoundError(f"Aucun instantané de reprise pour {resume}")
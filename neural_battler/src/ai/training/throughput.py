@@ -0,0 +1,167 @@
+# neural_battler/src/ai/training/throughput.py
+import json
+import os
+import platform
+import resource
+import socket
+import tempfile
+import time
+from datetime import datetime
+
+# torch, l'entraînement et l'évaluation sont importés à l'usage: l'historique se lit sans eux
+HISTORY_PATH = os.path.join("data", "benchmarks", "throughput_history.jsonl")
+
+
+def cpu_model():
+    """Modèle du processeur (/proc/cpuinfo sous Linux, platform sinon)"""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus (ru_maxrss: Ko sous Linux, octets sous macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if platform.system() == "Darwin" else peak / 1024
+
+
+def machine_info():
+    """Contexte des mesures, pour comparer des nœuds différents (SLURM)"""
+    import torch
+    return {
+        "host": socket.gethostname(),
+        "slurm_node": os.environ.get("SLURMD_NODENAME"),
+        "slurm_job": os.environ.get("SLURM_JOB_ID"),
+        "cpu_model": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "torch": torch.__version__,
+        "python": platform.python_version(),
+    }
+
+
+class _ForwardCounter:
+    """Compte les appels aux modules d'un type donné (hook global de torch)"""
+
+    def __init__(self, module_type):
+        self.module_type = module_type
+        self.count = 0
+        self._handle = None
+
+    def _hook(self, module, inputs, output):
+        if isinstance(module, self.module_type):
+            self.count += 1
+
+    def __enter__(self):
+        import torch
+        self._handle = torch.nn.modules.module.register_module_forward_hook(self._hook)
+        return self
+
+    def __exit__(self, *exc):
+        self._handle.remove()
+
+
+def run_throughput_benchmark(train_steps=5000, eval_episodes=5, eval_steps=1000, batch_size=64, seed=0,
+                             engine="object", num_pathogens=5, threads=None, num_envs=1):
+    """
+    Tranches à graine et budget fixes de train_immune_cell puis evaluate_model,
+    sans checkpoint ni graphique (le modèle évalué vit dans un dossier temporaire).
+    Retourne un enregistrement: débits (pas d'env, mises à jour, forwards par seconde),
+    pic de RSS et contexte machine. Les durées sont de bout en bout (construction de
+    l'agent et chargement du modèle compris); les forwards d'entraînement comptent
+    chaque appel du réseau (sélection d'action et deux par mise à jour).
+    num_envs: si > 1, entraînement vectorisé (train_vectorized: un forward et une mise à jour
+    pour num_envs transitions) au lieu de train_immune_cell; `engine` ne s'applique alors pas.
+    """
+    import torch
+    from ..models.immune_cell_model import ImmuneCellNetwork
+    from .evaluate import evaluate_model
+    from .train import train_immune_cell
+    from .vec_train import train_vectorized
+
+    if threads is not None:
+        torch.set_num_threads(threads)
+
+    with _ForwardCounter(ImmuneCellNetwork) as forwards:
+        start = time.perf_counter()
+        if num_envs > 1:
+            agent, _ = train_vectorized(episodes=10 ** 9, num_envs=num_envs, batch_size=batch_size,
+                                        num_pathogens=num_pathogens, max_env_steps=train_steps,
+                                        save=False, seed=seed)
+        else:
+            agent, _ = train_immune_cell(episodes=10 ** 9, batch_size=batch_size, engine=engine,
+                                         num_pathogens=num_pathogens, max_env_steps=train_steps,
+                                         save=False, seed=seed)
+        train_time = time.perf_counter() - start
+    # Nombre de pas d'Adam = mises à jour de gradient effectuées
+    updates = max((int(state["step"]) for state in agent.optimizer.state.values()), default=0)
+    train_rss = peak_rss_mb()
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, "model.pt")
+        agent.save(model_path)
+        start = time.perf_counter()
+        results = evaluate_model(model_path, eval_episodes, eval_steps, seed=seed)
+        eval_time = time.perf_counter() - start
+    # Évaluation: une décision (un forward NumPy) par pas d'environnement
+    eval_steps_done = int(round(results["avg_episode_length"] * eval_episodes))
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "config": {"train_steps": train_steps, "eval_episodes": eval_episodes, "eval_steps": eval_steps,
+                   "batch_size": batch_size, "seed": seed, "engine": engine, "num_pathogens": num_pathogens,
+                   "num_envs": num_envs},
+        "machine": machine_info(),
+        "train": {
+            "seconds": train_time,
+            "env_steps_per_s": train_steps / train_time,
+            "updates_per_s": updates / train_time,
+            "forwards_per_s": forwards.count / train_time,
+            "peak_rss_mb": train_rss,
+        },
+        "evaluate": {
+            "seconds": eval_time,
+            "env_steps_per_s": eval_steps_done / eval_time,
+            "forwards_per_s": eval_steps_done / eval_time,
+            "peak_rss_mb": peak_rss_mb(),
+        },
+    }
+
+
+def append_history(record, path=HISTORY_PATH):
+    """Ajoute une mesure à l'historique (une ligne JSON par exécution)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def format_record(record, previous=None):
+    """Résumé lisible; `previous`: mesure antérieure comparable (même config) pour les écarts"""
+    machine = record["machine"]
+    lines = [f"Machine: {machine['cpu_model']} ({machine['cpu_count']} CPU), "
+             f"{machine['torch_threads']} threads torch, hôte {machine['slurm_node'] or machine['host']}"]
+    for phase in ("train", "evaluate"):
+        metrics = record[phase]
+        parts = []
+        for key, label in (("env_steps_per_s", "pas/s"), ("updates_per_s", "mises à jour/s"),
+                           ("forwards_per_s", "forwards/s")):
+            if key not in metrics:
+                continue
+            text = f"{metrics[key]:,.0f} {label}"
+            if previous and previous[phase].get(key):
+                text += f" ({metrics[key] / previous[phase][key] - 1:+.1%})"
+            parts.append(text)
+        lines.append(f"{phase:>9}: " + ", ".join(parts) + f", pic RSS {metrics['peak_rss_mb']:.0f} Mo")
+    return "\n".join(lines)
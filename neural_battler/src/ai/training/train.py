@@ -1,60 +1,142 @@
 # neural_battler/src/ai/training/train.py
 import os
+import random
+import time
 import torch
 import numpy as np
-import matplotlib.pyplot as plt
 from tqdm import tqdm
 import argparse
-from ..models import ImmuneCellAgent
+from ..models import CheckpointManager, ImmuneCellAgent, MemmapReplayStore
 from .environment import TrainingEnvironment  # Import direct depuis le module
+from .evaluate import evaluate_agent
+from .report import METRICS_DIR
+from .snapshot import find_snapshot, read_snapshot, restore_agent, save_snapshot, set_rng_state, snapshot_dir_for
+from ...utils.metrics import MetricsWriter, RollingStats
+from ...utils.profiler import profiler
 from datetime import datetime
 
-def train_immune_cell(episodes=1000, batch_size=64, save_interval=10, model_path=None):
+def train_immune_cell(episodes=1000, batch_size=64, save_interval=10, model_path=None, engine="object",
+                      num_pathogens=5, prioritized=False, replay_path=None, replay_writer=0,
+                      replay_capacity=1_000_000, action_repeat=1, profile_interval=0,
+                      max_env_steps=None, save=True, seed=None, keep_last=3, keep_best=2, resume=None,
+                      snapshot_interval=None, eval_episodes=3):
     """
     Entraîne un agent de lymphocyte par reinforcement learning
+
+    replay_path: dossier d'un MemmapReplayStore (créé s'il n'existe pas, sinon rouvert
+    avec l'expérience déjà persistée); replay_writer: segment écrit par ce processus
+    action_repeat: ticks du Tissue par décision (voir TrainingEnvironment); divise
+    d'autant les forwards, écritures en mémoire et pas de gradient par seconde simulée
+    profile_interval: si > 0, temps par phase (voir utils.profiler) affichés tous les N épisodes
+    max_env_steps: arrêt après ce nombre d'appels à env.step (budget fixe, voir `train_all.py bench`)
+    save: False pour n'écrire ni modèles ni métriques (le chemin retourné est alors None)
+    Les métriques (une ligne par épisode et par mise à jour) sont écrites au fil de l'eau dans
+    data/metrics/<run_id>.*.jsonl; `train_all.py report` en trace les courbes.
+    seed: graine de random, NumPy et torch pour un entraînement reproductible
+    keep_last / keep_best: checkpoints périodiques conservés (les plus récents / meilleur
+    score), écrits en arrière-plan (voir CheckpointManager)
+    eval_episodes: épisodes d'évaluation gloutonne (evaluate_agent, graine fixe) joués à chaque
+    sauvegarde; leur récompense moyenne est le score du checkpoint (0: pas d'évaluation,
+    checkpoints non notés et keep_best sans effet)
+    snapshot_interval: épisodes entre deux instantanés de reprise dans data/resume/<run_id>
+    (par défaut save_interval; 0: aucun). Un instantané contient tout l'état de l'entraînement:
+    poids, optimiseur, mémoire d'expériences, epsilon, compteurs, générateurs aléatoires,
+    statistiques et position du journal de métriques.
+    resume: dossier d'instantané, identifiant de run, ou "latest" (dernier run inachevé;
+    départ normal s'il n'y en a pas). L'entraînement reprend exactement à l'épisode qui suivait
+    l'instantané; `episodes` reste le nombre total d'épisodes du run.
     """
-    # Taille de l'état: position (2) + 5 pathogènes (5*4=20) + santé (1) = 28
-    state_size = 28
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+    if profile_interval > 0:
+        profiler.enable()
+    if snapshot_interval is None:
+        snapshot_interval = save_interval
+
+    snapshot_dir = find_snapshot(resume) if resume else None
+    snapshot = read_snapshot(snapshot_dir) if snapshot_dir else None
+    trainer_state = snapshot["trainer"] if snapshot else {}
+    if snapshot:
+        print(f"Reprise de {snapshot_dir} à l'épisode {trainer_state['episode'] + 1}")
+        replay_path = replay_path or trainer_state["replay_path"]
+
     # Taille de l'action: 8 directions + immobile = 9
     action_size = 10
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    run_id = f"run_{timestamp}"
+    run_id = trainer_state.get("run_id", f"run_{timestamp}")
 
     # Créer l'environnement et l'agent
-    env = TrainingEnvironment()
-    agent = ImmuneCellAgent(state_size, action_size)
+    # Taille de l'état: position (2) + murs (4) + k pathogènes (k*4) + santé (1) + spécial (1) = 28 pour k=5
+    env = TrainingEnvironment(engine=engine, num_pathogens=num_pathogens, action_repeat=action_repeat)
+    state_size = env.state_size
+    memory = None
+    if replay_path:
+        memory = MemmapReplayStore.open(replay_path, state_size, writer=replay_writer,
+                                        segment_capacity=replay_capacity)
+        print(f"Mémoire d'expériences sur disque: {replay_path} ({len(memory)} transitions)")
+    agent = ImmuneCellAgent(state_size, action_size, prioritized=prioritized, memory=memory)
 
     # Charger un modèle existant si spécifié
-    if model_path and os.path.exists(model_path):
+    if snapshot:
+        restore_agent(snapshot_dir, snapshot, agent)
+    elif model_path and os.path.exists(model_path):
         print(f"Chargement du modèle: {model_path}")
         agent.load(model_path)
 
     # Paramètres d'entraînement
-    epsilon = 1.0  # Taux d'exploration initial (garder à 1.0)
+    epsilon = trainer_state.get("epsilon", 1.0)  # Taux d'exploration initial (garder à 1.0)
     epsilon_min = 0.5  # Augmenter le minimum (0.01 → 0.1)
     epsilon_decay = 0.9999  # Ralentir la décroissance (0.995 → 0.999)
 
-    # Suivi des performances
-    episode_rewards = []
-    episode_lengths = []
-    losses = []
-
-    # Boucle d'entraînement principale
-    for episode in tqdm(range(episodes), desc="Entraînement"):
+    # Suivi des performances: moyennes glissantes en mémoire constante, historique complet sur disque
+    episode_rewards = RollingStats(100)
+    losses = RollingStats(100)
+    if snapshot:
+        episode_rewards.load_state_dict(trainer_state["episode_rewards"])
+        losses.load_state_dict(trainer_state["losses"])
+    metrics = None
+    if save:
+        metrics = MetricsWriter(os.path.join(METRICS_DIR, run_id), resume_from=trainer_state.get("metrics"))
+    checkpoints = CheckpointManager(os.path.join("data", "neural_networks"), f"immune_cell_model_{run_id}",
+                                    keep_last=keep_last, keep_best=keep_best) if save else None
+    start_episode = episodes_done = trainer_state.get("episode", 0)
+    total_ticks = trainer_state.get("total_ticks", 0)
+    updates = trainer_state.get("updates", 0)
+    env_steps = trainer_state.get("env_steps", 0)
+
+    def take_snapshot(next_episode, completed=False):
+        save_snapshot(snapshot_dir_for(run_id), agent, {
+            "run_id": run_id, "episode": next_episode, "epsilon": epsilon, "env_steps": env_steps,
+            "updates": updates, "total_ticks": total_ticks, "elapsed": time.time() - start_time,
+            "episode_rewards": episode_rewards.state_dict(), "losses": losses.state_dict(),
+            "metrics": metrics.mark(), "replay_path": replay_path, "completed": completed,
+        })
+
+    # Boucle d'entraînement principale (générateurs aléatoires restaurés en dernier: la suite des
+    # tirages reprend exactement là où l'instantané l'a laissée)
+    start_time = time.time() - trainer_state.get("elapsed", 0.0)
+    if snapshot:
+        set_rng_state(snapshot["rng"])
+    for episode in tqdm(range(start_episode, episodes), initial=start_episode, total=episodes,
+                        desc="Entraînement"):
+        if max_env_steps is not None and env_steps >= max_env_steps:
+            break
         state = env.reset()
         total_reward = 0
-        episode_loss = []
+        episode_loss, episode_updates = 0.0, 0
 
-        import random  # Ajoutez cet import si nécessaire
         for i in range(10):  # Les 10 premières étapes sont aléatoires
             action = random.randint(0, action_size - 1)
             next_state, reward, done = env.step(action)
+            env_steps += 1
             total_reward += reward
             state = next_state
 
             # Si l'épisode se termine prématurément pendant ces actions aléatoires
-            if done:
+            if done or (max_env_steps is not None and env_steps >= max_env_steps):
                 break
 
         # Décroissance du taux d'exploration
@@ -67,6 +149,7 @@ def train_immune_cell(episodes=1000, batch_size=64, save_interval=10, model_path
 
             # Exécuter l'action
             next_state, reward, done = env.step(action)
+            env_steps += 1
 
             # Stocker l'expérience
             agent.store_experience(state, action, reward, next_state, done)
@@ -75,31 +158,53 @@ def train_immune_cell(episodes=1000, batch_size=64, save_interval=10, model_path
             if len(agent.memory) > batch_size:
                 loss = agent.train(batch_size)
                 if loss is not None:
-                    episode_loss.append(loss)
+                    episode_loss += loss
+                    episode_updates += 1
+                    updates += 1
+                    if metrics is not None:
+                        metrics.log("update", update=updates, episode=episode + 1, loss=loss)
 
             # Mise à jour pour la prochaine itération
             state = next_state
             total_reward += reward
 
-            if done:
+            if done or (max_env_steps is not None and env_steps >= max_env_steps):
                 break
 
         # Enregistrer les métriques
-        episode_rewards.append(total_reward)
-        episode_lengths.append(env.current_step)
-        if episode_loss:
-            losses.append(np.mean(episode_loss))
+        episode_rewards.record(total_reward)
+        total_ticks += env.current_step
+        mean_loss = episode_loss / episode_updates if episode_updates else None
+        if mean_loss is not None:
+            losses.record(mean_loss)
+        if metrics is not None:
+            metrics.log("episode", episode=episode + 1, reward=float(total_reward), length=env.current_step,
+                        loss=mean_loss, epsilon=epsilon, env_steps=env_steps, updates=updates,
+                        reward_mean=episode_rewards.mean)
 
         # Sauvegarder le modèle périodiquement
-        if (episode + 1) % save_interval == 0:
-            save_dir = os.path.join("data", "neural_networks")
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, f"immune_cell_model_{run_id}_ep{episode + 1}.pt")
-            agent.save(save_path)
-            print(f"\nModèle sauvegardé: {save_path}")
+        if save and (episode + 1) % save_interval == 0:
+            score = None
+            if eval_episodes:
+                score = evaluate_agent(agent, eval_episodes, env.max_steps, engine=engine,
+                                       num_pathogens=num_pathogens, action_repeat=action_repeat)
+                metrics.log("eval", episode=episode + 1, reward=score, episodes=eval_episodes)
+            save_path = checkpoints.save(agent, f"ep{episode + 1}", score=score)
+            agent.memory.flush()
+            print(f"\nSauvegarde du modèle: {save_path}")
 
             # Afficher les métriques actuelles
-            print(f"Épisode {episode + 1}/{episodes}, Récompense moyenne: {np.mean(episode_rewards[-100:]):.2f}")
+            print(f"Épisode {episode + 1}/{episodes}, Récompense moyenne: {episode_rewards.mean:.2f}, "
+                  f"Perte moyenne: {losses.mean:.4f}"
+                  + (f", Récompense en évaluation: {score:.2f}" if score is not None else ""))
+
+        episodes_done = episode + 1
+        if save and snapshot_interval and episodes_done % snapshot_interval == 0:
+            take_snapshot(episodes_done)
+
+        if profile_interval > 0 and (episode + 1) % profile_interval == 0:
+            print("\n" + profiler.report(f"Profil des épisodes {episode + 2 - profile_interval}-{episode + 1}"))
+            profiler.reset()
 
         # Dans la boucle d'entraînement, juste après done = False
         episode_actions = [0] * action_size  # Pour compter les actions choisies
@@ -109,37 +214,27 @@ def train_immune_cell(episodes=1000, batch_size=64, save_interval=10, model_path
 
 
 
-    # Sauvegarder le modèle final
-    final_path = os.path.join("data", "neural_networks", f"immune_cell_model_{run_id}_final.pt")
-    agent.save(final_path)
-    print(f"Modèle final sauvegardé: {final_path}")
+    # Survie comparable entre valeurs de action_repeat: ticks simulés par heure réelle
+    elapsed = time.time() - start_time
+    print(f"Ticks simulés: {total_ticks} en {elapsed:.0f}s "
+          f"({total_ticks / max(elapsed, 1e-9) * 3600:.0f}/h, action_repeat={action_repeat})")
 
-    # Tracer les graphiques de performance
-    plt.figure(figsize=(15, 5))
-
-    plt.subplot(1, 3, 1)
-    plt.plot(episode_rewards)
-    plt.title('Récompenses par épisode')
-    plt.xlabel('Épisode')
-    plt.ylabel('Récompense totale')
-
-    plt.subplot(1, 3, 2)
-    plt.plot(episode_lengths)
-    plt.title('Durée des épisodes')
-    plt.xlabel('Épisode')
-    plt.ylabel('Nombre de pas')
-
-    plt.subplot(1, 3, 3)
-    plt.plot(losses)
-    plt.title('Perte moyenne par épisode')
-    plt.xlabel('Épisode')
-    plt.ylabel('Perte')
-
-    # Sauvegarder le graphique
-    plt.tight_layout()
-    os.makedirs("data/stats", exist_ok=True)
-    plt.savefig(f"data/stats/training_performance_{run_id}.png")
-    plt.close()
+    if not save:
+        return agent, None
+    if snapshot_interval:
+        # Run terminé: ignoré par resume="latest", mais peut être prolongé (resume=<run_id>)
+        take_snapshot(episodes_done, completed=episodes_done >= episodes)
+    metrics.close()
+    print(f"Métriques: {metrics.prefix}.*.jsonl (graphiques: python train_all.py report --run {run_id})")
+
+    # Sauvegarder le modèle final (jamais supprimé par la rétention), après les écritures en cours
+    final_path = checkpoints.save(agent, "final", pinned=True)
+    agent.memory.flush()
+    checkpoints.close()
+    print(f"Modèle final sauvegardé: {final_path}")
+    best_path = checkpoints.best()
+    if best_path:
+        print(f"Meilleur checkpoint périodique: {best_path}")
 
     return agent, final_path
 
@@ -150,6 +245,27 @@ if __name__ == "__main__":
     parser.add_argument("--batch-size", type=int, default=64, help="Taille du batch pour l'entraînement")
     parser.add_argument("--save-interval", type=int, default=10, help="Intervalle de sauvegarde du modèle")
     parser.add_argument("--model", type=str, default=None, help="Chemin vers un modèle existant à poursuivre")
+    parser.add_argument("--engine", type=str, default="object", choices=["object", "vectorized"],
+                        help="Moteur de simulation du tissu")
+    parser.add_argument("--num-pathogens", type=int, default=5, help="Nombre de pathogènes proches observés")
+    parser.add_argument("--prioritized", action="store_true", help="Mémoire d'expériences à priorités")
+    parser.add_argument("--replay-dir", type=str, default=None,
+                        help="Dossier d'une mémoire d'expériences sur disque (ex: data/replay/run1)")
+    parser.add_argument("--replay-capacity", type=int, default=1_000_000,
+                        help="Capacité de la mémoire sur disque (par processus)")
+    parser.add_argument("--action-repeat", type=int, default=1,
+                        help="Nombre de ticks du tissu pendant lesquels chaque action est répétée")
+    parser.add_argument("--profile", type=int, default=0, metavar="N",
+                        help="Afficher le temps par phase tous les N épisodes (0: désactivé)")
+    parser.add_argument("--keep-last", type=int, default=3, help="Checkpoints périodiques récents conservés")
+    parser.add_argument("--keep-best", type=int, default=2,
+                        help="Checkpoints périodiques de meilleure récompense en évaluation gloutonne conservés")
+    parser.add_argument("--eval-episodes", type=int, default=3,
+                        help="Épisodes d'évaluation gloutonne à chaque sauvegarde (score des checkpoints, 0: aucun)")
+    parser.add_argument("--resume", type=str, default=None,
+                        help="Reprendre un run: dossier d'instantané, identifiant de run ou 'latest'")
+    parser.add_argument("--snapshot-interval", type=int, default=None,
+                        help="Épisodes entre deux instantanés de reprise (par défaut: intervalle de sauvegarde)")
 
     args = parser.parse_args()
 
@@ -162,7 +278,19 @@ if __name__ == "__main__":
         episodes=args.episodes,
         batch_size=args.batch_size,
         save_interval=args.save_interval,
-        model_path=args.model
+        model_path=args.model,
+        engine=args.engine,
+        num_pathogens=args.num_pathogens,
+        prioritized=args.prioritized,
+        replay_path=args.replay_dir,
+        replay_capacity=args.replay_capacity,
+        action_repeat=args.action_repeat,
+        profile_interval=args.profile,
+        keep_last=args.keep_last,
+        keep_best=args.keep_best,
+        resume=args.resume,
+        snapshot_interval=args.snapshot_interval,
+        eval_episodes=args.eval_episodes,
     )
 
     print(f"Entraînement terminé! Modèle sauvegardé: {model_path}")
\ No newline at end of file
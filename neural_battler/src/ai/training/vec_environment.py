@@ -0,0 +1,381 @@
+# neural_battler/src/ai/training/vec_environment.py
+import numpy as np
+
+from ...game.world.tissue import Tissue
+from ...game.entities.immune_cell import ImmuneCell
+from ...game.entities.pathogen import Pathogen
+from ..models.actions import NUM_ACTIONS, action_to_movement
+from ..models.observation import ObservationEncoder
+
+
+class VecTrainingEnvironment:
+    """
+    N épisodes indépendants de TrainingEnvironment simulés en lockstep.
+
+    Tout l'état vit dans des tableaux (N, ...) : lymphocytes (N,), pathogènes (N, P)
+    et projectiles (N, Q) avec masques de slots occupés. Un step avance les N tissus
+    sans boucle Python par environnement et réinitialise automatiquement les épisodes
+    terminés. Les slots libérés sont réutilisés: l'ordre des pathogènes (utilisé pour
+    départager les collisions simultanées d'un projectile) n'est donc pas l'ordre d'apparition.
+    """
+
+    def __init__(self, num_envs=8, width=800, height=600, max_steps=3000, seed=None, num_pathogens=5,
+                 action_repeat=1):
+        if action_repeat < 1:
+            raise ValueError(f"action_repeat doit être >= 1, pas {action_repeat}")
+        self.num_envs = num_envs
+        self.action_repeat = action_repeat  # Ticks par action (voir TrainingEnvironment)
+        self.width = width
+        self.height = height
+        self.max_steps = max_steps
+        self.default_speed = 1.0
+        self.center_x = width / 2
+        self.center_y = height / 2
+        self.rng = np.random.default_rng(seed)
+
+        # Deux buffers: les états rendus par reset/step restent valides jusqu'au step suivant
+        self.encoder = ObservationEncoder(num_pathogens, num_buffers=2)
+        self.state_size = self.encoder.state_size
+
+        self.movements = np.array([action_to_movement(a, self.default_speed)
+                                   for a in range(NUM_ACTIONS)], dtype=np.float64)
+
+        # Paramètres du jeu lus sur des entités prototypes (source unique de vérité)
+        cell = ImmuneCell(0, 0)
+        pathogen = Pathogen(0, 0)
+        tissue = Tissue(width, height)
+        self.cell_max_health = cell.max_health
+        self.cell_radius = cell.radius
+        self.cell_attack_range = cell.attack_range
+        self.cell_attack_damage = cell.attack_damage
+        self.cell_attack_cooldown_max = cell.attack_cooldown_max
+        self.projectile_speed = 3
+        self.projectile_radius = 5
+        self.pathogen_max_health = pathogen.max_health
+        self.pathogen_attack_damage = pathogen.attack_damage
+        self.pathogen_attack_range = pathogen.attack_range
+        self.pathogen_attack_cooldown_max = pathogen.attack_cooldown_max
+        self.pathogen_speed = pathogen.speed
+        self.pathogen_radius = pathogen.radius
+        self.initial_spawn_time = tissue.initial_spawn_time
+        self.min_spawn_time = tissue.min_spawn_time
+        self.difficulty_factor = tissue.difficulty_factor
+        self.max_pathogens = 20  # Tissue.can_add_pathogen
+
+        n = num_envs
+        self.cell_pos = np.zeros((n, 2))
+        self.cell_health = np.zeros(n)
+        self.cell_cooldown = np.zeros(n, dtype=np.int64)
+        self.current_step = np.zeros(n, dtype=np.int64)
+        self.prev_dist_to_closest = np.full(n, np.nan)
+        self.spawn_timer = np.zeros(n, dtype=np.int64)
+        self.spawn_cooldown = np.zeros(n, dtype=np.int64)
+        # Longueur des épisodes terminés au dernier step (0 pour les autres)
+        self.last_episode_steps = np.zeros(n, dtype=np.int64)
+
+        self._allocate_pathogens(32)
+        self._allocate_projectiles(16)
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Allocation des slots
+    # ------------------------------------------------------------------
+    def _allocate_pathogens(self, capacity):
+        n = self.num_envs
+        old = getattr(self, "p_alive", None)
+        pos = np.zeros((n, capacity, 2))
+        health = np.zeros((n, capacity))
+        cooldown = np.zeros((n, capacity), dtype=np.int64)
+        alive = np.zeros((n, capacity), dtype=bool)
+        if old is not None:
+            size = old.shape[1]
+            pos[:, :size] = self.p_pos
+            health[:, :size] = self.p_health
+            cooldown[:, :size] = self.p_cooldown
+            alive[:, :size] = self.p_alive
+        self.p_pos, self.p_health, self.p_cooldown, self.p_alive = pos, health, cooldown, alive
+
+    def _allocate_projectiles(self, capacity):
+        n = self.num_envs
+        old = getattr(self, "q_alive", None)
+        pos = np.zeros((n, capacity, 2))
+        vel = np.zeros((n, capacity, 2))
+        alive = np.zeros((n, capacity), dtype=bool)
+        if old is not None:
+            size = old.shape[1]
+            pos[:, :size] = self.q_pos
+            vel[:, :size] = self.q_vel
+            alive[:, :size] = self.q_alive
+        self.q_pos, self.q_vel, self.q_alive = pos, vel, alive
+
+    def _add_pathogens(self, env_idx, xs, ys):
+        """Ajoute un pathogène dans le premier slot libre de chaque environnement de env_idx"""
+        if len(env_idx) == 0:
+            return
+        if self.p_alive[env_idx].all(axis=1).any():
+            self._allocate_pathogens(self.p_alive.shape[1] * 2)
+        slots = np.argmax(~self.p_alive[env_idx], axis=1)
+        self.p_pos[env_idx, slots, 0] = xs
+        self.p_pos[env_idx, slots, 1] = ys
+        self.p_health[env_idx, slots] = self.pathogen_max_health
+        self.p_cooldown[env_idx, slots] = 0
+        self.p_alive[env_idx, slots] = True
+
+    def _add_projectiles(self, env_idx, positions, velocities):
+        if self.q_alive[env_idx].all(axis=1).any():
+            self._allocate_projectiles(self.q_alive.shape[1] * 2)
+        slots = np.argmax(~self.q_alive[env_idx], axis=1)
+        self.q_pos[env_idx, slots] = positions
+        self.q_vel[env_idx, slots] = velocities
+        self.q_alive[env_idx, slots] = True
+
+    # ------------------------------------------------------------------
+    # API de l'environnement
+    # ------------------------------------------------------------------
+    def reset(self):
+        """Réinitialise les N environnements"""
+        self._reset_envs(np.arange(self.num_envs))
+        return self._get_states()
+
+    def _reset_envs(self, env_idx):
+        if len(env_idx) == 0:
+            return
+        self.cell_pos[env_idx] = (self.center_x, self.center_y)
+        self.cell_health[env_idx] = self.cell_max_health
+        self.cell_cooldown[env_idx] = 0
+        self.current_step[env_idx] = 0
+        self.prev_dist_to_closest[env_idx] = np.nan
+        self.spawn_timer[env_idx] = self.initial_spawn_time
+        self.spawn_cooldown[env_idx] = self.initial_spawn_time
+        self.p_alive[env_idx] = False
+        self.q_alive[env_idx] = False
+
+        # Ajouter quelques pathogènes aléatoirement
+        for _ in range(5):
+            self._spawn_random_pathogens(env_idx)
+
+    def step(self, actions):
+        """
+        Effectue une action par environnement, répétée pendant `action_repeat` ticks.
+        Retourne (états (N, 28), récompenses cumulées (N,), terminés (N,)); les épisodes
+        terminés sont réinitialisés et leur état initial est renvoyé.
+        Un épisode qui se termine avant le dernier tick cesse d'accumuler des récompenses;
+        son tissu continue d'être simulé jusqu'à la fin du step, puis est réinitialisé.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        move = self.movements[actions]
+
+        rewards = np.zeros(self.num_envs)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        self.last_episode_steps = np.zeros(self.num_envs, dtype=np.int64)
+        for _ in range(self.action_repeat):
+            tick_rewards, tick_dones = self._step_once(move)
+            active = ~dones
+            rewards += np.where(active, tick_rewards, 0.0)
+            ended = active & tick_dones
+            self.last_episode_steps[ended] = self.current_step[ended]
+            dones |= tick_dones
+            if dones.all():
+                break
+
+        # Réinitialisation automatique des épisodes terminés
+        self._reset_envs(np.flatnonzero(dones))
+
+        return self._get_states(), rewards, dones
+
+    def _step_once(self, move):
+        """Un tick des N tissus avec le mouvement (N, 2); retourne (récompenses, terminés)"""
+        prev_health = self.cell_health.copy()
+        prev_num_pathogens = self.p_alive.sum(axis=1)
+
+        # Appliquer le mouvement si la position reste dans le tissu
+        new_pos = self.cell_pos + move
+        valid = ((new_pos[:, 0] >= 0) & (new_pos[:, 0] < self.width) &
+                 (new_pos[:, 1] >= 0) & (new_pos[:, 1] < self.height))
+        self.cell_pos[valid] = new_pos[valid]
+
+        # Mettre à jour les tissus
+        self._tick()
+        self.current_step += 1
+
+        # Spawn de pathogènes près des murs avec probabilité réduite
+        wall_spawn = self._is_near_wall() & (self.rng.random(self.num_envs) < 0.05)
+        self._spawn_pathogens_near_wall(np.flatnonzero(wall_spawn))
+
+        rewards = self._calculate_rewards(prev_health, prev_num_pathogens, move)
+
+        dones = (self.cell_health <= 0) | (self.current_step >= self.max_steps)
+
+        # Respawn des pathogènes si tous sont éliminés
+        self._spawn_random_pathogens(np.flatnonzero(~self.p_alive.any(axis=1)))
+
+        return rewards, dones
+
+    # ------------------------------------------------------------------
+    # Simulation (équivalent de Tissue.update pour les N tissus)
+    # ------------------------------------------------------------------
+    def _tick(self):
+        self._update_immune_cells()
+        self._update_projectiles()
+        self._update_pathogens()
+        self._update_tissue_spawns()
+
+    def _update_immune_cells(self):
+        """Cooldown et tir du lymphocyte sur le pathogène le plus proche à portée"""
+        delta = self.p_pos - self.cell_pos[:, None, :]
+        distance = np.where(self.p_alive, np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2), np.inf)
+
+        cooldown = self.cell_cooldown
+        cooldown[cooldown > 0] -= 1
+
+        shoot = (distance <= self.cell_attack_range).any(axis=1) & (cooldown == 0)
+        shooters = np.flatnonzero(shoot)
+        if len(shooters) == 0:
+            return
+
+        closest = np.argmin(distance[shooters], axis=1)
+        direction = delta[shooters, closest]
+        norm = distance[shooters, closest][:, None]
+        velocity = np.where(norm > 0, direction / np.where(norm > 0, norm, 1) * self.projectile_speed, direction)
+        self._add_projectiles(shooters, self.cell_pos[shooters], velocity)
+        cooldown[shooters] = self.cell_attack_cooldown_max
+
+    def _update_projectiles(self):
+        """Déplacement, sortie du tissu et collisions projectiles × pathogènes"""
+        alive = self.q_alive
+        self.q_pos[alive] += self.q_vel[alive]
+
+        x, y = self.q_pos[..., 0], self.q_pos[..., 1]
+        alive &= (x >= 0) & (x <= self.width) & (y >= 0) & (y <= self.height)
+        if not alive.any():
+            return
+
+        # Chaque projectile touche le pathogène en contact le plus proche (à égalité: plus petit slot,
+        # stable pendant la vie du pathogène), comme ProjectilePool.update
+        delta = self.p_pos[:, None, :, :] - self.q_pos[:, :, None, :]
+        distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+        hit = (distance < self.pathogen_radius + self.projectile_radius) & alive[:, :, None] & self.p_alive[:, None, :]
+        env_idx, proj_idx = np.nonzero(hit.any(axis=2))
+        if len(env_idx) == 0:
+            return
+        target_idx = np.argmin(np.where(hit[env_idx, proj_idx], distance[env_idx, proj_idx], np.inf), axis=1)
+
+        damage = np.zeros_like(self.p_health)
+        np.add.at(damage, (env_idx, target_idx), self.cell_attack_damage)
+        np.maximum(self.p_health - damage, 0, out=self.p_health)
+        alive[env_idx, proj_idx] = False
+
+    def _update_pathogens(self):
+        """Poursuite et attaque du lymphocyte par tous les pathogènes"""
+        delta = self.cell_pos[:, None, :] - self.p_pos
+        distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+
+        reach = self.pathogen_attack_range + self.pathogen_radius + self.cell_radius
+        attacking = self.p_alive & (distance <= reach) & (self.p_cooldown == 0)
+        damage = attacking.sum(axis=1) * self.pathogen_attack_damage
+        np.maximum(self.cell_health - damage, 0, out=self.cell_health)
+        self.p_cooldown[attacking] = self.pathogen_attack_cooldown_max
+
+        moving = self.p_alive & ~attacking & (distance > 0)
+        step = delta[moving] / distance[moving][:, None] * self.pathogen_speed
+        self.p_pos[moving] += step
+
+        self.p_cooldown[self.p_cooldown > 0] -= 1
+        self.p_alive &= self.p_health > 0
+
+    def _update_tissue_spawns(self):
+        """Apparition périodique des pathogènes gérée par le Tissue"""
+        self.spawn_cooldown -= 1
+        spawn = (self.spawn_cooldown <= 0) & (self.p_alive.sum(axis=1) < self.max_pathogens)
+        env_idx = np.flatnonzero(spawn)
+        if len(env_idx) == 0:
+            return
+        xs = self.rng.integers(50, self.width - 50, size=len(env_idx), endpoint=True)
+        ys = self.rng.integers(50, self.height - 50, size=len(env_idx), endpoint=True)
+        self._add_pathogens(env_idx, xs, ys)
+
+        timer = np.maximum(self.min_spawn_time, (self.spawn_timer[env_idx] * self.difficulty_factor).astype(np.int64))
+        self.spawn_timer[env_idx] = timer
+        self.spawn_cooldown[env_idx] = timer
+
+    # ------------------------------------------------------------------
+    # Règles de l'environnement
+    # ------------------------------------------------------------------
+    def _is_near_wall(self, margin=60):
+        x, y = self.cell_pos[:, 0], self.cell_pos[:, 1]
+        return (x < margin) | (x > self.width - margin) | (y < margin) | (y > self.height - margin)
+
+    def _spawn_random_pathogens(self, env_idx):
+        """Génère un pathogène à une position aléatoire loin des murs"""
+        margin = 100
+        xs = self.rng.uniform(margin, self.width - margin, size=len(env_idx))
+        ys = self.rng.uniform(margin, self.height - margin, size=len(env_idx))
+        self._add_pathogens(env_idx, xs, ys)
+
+    def _spawn_pathogens_near_wall(self, env_idx):
+        """Génère un pathogène près du mur le plus proche du lymphocyte"""
+        if len(env_idx) == 0:
+            return
+        x, y = self.cell_pos[env_idx, 0], self.cell_pos[env_idx, 1]
+        # Ordre gauche, droite, haut, bas (premier minimum comme min() de l'environnement)
+        wall = np.argmin(np.stack([x, self.width - x, y, self.height - y], axis=1), axis=1)
+
+        count = len(env_idx)
+        variation = self.rng.integers(-30, 30, size=count, endpoint=True)
+        near_edge = self.rng.integers(0, 20, size=count, endpoint=True)
+        horizontal = wall < 2
+
+        xs = np.where(horizontal, np.where(wall == 0, near_edge, self.width - near_edge), x + variation)
+        ys = np.where(horizontal, y + variation, np.where(wall == 2, near_edge, self.height - near_edge))
+        self._add_pathogens(env_idx, xs, ys)
+
+    def _calculate_rewards(self, prev_health, prev_num_pathogens, move):
+        """Version vectorisée de TrainingEnvironment._calculate_reward"""
+        rewards = np.zeros(self.num_envs)
+        dx, dy = move[:, 0], move[:, 1]
+        x, y = self.cell_pos[:, 0], self.cell_pos[:, 1]
+
+        # 1. Perte de vie et élimination de pathogènes
+        rewards -= 0.5 * (self.cell_health < prev_health)
+        pathogen_change = prev_num_pathogens - self.p_alive.sum(axis=1)
+        rewards += np.maximum(pathogen_change, 0)
+
+        # 2. Mouvement et murs
+        moving = (np.abs(dx) > 0.1) | (np.abs(dy) > 0.1)
+        wall_margin = 50
+        left, right = x < wall_margin, x > self.width - wall_margin
+        top, bottom = y < wall_margin, y > self.height - wall_margin
+        near_wall = left | right | top | bottom
+        moving_to_wall = (left & (dx < 0)) | (right & (dx > 0)) | (top & (dy < 0)) | (bottom & (dy > 0))
+        rewards += np.where(moving, 0.05, -0.05)
+        rewards += np.where(moving & near_wall, np.where(moving_to_wall, -0.1, 0.1), 0.0)
+
+        # 3. Proximité du pathogène le plus proche
+        delta = self.p_pos - self.cell_pos[:, None, :]
+        distance = np.where(self.p_alive, np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2), np.inf)
+        closest = distance.min(axis=1)
+        has_pathogens = self.p_alive.any(axis=1)
+
+        with np.errstate(invalid="ignore"):
+            dodged = has_pathogens & (closest < 30) & (closest > self.prev_dist_to_closest)
+        rewards += 0.2 * dodged
+        rewards += 0.1 * (has_pathogens & (np.abs(closest - 100) < 20))
+        self.prev_dist_to_closest = np.where(has_pathogens, closest, self.prev_dist_to_closest)
+
+        # 4. La capacité spéciale n'est jamais déclenchée par l'environnement: pas de bonus
+
+        return rewards
+
+    def _get_states(self):
+        """États (N, state_size) au même format que ImmuneCellAgent.get_state"""
+        states = self.encoder.encode_batch(
+            self.cell_pos,
+            self.cell_health / self.cell_max_health,
+            1.0,  # Capacité spéciale toujours prête (jamais utilisée)
+            self.p_pos,
+            self.p_health / self.pathogen_max_health,
+            self.p_alive,
+            self.width,
+            self.height,
+        )
+        return self.encoder.as_tensor(states)
@@ -0,0 +1,128 @@
+# neural_battler/src/ai/training/vec_train.py
+import os
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+import torch
+from tqdm import tqdm
+
+from ..models import CheckpointManager, ImmuneCellAgent
+from .evaluate import evaluate_agent
+from .report import METRICS_DIR
+from .vec_environment import VecTrainingEnvironment
+from ...utils.metrics import MetricsWriter, RollingStats
+
+
+def train_vectorized(episodes=1000, num_envs=8, batch_size=64, save_interval=10, model_path=None,
+                     num_pathogens=5, prioritized=False, action_repeat=1, max_env_steps=None, save=True,
+                     seed=None, keep_last=3, keep_best=2, eval_episodes=3):
+    """
+    Variante de train_immune_cell sur VecTrainingEnvironment: N épisodes en lockstep,
+    une décision pour les N lymphocytes par forward (agent.select_actions), N transitions
+    écrites d'un coup en mémoire et une mise à jour de gradient par step vectorisé.
+
+    episodes: épisodes terminés (tous environnements confondus) avant l'arrêt
+    max_env_steps: arrêt après ce nombre de transitions (N par step vectorisé)
+    Epsilon décroît à chaque épisode terminé, comme dans train_immune_cell; pas de phase
+    d'actions aléatoires en début d'épisode ni d'instantané de reprise.
+    Les autres paramètres ont le sens de ceux de train_immune_cell.
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+
+    action_size = 10
+    run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    env = VecTrainingEnvironment(num_envs, num_pathogens=num_pathogens, action_repeat=action_repeat, seed=seed)
+    agent = ImmuneCellAgent(env.state_size, action_size, prioritized=prioritized)
+    if model_path and os.path.exists(model_path):
+        print(f"Chargement du modèle: {model_path}")
+        agent.load(model_path)
+
+    epsilon = 1.0
+    epsilon_min = 0.5
+    epsilon_decay = 0.9999
+
+    episode_rewards = RollingStats(100)
+    losses = RollingStats(100)
+    metrics = MetricsWriter(os.path.join(METRICS_DIR, run_id)) if save else None
+    checkpoints = CheckpointManager(os.path.join("data", "neural_networks"), f"immune_cell_model_{run_id}",
+                                    keep_last=keep_last, keep_best=keep_best) if save else None
+    env_steps = updates = total_ticks = episodes_done = 0
+    # Récompense et perte accumulées par environnement depuis le début de son épisode
+    running_rewards = np.zeros(num_envs)
+    running_loss = np.zeros(num_envs)
+    running_updates = np.zeros(num_envs, dtype=np.int64)
+
+    start_time = time.time()
+    states = env.reset()
+    progress = tqdm(total=episodes, desc="Entraînement")
+    while episodes_done < episodes and (max_env_steps is None or env_steps < max_env_steps):
+        actions = agent.select_actions(states, epsilon)
+        next_states, rewards, dones = env.step(actions)
+        env_steps += num_envs
+
+        # Les états de fin d'épisode ne sont pas rendus (remplacés par l'état initial du
+        # suivant): sans effet sur la cible, annulée par done
+        agent.memory.add_batch(states, actions, rewards, next_states, dones)
+        states = next_states
+        running_rewards += rewards
+
+        if len(agent.memory) > batch_size:
+            loss = agent.train(batch_size)
+            if loss is not None:
+                updates += 1
+                running_loss += loss
+                running_updates += 1
+                if metrics is not None:
+                    metrics.log("update", update=updates, episode=episodes_done + 1, loss=loss)
+
+        for env_index in np.flatnonzero(dones):
+            episodes_done += 1
+            epsilon = max(epsilon_min, epsilon * epsilon_decay)
+            total_reward = float(running_rewards[env_index])
+            length = int(env.last_episode_steps[env_index])
+            mean_loss = (float(running_loss[env_index] / running_updates[env_index])
+                         if running_updates[env_index] else None)
+            running_rewards[env_index] = running_loss[env_index] = running_updates[env_index] = 0
+            episode_rewards.record(total_reward)
+            if mean_loss is not None:
+                losses.record(mean_loss)
+            total_ticks += length
+            progress.update(1)
+            if metrics is not None:
+                metrics.log("episode", episode=episodes_done, reward=total_reward, length=length,
+                            loss=mean_loss, epsilon=epsilon, env_steps=env_steps, updates=updates,
+                            reward_mean=episode_rewards.mean)
+
+            if save and episodes_done % save_interval == 0:
+                score = None
+                if eval_episodes:
+                    score = evaluate_agent(agent, eval_episodes, env.max_steps, num_pathogens=num_pathogens,
+                                           action_repeat=action_repeat)
+                    metrics.log("eval", episode=episodes_done, reward=score, episodes=eval_episodes)
+                save_path = checkpoints.save(agent, f"ep{episodes_done}", score=score)
+                print(f"\nSauvegarde du modèle: {save_path}")
+                print(f"Épisode {episodes_done}/{episodes}, Récompense moyenne: {episode_rewards.mean:.2f}, "
+                      f"Perte moyenne: {losses.mean:.4f}"
+                      + (f", Récompense en évaluation: {score:.2f}" if score is not None else ""))
+            if episodes_done >= episodes:
+                break
+    progress.close()
+
+    elapsed = time.time() - start_time
+    print(f"Ticks simulés (épisodes terminés): {total_ticks} en {elapsed:.0f}s, "
+          f"{env_steps / max(elapsed, 1e-9):.0f} transitions/s ({num_envs} environnements)")
+
+    if not save:
+        return agent, None
+    metrics.close()
+    print(f"Métriques: {metrics.prefix}.*.jsonl (graphiques: python train_all.py report --run {run_id})")
+    final_path = checkpoints.save(agent, "final", pinned=True)
+    checkpoints.close()
+    print(f"Modèle final sauvegardé: {final_path}")
+    return agent, final_path
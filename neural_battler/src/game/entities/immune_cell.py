@@ -1,13 +1,10 @@
 # src/game/entities/immune_cell.py
-import pygame
 import math
-import random
-# Import relatif (remonte de deux niveaux, puis descend dans ai)
-from ...ai.inference.immune_cell_controller import ImmuneCellController
+from ..systems.projectiles import ProjectilePool
 
 
 class ImmuneCell:
-    def __init__(self, x, y, cell_type="t_cell", ai_model_path=None):
+    def __init__(self, x, y, cell_type="t_cell", ai_model_path=None, projectiles=None):
         self.x = x
         self.y = y
         self.cell_type = cell_type
@@ -19,7 +16,10 @@ class ImmuneCell:
         self.attack_cooldown_max = 45  # Frames entre chaque tir
         self.radius = 15  # Rayon du cercle représentant la cellule
         self.color = (0, 0, 255)  # Bleu pour les cellules immunitaires
-        self.projectiles = []  # Liste pour stocker les projectiles
+        self.entity_id = None  # Handle stable attribué par le Tissue
+        self.spawn_order = 0  # Rang d'ajout dans le Tissue (la plus ancienne est ciblée par les pathogènes)
+        # Pool partagé injecté par le Tissue; pool propre seulement pour une cellule hors tissu
+        self.projectiles = projectiles if projectiles is not None else ProjectilePool()
 
         # Système de capacité spéciale avec cooldown
         self.special_cooldown = 0
@@ -29,7 +29,8 @@ class ImmuneCell:
         # Attributs liés à l'IA
         self.controller = None
         self.ai_controlled = False
-        self.target = None
+        self.ai_decision = None  # Décision du tick calculée en lot par le Tissue
+        self.target = None  # Handle stable (entity_id) du pathogène ciblé
         self.speed = 1.0
 
         # Charger le contrôleur IA si un modèle est spécifié
@@ -43,8 +44,12 @@ class ImmuneCell:
         Sinon, utilise le comportement par défaut
         """
         if self.ai_controlled and self.controller:
-            # Laisser le contrôleur IA gérer le mouvement et les actions
-            actions = self.controller.update(self, game_state.pathogens, game_state)
+            # Décision déjà prise (et mouvement appliqué) par le Tissue pour tout le groupe,
+            # sinon le contrôleur IA gère seul le mouvement et les actions
+            actions = self.ai_decision
+            self.ai_decision = None
+            if actions is None:
+                actions = self.controller.update(self, game_state.pathogens, game_state)
 
             # Si l'IA a choisi d'utiliser la capacité spéciale
             if self.special_ready and actions.get('use_special', False):
@@ -52,38 +57,31 @@ class ImmuneCell:
                 self.special_ready = False
                 self.special_cooldown = self.special_cooldown_max
 
-            # Récupération des pathogens proches
-            pathogens = game_state.get_nearby_pathogens(self.x, self.y, self.attack_range)
+            # Pathogène le plus proche à portée
+            closest_pathogen = self.closest_pathogen_in_range(game_state)
 
             # Gestion du cooldown d'attaque
             if self.attack_cooldown > 0:
                 self.attack_cooldown -= 1
 
-            # Recherche d'une cible si on n'en a pas
-            if not hasattr(self, 'target') or not self.target or self.target not in pathogens:
-                if pathogens:
-                    self.target = self.find_closest_target(pathogens)
-                else:
-                    self.target = None
+            # Recherche d'une cible si on n'en a pas (ou si elle est morte ou hors de portée)
+            target = game_state.get_pathogen(self.target)
+            if target is None or (target.x - self.x) ** 2 + (target.y - self.y) ** 2 > self.attack_range ** 2:
+                self.target = closest_pathogen.entity_id if closest_pathogen else None
 
             # Tir si des pathogènes sont à portée et cooldown terminé
-            if pathogens and self.attack_cooldown == 0:
-                closest_pathogen = self.find_closest_target(pathogens)
-                if closest_pathogen:
-                    self.shoot_at(closest_pathogen)
-                    self.attack_cooldown = self.attack_cooldown_max
+            if closest_pathogen and self.attack_cooldown == 0:
+                self.shoot_at(closest_pathogen)
+                self.attack_cooldown = self.attack_cooldown_max
         else:
             # Comportement par défaut pour le mode manuel
-            # Récupération des pathogens à portée
-            pathogens = game_state.get_nearby_pathogens(self.x, self.y, self.attack_range)
-
             # Gestion du cooldown d'attaque
             if self.attack_cooldown > 0:
                 self.attack_cooldown -= 1
 
             # Tir si des pathogènes sont à portée et cooldown terminé
-            if pathogens and self.attack_cooldown == 0:
-                closest_pathogen = self.find_closest_target(pathogens)
+            if self.attack_cooldown == 0:
+                closest_pathogen = self.closest_pathogen_in_range(game_state)
                 if closest_pathogen:
                     self.shoot_at(closest_pathogen)
                     self.attack_cooldown = self.attack_cooldown_max
@@ -103,6 +101,8 @@ class ImmuneCell:
         Change ou active le modèle d'IA pour cette cellule
         """
         try:
+            # Import à la demande: une partie sans modèle ne charge pas la pile d'inférence
+            from ...ai.inference.immune_cell_controller import ImmuneCellController
             self.controller = ImmuneCellController(model_path)
             self.ai_controlled = True
             self.color = (100, 100, 255)  # Bleu clair pour indiquer cellule IA
@@ -126,13 +126,9 @@ class ImmuneCell:
         damage = 30
 
         # Trouver tous les pathogènes à portée de l'attaque spéciale
-        for pathogen in game_state.pathogens:
-            dx = pathogen.x - self.x
-            dy = pathogen.y - self.y
-            distance = math.sqrt(dx ** 2 + dy ** 2)
-
-            if distance <= radius:
-                pathogen.take_damage(damage)
+        geometry = game_state.geometry.for_cell(self)
+        for i in geometry.within(radius):
+            game_state.pathogens[i].take_damage(damage)
 
         # Ajouter un effet visuel (si supporté par game_state)
         if hasattr(game_state, 'add_effect'):
@@ -149,64 +145,20 @@ class ImmuneCell:
             dx = dx / distance * 3  # Vitesse du projectile
             dy = dy / distance * 3
 
-        projectile = {
-            'x': self.x,
-            'y': self.y,
-            'dx': dx,
-            'dy': dy,
-            'damage': self.attack_damage,
-            'radius': 5,
-            'color': (0, 255, 255)  # Cyan pour les projectiles
-        }
-
-        self.projectiles.append(projectile)
+        owner = -1 if self.entity_id is None else self.entity_id
+        self.projectiles.spawn(self.x, self.y, dx, dy, self.attack_damage, 5, owner)
 
     def update_projectiles(self, game_state):
-        # Mettre à jour la position de chaque projectile et vérifier les collisions
-        projectiles_to_remove = []
-
-        for i, projectile in enumerate(self.projectiles):
-            # Mettre à jour la position
-            projectile['x'] += projectile['dx']
-            projectile['y'] += projectile['dy']
-
-            # Vérifier si le projectile est hors limites
-            if (projectile['x'] < 0 or projectile['x'] > game_state.width or
-                    projectile['y'] < 0 or projectile['y'] > game_state.height):
-                projectiles_to_remove.append(i)
-                continue
-
-            # Vérifier les collisions avec les pathogènes
-            for pathogen in game_state.pathogens:
-                dx = pathogen.x - projectile['x']
-                dy = pathogen.y - projectile['y']
-                distance = math.sqrt(dx ** 2 + dy ** 2)
-
-                if distance < pathogen.radius + projectile['radius']:
-                    # Collision détectée
-                    pathogen.take_damage(projectile['damage'])
-                    projectiles_to_remove.append(i)
-                    break
-
-        # Supprimer les projectiles qui ont frappé une cible ou sont hors limites
-        for i in sorted(projectiles_to_remove, reverse=True):
-            if i < len(self.projectiles):
-                self.projectiles.pop(i)
-
-    def find_closest_target(self, targets):
-        closest = None
-        min_distance = float('inf')
-
-        for target in targets:
-            dx = target.x - self.x
-            dy = target.y - self.y
-            distance = math.sqrt(dx ** 2 + dy ** 2)
-
-            if distance < min_distance:
-                min_distance = distance
-                closest = target
-
-        return closest
+        # Le pool partagé avec le tissu est avancé une seule fois par tick par le Tissue
+        if not self.projectiles.shared:
+            game_state.update_projectiles(self.projectiles)
+
+    def closest_pathogen_in_range(self, game_state):
+        """Pathogène le plus proche à portée de tir, lu dans le cache géométrique du tissu"""
+        geometry = game_state.geometry.for_cell(self)
+        if geometry.closest_distance > self.attack_range:
+            return None
+        return game_state.pathogens[geometry.closest_index]
 
     def take_damage(self, damage):
         self.health -= damage
@@ -217,6 +169,8 @@ class ImmuneCell:
         return self.health <= 0
 
     def draw(self, screen, offset_x=0, offset_y=0):
+        import pygame
+
         # Dessine la cellule immunitaire
         pygame.draw.circle(screen, self.color,
                            (int(self.x + offset_x), int(self.y + offset_y)),
@@ -246,10 +200,8 @@ class ImmuneCell:
                          (health_x, health_y - 7, special_width, health_height))
 
         # Dessine les projectiles
-        for projectile in self.projectiles:
-            pygame.draw.circle(screen, projectile['color'],
-                               (int(projectile['x'] + offset_x), int(projectile['y'] + offset_y)),
-                               projectile['radius'])
+        if not self.projectiles.shared:
+            self.projectiles.draw(screen, offset_x, offset_y)
 
         if hasattr(self, 'special_ready'):
             special_color = (0, 255, 0) if self.special_ready else (100, 100, 100)
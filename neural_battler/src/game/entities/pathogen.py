@@ -1,5 +1,4 @@
 # src/game/entities/pathogen.py
-import pygame
 import math
 import random
 
@@ -18,12 +17,19 @@ class Pathogen:
         self.speed = 0.7
         self.radius = 10
         self.color = (255, 0, 0)  # Rouge pour les pathogènes
-
-    def update(self, game_state):
+        self.entity_id = None  # Handle stable attribué par le Tissue
+
+    def update(self, game_state, target=None):
+        """
+        target: cellule ciblée, que le Tissue résout une fois par tick et passe à tous les
+        pathogènes; à défaut, game_state.pathogen_target() (None s'il n'y a aucune cellule).
+        """
+        if target is None:
+            target = game_state.pathogen_target()
         # Les bactéries ciblent maintenant toujours le lymphocyte
-        if game_state.immune_cells:
-            # Toujours cibler le lymphocyte (premier dans la liste)
-            self.target = game_state.immune_cells[0]
+        if target is not None:
+            # Toujours cibler le lymphocyte
+            self.target = target
 
             # Calculer la distance au lymphocyte
             dx = self.target.x - self.x
@@ -85,6 +91,8 @@ class Pathogen:
         return self.health <= 0
 
     def draw(self, screen, offset_x=0, offset_y=0):
+        import pygame
+
         # Dessine le pathogène
         pygame.draw.circle(screen, self.color,
                            (int(self.x + offset_x), int(self.y + offset_y)),
@@ -0,0 +1,7 @@
+# neural_battler/src/game/systems/__init__.py
+from .entity_pool import EntityPool
+from .pathogen_store import PathogenStore, PathogenView
+from .projectiles import ProjectilePool
+from .spatial_hash import SpatialHashGrid
+
+__all__ = ['EntityPool', 'PathogenStore', 'PathogenView', 'ProjectilePool', 'SpatialHashGrid']
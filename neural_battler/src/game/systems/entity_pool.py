@@ -0,0 +1,81 @@
+# neural_battler/src/game/systems/entity_pool.py
+
+_INDEX_BITS = 32
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
+
+
+class EntityPool:
+    """
+    Pool d'entités à identifiants stables.
+
+    - `items` est la liste dense des entités vivantes (utilisable comme une liste)
+    - chaque entité reçoit un handle entier stable `entity_id` (index | génération << 32)
+    - le retrait est en O(1) par swap-remove: la dernière entité prend la place libérée
+    - les index libérés sont réutilisés (free-list) avec une génération incrémentée,
+      ce qui invalide les anciens handles: un handle périmé n'est jamais confondu
+      avec la nouvelle entité du même index
+    """
+
+    def __init__(self):
+        self.items = []
+        self._slot_of = []     # index -> slot dans items (-1 si libre)
+        self._generation = []  # index -> génération courante
+        self._free = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add(self, entity):
+        """Ajoute une entité et lui attribue un handle stable"""
+        if self._free:
+            index = self._free.pop()
+        else:
+            index = len(self._slot_of)
+            self._slot_of.append(-1)
+            self._generation.append(0)
+
+        self._slot_of[index] = len(self.items)
+        self.items.append(entity)
+        entity.entity_id = (self._generation[index] << _INDEX_BITS) | index
+        return entity.entity_id
+
+    def remove(self, entity):
+        """
+        Retire une entité par swap-remove.
+        Retourne (slot libéré, entité déplacée dans ce slot ou None).
+        """
+        index = entity.entity_id & _INDEX_MASK
+        slot = self._slot_of[index]
+        last = self.items.pop()
+
+        moved = None
+        if last is not entity:
+            self.items[slot] = last
+            self._slot_of[last.entity_id & _INDEX_MASK] = slot
+            moved = last
+
+        self._slot_of[index] = -1
+        self._generation[index] += 1
+        self._free.append(index)
+        return slot, moved
+
+    def is_alive(self, handle):
+        """Vérifie en temps constant que le handle désigne toujours une entité du pool"""
+        if handle is None:
+            return False
+        index = handle & _INDEX_MASK
+        return (index < len(self._generation) and
+                self._generation[index] == handle >> _INDEX_BITS and
+                self._slot_of[index] >= 0)
+
+    def slot(self, handle):
+        """Slot courant de l'entité désignée par le handle (-1 si morte)"""
+        return self._slot_of[handle & _INDEX_MASK] if self.is_alive(handle) else -1
+
+    def get(self, handle):
+        """Entité désignée par le handle, ou None si elle n'existe plus"""
+        slot = self.slot(handle)
+        return self.items[slot] if slot >= 0 else None
@@ -0,0 +1,67 @@
+# neural_battler/src/game/systems/geometry.py
+import numpy as np
+
+
+class CellGeometry:
+    """
+    Vecteurs et distances d'une cellule vers tous les pathogènes, calculés une fois.
+    Les tableaux sont alignés sur l'ordre de tissue.pathogens.
+    """
+
+    def __init__(self, x, y, positions, dx=None, dy=None):
+        self.x = x
+        self.y = y
+        if dx is None:
+            dx = positions[:, 0] - x
+            dy = positions[:, 1] - y
+        self.dx = dx
+        self.dy = dy
+        self.distances = np.sqrt(self.dx ** 2 + self.dy ** 2)
+
+        if len(self.distances):
+            self.closest_index = int(np.argmin(self.distances))
+            self.closest_distance = float(self.distances[self.closest_index])
+        else:
+            self.closest_index = -1
+            self.closest_distance = float('inf')
+
+    def within(self, radius):
+        """Indices des pathogènes à une distance <= radius"""
+        return np.flatnonzero(self.distances <= radius)
+
+
+class GeometryCache:
+    """
+    Cache par tick de la géométrie cellule → pathogènes d'un Tissue.
+    Invalidé par le Tissue quand les pathogènes bougent, apparaissent ou disparaissent;
+    une entrée est aussi recalculée si la cellule a bougé depuis son calcul.
+    Ciblage, observation de l'agent et récompense lisent tous la même entrée.
+    """
+
+    def __init__(self, tissue):
+        self.tissue = tissue
+        self._entries = {}
+
+    def invalidate(self):
+        self._entries.clear()
+
+    def for_cell(self, cell):
+        entry = self._entries.get(cell)
+        if entry is not None and entry.x == cell.x and entry.y == cell.y:
+            return entry
+
+        positions, _ = self.tissue.get_pathogen_arrays()
+        entry = CellGeometry(cell.x, cell.y, positions)
+        self._entries[cell] = entry
+        return entry
+
+    def prefetch(self, cells):
+        """Calcule en un bloc (n, P) les entrées de plusieurs cellules (lymphocytes IA d'un tick)"""
+        if not cells:
+            return
+        positions, _ = self.tissue.get_pathogen_arrays()
+        origins = np.array([(cell.x, cell.y) for cell in cells], dtype=np.float64)
+        dx = positions[None, :, 0] - origins[:, 0:1]
+        dy = positions[None, :, 1] - origins[:, 1:2]
+        for cell, (x, y), row_dx, row_dy in zip(cells, origins.tolist(), dx, dy):
+            self._entries[cell] = CellGeometry(x, y, positions, row_dx, row_dy)
@@ -0,0 +1,184 @@
+# neural_battler/src/game/systems/pathogen_store.py
+import numpy as np
+
+from ..entities.pathogen import Pathogen
+from .entity_pool import EntityPool
+
+
+class _Column:
+    """Attribut de Pathogen stocké dans une colonne du PathogenStore"""
+
+    def __init__(self, array_name, index=None):
+        self.array_name = array_name
+        self.index = index
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            # Pathogène retiré du store: on lit la copie figée
+            return obj._detached[self.name]
+        array = getattr(store, self.array_name)
+        if self.index is None:
+            return array[obj._slot].item()
+        return array[obj._slot, self.index].item()
+
+    def __set__(self, obj, value):
+        store = obj._store
+        if store is None:
+            obj._detached[self.name] = value
+            return
+        array = getattr(store, self.array_name)
+        if self.index is None:
+            array[obj._slot] = value
+        else:
+            array[obj._slot, self.index] = value
+
+
+class PathogenView(Pathogen):
+    """
+    Pathogène dont l'état numérique vit dans les tableaux d'un PathogenStore.
+    Garde la même interface que Pathogen pour le reste du jeu (rendu, IA, projectiles).
+    """
+    x = _Column("positions", 0)
+    y = _Column("positions", 1)
+    health = _Column("health")
+    max_health = _Column("max_health")
+    attack_damage = _Column("attack_damage")
+    attack_range = _Column("attack_range")
+    attack_cooldown = _Column("attack_cooldown")
+    attack_cooldown_max = _Column("attack_cooldown_max")
+    speed = _Column("speed")
+    radius = _Column("radius")
+
+    COLUMNS = ("x", "y", "health", "max_health", "attack_damage", "attack_range",
+               "attack_cooldown", "attack_cooldown_max", "speed", "radius")
+
+    def __init__(self, store, slot, x, y, pathogen_type="bacteria"):
+        # Le slot doit être connu avant que Pathogen.__init__ n'écrive les valeurs par défaut
+        self._store = store
+        self._slot = slot
+        super().__init__(x, y, pathogen_type)
+
+    def detach(self):
+        """Fige l'état courant hors du store (appelé quand le pathogène est retiré)"""
+        self._detached = {name: getattr(self, name) for name in self.COLUMNS}
+        self._store = None
+        self._slot = -1
+
+
+class PathogenStore:
+    """
+    Stockage structure-of-arrays des pathogènes d'un tissu.
+    Les slots [0, count) sont occupés et alignés sur la liste `entities`,
+    qui est la liste dense d'un EntityPool (handles stables, swap-remove).
+    """
+
+    _FLOAT_ARRAYS = ("health", "max_health", "attack_damage", "attack_range", "speed", "radius")
+    _INT_ARRAYS = ("attack_cooldown", "attack_cooldown_max")
+
+    def __init__(self, capacity=32):
+        self.count = 0
+        self.capacity = 0
+        self.pool = EntityPool()
+        self.entities = self.pool.items
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Alloue (ou agrandit) les tableaux en conservant les slots occupés"""
+        n = self.count
+        positions = np.zeros((capacity, 2), dtype=np.float64)
+        if n:
+            positions[:n] = self.positions[:n]
+        self.positions = positions
+
+        for name in self._FLOAT_ARRAYS + self._INT_ARRAYS:
+            dtype = np.int64 if name in self._INT_ARRAYS else np.float64
+            array = np.zeros(capacity, dtype=dtype)
+            if n:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, y, pathogen_type="bacteria"):
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        slot = self.count
+        self.count += 1
+        pathogen = PathogenView(self, slot, x, y, pathogen_type)
+        self.pool.add(pathogen)
+        return pathogen
+
+    def step_towards(self, target):
+        """
+        Avance tous les pathogènes d'un tick vers la cible:
+        attaque si à portée et cooldown terminé, sinon déplacement.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        positions = self.positions[:n]
+        cooldown = self.attack_cooldown[:n]
+
+        delta = np.array([target.x, target.y], dtype=np.float64) - positions
+        distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+
+        # Attaques (les dégâts de tous les attaquants sont cumulés sur la cible)
+        reach = self.attack_range[:n] + self.radius[:n] + target.radius
+        attacking = (distance <= reach) & (cooldown == 0)
+        if attacking.any():
+            target.take_damage(self.attack_damage[:n][attacking].sum().item())
+            cooldown[attacking] = self.attack_cooldown_max[:n][attacking]
+
+        # Déplacement vers la cible pour les autres
+        moving = ~attacking & (distance > 0)
+        if moving.any():
+            step = delta[moving] / distance[moving, None] * self.speed[:n][moving, None]
+            positions[moving] += step
+
+        # Gestion du cooldown d'attaque
+        cooldown[cooldown > 0] -= 1
+
+    def wander(self):
+        """Mouvement aléatoire de tous les pathogènes quand il n'y a pas de cible"""
+        n = self.count
+        if n == 0:
+            return
+        self.positions[:n] += np.random.uniform(-0.5, 0.5, size=(n, 2)) * self.speed[:n, None]
+
+    def remove_dead(self):
+        """
+        Retire les pathogènes morts par swap-remove (le dernier slot comble le trou).
+        Retourne la liste des pathogènes retirés.
+        """
+        n = self.count
+        dead = np.flatnonzero(self.health[:n] <= 0)
+        if len(dead) == 0:
+            return []
+
+        arrays = [self.positions] + [getattr(self, name) for name in self._FLOAT_ARRAYS + self._INT_ARRAYS]
+        removed = []
+        # Par slots décroissants: le dernier slot occupé est toujours vivant au moment du swap
+        for slot in dead[::-1].tolist():
+            pathogen = self.entities[slot]
+            pathogen.detach()
+            removed.append(pathogen)
+
+            last = self.count - 1
+            _, moved = self.pool.remove(pathogen)
+            if moved is not None:
+                for array in arrays:
+                    array[slot] = array[last]
+                moved._slot = slot
+            self.count = last
+        return removed
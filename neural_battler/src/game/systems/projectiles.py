@@ -0,0 +1,137 @@
+# neural_battler/src/game/systems/projectiles.py
+import numpy as np
+
+
+class ProjectilePool:
+    """
+    Pool préalloué de projectiles stockés en tableaux (position, vitesse, dégâts, rayon).
+    Les slots libérés sont réutilisés via une pile de slots libres; le pool double
+    de capacité seulement quand il est plein.
+    shared=True indique un pool commun à toutes les cellules d'un Tissue, avancé
+    et dessiné une seule fois par tick par le Tissue lui-même. Chaque projectile garde
+    le handle de la cellule qui l'a tiré (owner, -1 si inconnu): le Tissue retire les
+    projectiles d'une cellule morte, comme lorsque chaque cellule avait les siens.
+    """
+
+    def __init__(self, capacity=16, color=(0, 255, 255), shared=False):
+        self.color = color  # Cyan pour les projectiles
+        self.shared = shared
+        self.count = 0
+        self.capacity = 0
+        self.positions = np.zeros((0, 2))
+        self.velocities = np.zeros((0, 2))
+        self.damage = np.zeros(0)
+        self.radius = np.zeros(0)
+        self.owner = np.zeros(0, dtype=np.int64)
+        self.active = np.zeros(0, dtype=bool)
+        self._free = []
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity
+        for name, shape, dtype in (("positions", (capacity, 2), np.float64),
+                                   ("velocities", (capacity, 2), np.float64),
+                                   ("damage", (capacity,), np.float64),
+                                   ("radius", (capacity,), np.float64),
+                                   ("owner", (capacity,), np.int64),
+                                   ("active", (capacity,), bool)):
+            array = np.zeros(shape, dtype=dtype)
+            array[:old] = getattr(self, name)
+            setattr(self, name, array)
+        # Les plus petits slots sont réutilisés en premier (pile: fin de liste)
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, dx, dy, damage, radius, owner=-1):
+        """Active un projectile dans un slot libre et retourne son slot"""
+        if not self._free:
+            self._grow(self.capacity * 2)
+        slot = self._free.pop()
+        self.positions[slot] = (x, y)
+        self.velocities[slot] = (dx, dy)
+        self.damage[slot] = damage
+        self.radius[slot] = radius
+        self.owner[slot] = owner
+        self.active[slot] = True
+        self.count += 1
+        return slot
+
+    def release(self, slots):
+        """Libère un ensemble de slots actifs"""
+        if len(slots) == 0:
+            return
+        self.active[slots] = False
+        self._free.extend(np.asarray(slots).tolist())
+        self.count -= len(slots)
+
+    def release_owners(self, owners):
+        """Libère les projectiles tirés par les cellules `owners` (handles)"""
+        self.release(np.flatnonzero(self.active & np.isin(self.owner, owners)))
+
+    def clear(self):
+        self.release(np.flatnonzero(self.active))
+
+    def active_positions(self):
+        return self.positions[self.active]
+
+    def update(self, width, height, target_positions, target_radii, target_ids=None):
+        """
+        Avance tous les projectiles d'un tick en une seule passe:
+        déplacement, retrait hors limites puis collisions avec les cibles.
+        Chaque projectile touche la cible en contact la plus proche; à distance égale,
+        celle de plus petit identifiant ou à défaut de plus petit indice.
+        target_ids: fonction retournant les identifiants stables (n,) des cibles, appelée
+        seulement en cas d'égalité; le résultat ne dépend alors pas de l'ordre des cibles.
+        Changement de règle de jeu introduit avec ce pool: auparavant, un projectile touchait
+        le premier pathogène en contact dans l'ordre de la liste du Tissue. Les deux moteurs
+        (objet et vectorisé) appliquent la même règle (voir tests/test_projectiles.py et
+        tests/test_engines.py).
+        Retourne le tableau des dégâts reçus par chaque cible.
+        """
+        damage_taken = np.zeros(len(target_positions))
+        if self.count == 0:
+            return damage_taken
+
+        slots = self.active.nonzero()[0]
+        positions = self.positions[slots]
+        positions += self.velocities[slots]
+        self.positions[slots] = positions
+
+        # Vérifier si les projectiles sont hors limites
+        out = ((positions < 0) | (positions > (width, height))).any(axis=1)
+        if out.any():
+            self.release(slots[out])
+            slots, positions = slots[~out], positions[~out]
+
+        if len(slots) == 0 or len(target_positions) == 0:
+            return damage_taken
+
+        # Collisions projectiles × cibles par broadcast (Q, P)
+        delta = target_positions[None, :, :] - positions[:, None, :]
+        distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+        hit = distance < target_radii[None, :] + self.radius[slots][:, None]
+        hitting = hit.any(axis=1)
+        if not hitting.any():
+            return damage_taken
+
+        distance = np.where(hit[hitting], distance[hitting], np.inf)
+        targets = np.argmin(distance, axis=1)
+        if target_ids is not None:
+            nearest = distance == distance.min(axis=1, keepdims=True)
+            tied = np.count_nonzero(nearest, axis=1) > 1
+            if tied.any():
+                ids = np.where(nearest[tied], target_ids()[None, :], np.iinfo(np.int64).max)
+                targets[tied] = np.argmin(ids, axis=1)
+        damage_taken = np.bincount(targets, weights=self.damage[slots[hitting]],
+                                   minlength=len(target_positions))
+        self.release(slots[hitting])
+        return damage_taken
+
+    def draw(self, screen, offset_x=0, offset_y=0):
+        import pygame
+
+        for (x, y), radius in zip(self.active_positions(), self.radius[self.active]):
+            pygame.draw.circle(screen, self.color, (int(x + offset_x), int(y + offset_y)), int(radius))
@@ -0,0 +1,265 @@
+# neural_battler/src/game/systems/spatial_hash.py
+import heapq
+
+import numpy as np
+
+_CELL_OFFSET = 1 << 31  # Décalage des coordonnées de case avant encodage (cases négatives)
+
+
+class SpatialHashGrid:
+    """
+    Grille uniforme persistante pour les requêtes de voisinage.
+    Chaque élément est rangé dans la case (cx, cy) de côté cell_size qui contient
+    sa position. La grille est mise à jour de façon incrémentale: un élément qui
+    bouge ne change de case que lorsqu'il franchit une frontière.
+    Les requêtes par lots travaillent sur une copie en tableaux de la grille (éléments
+    triés par case), reconstruite au premier lot qui suit une modification.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self._cells = {}    # (cx, cy) -> {élément: None} (ensemble ordonné)
+        self._entries = {}  # élément -> (x, y, (cx, cy))
+        self._arrays = None  # (éléments, positions, codes de case, début, nombre) pour les lots
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    def _key(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item, x, y):
+        key = self._key(x, y)
+        self._entries[item] = (x, y, key)
+        self._cells.setdefault(key, {})[item] = None
+        self._arrays = None
+
+    def remove(self, item):
+        entry = self._entries.pop(item, None)
+        if entry is None:
+            return
+        self._arrays = None
+        bucket = self._cells[entry[2]]
+        del bucket[item]
+        if not bucket:
+            del self._cells[entry[2]]
+
+    def move(self, item, x, y):
+        """Met à jour la position d'un élément (insertion s'il est inconnu)"""
+        entry = self._entries.get(item)
+        if entry is None:
+            self.insert(item, x, y)
+            return
+
+        key = self._key(x, y)
+        old_key = entry[2]
+        self._entries[item] = (x, y, key)
+        self._arrays = None
+        if key != old_key:
+            bucket = self._cells[old_key]
+            del bucket[item]
+            if not bucket:
+                del self._cells[old_key]
+            self._cells.setdefault(key, {})[item] = None
+
+    def move_many(self, items, positions):
+        """Met à jour un lot d'éléments à partir d'un tableau de positions (n, 2)"""
+        if len(items) == 0:
+            return
+        keys = np.floor_divide(positions, self.cell_size).astype(np.int64).tolist()
+        entries = self._entries
+        self._arrays = None
+        for item, (x, y), (cx, cy) in zip(items, positions.tolist(), keys):
+            entry = entries.get(item)
+            key = (cx, cy)
+            if entry is not None and entry[2] == key:
+                entries[item] = (x, y, key)
+            else:
+                self.move(item, x, y)
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+        self._arrays = None
+
+    def query_radius(self, x, y, radius):
+        """Éléments à une distance <= radius de (x, y)"""
+        cx0, cy0 = self._key(x - radius, y - radius)
+        cx1, cy1 = self._key(x + radius, y + radius)
+        radius_sq = radius * radius
+        cells = self._cells
+        entries = self._entries
+
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    px, py, _ = entries[item]
+                    if (px - x) ** 2 + (py - y) ** 2 <= radius_sq:
+                        found.append(item)
+        return found
+
+    @staticmethod
+    def _encode(cells):
+        """Code entier ordonné (cx majeur) des cases (n, 2)"""
+        return (cells[..., 0] + _CELL_OFFSET) << 32 | (cells[..., 1] + _CELL_OFFSET)
+
+    def _batch_arrays(self):
+        """Éléments et positions triés par case, et (code, début, nombre) de chaque case occupée"""
+        if self._arrays is None:
+            items = list(self._entries)
+            entries = list(self._entries.values())
+            positions = np.array([entry[:2] for entry in entries], dtype=np.float64).reshape(-1, 2)
+            codes = self._encode(np.array([entry[2] for entry in entries], dtype=np.int64).reshape(-1, 2))
+            order = np.argsort(codes, kind="stable")
+            keys, starts, counts = np.unique(codes[order], return_index=True, return_counts=True)
+            self._arrays = ([items[i] for i in order.tolist()], positions[order], keys, starts, counts)
+        return self._arrays
+
+    def _candidates(self, corners, side):
+        """
+        Éléments des carrés de side × side cases de coin inférieur corners (m, 2).
+        Retourne (indice du carré, indice de l'élément trié), groupés par carré.
+        """
+        _, _, keys, starts, counts = self._batch_arrays()
+        offsets = np.stack(np.meshgrid(np.arange(side), np.arange(side), indexing="ij"), axis=-1).reshape(-1, 2)
+        codes = self._encode(corners[:, None, :] + offsets[None, :, :])
+        found = np.minimum(np.searchsorted(keys, codes), len(keys) - 1)
+        occupied = keys[found] == codes
+        sizes = np.where(occupied, counts[found], 0).ravel()
+        total = int(sizes.sum())
+        square = np.repeat(np.repeat(np.arange(len(corners)), side * side), sizes)
+        # Position de chaque candidat dans sa case, ajoutée au début de la case
+        first = np.repeat(np.cumsum(sizes) - sizes, sizes)
+        item = np.repeat(starts[found].ravel(), sizes) + np.arange(total) - first
+        return square, item
+
+    def query_radius_batch(self, points, radius):
+        """Requête de rayon pour plusieurs points (n, 2); retourne une liste par point"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not self._entries or len(points) == 0:
+            return [[] for _ in range(len(points))]
+
+        items, positions, _, _, _ = self._batch_arrays()
+        corners = np.floor_divide(points - radius, self.cell_size).astype(np.int64)
+        side = int(2 * radius // self.cell_size) + 2  # Couvre [x - radius, x + radius] quel que soit x
+        point, item = self._candidates(corners, side)
+        delta = positions[item] - points[point]
+        inside = delta[:, 0] ** 2 + delta[:, 1] ** 2 <= radius * radius
+        point, item = point[inside], item[inside]
+
+        bounds = np.cumsum(np.bincount(point, minlength=len(points)))[:-1].tolist()
+        return [[items[i] for i in group] for group in np.split(item, bounds)] if len(item) else \
+            [[] for _ in range(len(points))]
+
+    def _ring(self, cx, cy, ring):
+        """Cases situées exactement à la distance de Chebyshev `ring` de (cx, cy)"""
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    def query_knn(self, x, y, k):
+        """
+        Les k éléments les plus proches de (x, y), triés par distance croissante.
+        Parcourt des anneaux de cases concentriques et s'arrête dès qu'aucune case
+        non visitée ne peut contenir un élément plus proche que le k-ième trouvé.
+        Au-delà d'autant de cases visitées que d'éléments, tous les éléments sont examinés
+        directement (même résultat, coût borné par O(n)).
+        """
+        if k <= 0 or not self._entries:
+            return []
+
+        cx, cy = self._key(x, y)
+        cells = self._cells
+        entries = self._entries
+        total = len(entries)
+        best = []  # tas max (distance négative) des k meilleurs
+        seen = 0
+        ring = 0
+
+        while True:
+            if (2 * ring + 1) ** 2 > total:
+                nearest = heapq.nsmallest(k, (((px - x) ** 2 + (py - y) ** 2, order, item)
+                                              for order, (item, (px, py, _)) in enumerate(entries.items())))
+                best = [(-dist_sq, order, item) for dist_sq, order, item in nearest]
+                break
+            for key in self._ring(cx, cy, ring):
+                bucket = cells.get(key)
+                if not bucket:
+                    continue
+                for item in bucket:
+                    seen += 1
+                    px, py, _ = entries[item]
+                    dist_sq = (px - x) ** 2 + (py - y) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist_sq, seen, item))
+                    elif dist_sq < -best[0][0]:
+                        heapq.heapreplace(best, (-dist_sq, seen, item))
+
+            # Tout élément hors des anneaux visités est à au moins ring * cell_size
+            covered = ring * self.cell_size
+            if seen == total or (len(best) == k and -best[0][0] <= covered * covered):
+                break
+            ring += 1
+
+        return [item for _, _, item in sorted(best, key=lambda entry: (-entry[0], entry[1]))]
+
+    def query_knn_batch(self, points, k):
+        """
+        k plus proches voisins pour plusieurs points (n, 2); retourne une liste par point.
+        Même parcours par anneaux que query_knn, vectorisé: à chaque tour, les points non
+        résolus examinent le carré de cases de demi-côté `ring` autour de leur case.
+        Dès que ce carré compte plus de cases que la grille n'a d'éléments (points loin des
+        éléments, grille clairsemée), les points restants sont résolus par force brute:
+        le coût d'un point est ainsi borné par O(n) cases et O(n) distances.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        results = [[] for _ in range(len(points))]
+        if k <= 0 or not self._entries or len(points) == 0:
+            return results
+
+        items, positions, _, _, _ = self._batch_arrays()
+        k = min(k, len(items))
+        centers = np.floor_divide(points, self.cell_size).astype(np.int64)
+        pending = np.arange(len(points))
+        ring = 0
+        while len(pending):
+            if (2 * ring + 1) ** 2 > len(items):
+                delta = positions[None, :, :] - points[pending][:, None, :]
+                dist_sq = delta[..., 0] ** 2 + delta[..., 1] ** 2
+                # Tri stable: à distance égale, ordre des éléments triés, comme le parcours par anneaux
+                nearest = np.argsort(dist_sq, axis=1, kind="stable")[:, :k]
+                for index, row in zip(pending.tolist(), nearest.tolist()):
+                    results[index] = [items[i] for i in row]
+                break
+            square, item = self._candidates(centers[pending] - ring, 2 * ring + 1)
+            delta = positions[item] - points[pending][square]
+            dist_sq = delta[:, 0] ** 2 + delta[:, 1] ** 2
+            order = np.lexsort((item, dist_sq, square))
+            square, item, dist_sq = square[order], item[order], dist_sq[order]
+
+            counts = np.bincount(square, minlength=len(pending))
+            first = np.cumsum(counts) - counts
+            enough = counts >= k
+            kth = np.where(enough, dist_sq[np.minimum(first + k - 1, len(dist_sq) - 1)], np.inf) \
+                if len(dist_sq) else np.full(len(pending), np.inf)
+            # Tout élément hors du carré est à au moins ring * cell_size
+            covered = ring * self.cell_size
+            done = enough & ((kth <= covered * covered) | (counts == len(items)))
+            for index in np.flatnonzero(done).tolist():
+                results[pending[index]] = [items[i] for i in item[first[index]:first[index] + k].tolist()]
+            pending = pending[~done]
+            ring += 1
+        return results
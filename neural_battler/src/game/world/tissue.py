@@ -3,19 +3,58 @@ import random
 
 import random
 import numpy as np
-from scipy.spatial import cKDTree
 
 from ..entities.immune_cell import ImmuneCell
 from ..entities.pathogen import Pathogen
+from ..systems.entity_pool import EntityPool
+from ..systems.geometry import GeometryCache
+from ..systems.pathogen_store import PathogenStore
+from ..systems.projectiles import ProjectilePool
+from ..systems.spatial_hash import SpatialHashGrid
+from ...utils.profiler import profiled
+
+ENGINES = ("object", "vectorized")
+
+
+def _within_radius(entities, x, y, radius):
+    """Méthode directe pour les petits nombres d'entités"""
+    nearby = []
+    for entity in entities:
+        dx = entity.x - x
+        dy = entity.y - y
+        if (dx ** 2 + dy ** 2) ** 0.5 <= radius:
+            nearby.append(entity)
+    return nearby
 
 
 class Tissue:
-    def __init__(self, width, height):
+    def __init__(self, width, height, engine="object", spatial_cell_size=125):
+        """
+        engine="object": chaque pathogène est un objet mis à jour individuellement
+        engine="vectorized": l'état des pathogènes vit dans des tableaux NumPy
+        et un tick complet est calculé par opérations vectorisées
+        spatial_cell_size: côté des cases de l'index spatial (moitié de la portée de tir)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Moteur inconnu: {engine} (attendu: {', '.join(ENGINES)})")
+
         self.width = width
         self.height = height
-        self.immune_cells = []
-        self.pathogens = []
+        self.engine = engine
+
+        # Les listes d'entités sont les listes denses de pools à handles stables
+        # (retrait en O(1) par swap-remove, l'ordre n'est pas conservé)
+        self._immune_cell_pool = EntityPool()
+        self.immune_cells = self._immune_cell_pool.items
+
+        # En mode vectorisé, le pool des pathogènes est celui du store (mêmes objets, mêmes slots)
+        self._pathogen_store = PathogenStore() if engine == "vectorized" else None
+        self._pathogen_pool = self._pathogen_store.pool if self._pathogen_store is not None else EntityPool()
+        self.pathogens = self._pathogen_pool.items
         self.effects = []  # Pour animations et effets visuels
+        self._spawn_order = 0  # Rang d'ajout de la prochaine cellule immunitaire
+        self._pathogen_target = None  # Handle de la cellule ciblée par les pathogènes
+        self.projectiles = ProjectilePool(shared=True)  # Projectiles de toutes les cellules
 
         # Paramètres d'apparition des pathogènes
         self.initial_spawn_time = 180  # 3 secondes à 60 FPS
@@ -27,30 +66,69 @@ class Tissue:
         self.difficulty_factor = 1  # Réduire le temps de 2% à chaque spawn
         self.game_time = 0  # Compteur de temps de jeu
 
+        # Index spatial persistant pour les requêtes de voisinage (get_nearby_*),
+        # resynchronisé à la première requête d'un tick. Le ciblage, l'observation et la récompense
+        # n'en dépendent pas: ils lisent les distances du GeometryCache.
         self._update_spatial_index = True
-        self._pathogen_tree = None
-        self._immune_cell_tree = None
+        self._pathogen_grid = SpatialHashGrid(spatial_cell_size)
+        self._immune_cell_grid = SpatialHashGrid(spatial_cell_size)
+
+        # Distances cellule → pathogènes partagées par le ciblage, l'observation et la récompense
+        self.geometry = GeometryCache(self)
 
+    @profiled("tissue.update")
     def update(self):
         # Mise à jour du compteur de temps
         self.game_time += 1
 
-        # Mise à jour de toutes les entités
-        game_state = self  # Pour la simplicité
+        # Les cellules ont pu être déplacées hors du tissu (clavier, environnement)
+        self._update_spatial_index = True
+
+        # Décisions des cellules contrôlées par l'IA: un seul forward par modèle
+        self._decide_ai_actions()
 
         # Mise à jour des cellules immunitaires
-        for cell in self.immune_cells[:]:
-            cell.update(game_state)
-            if cell.is_dead():
-                self.immune_cells.remove(cell)
+        self._update_immune_cells()
+
+        # Projectiles de toutes les cellules: une seule passe par tick
+        self.update_projectiles()
 
         # Mise à jour des pathogènes
-        for pathogen in self.pathogens[:]:
-            pathogen.update(game_state)
-            if pathogen.is_dead():
-                self.pathogens.remove(pathogen)
+        self._update_pathogens()
 
         # Gestion de l'apparition aléatoire des nouveaux pathogènes
+        self._update_spawn()
+
+        # Mise à jour des effets visuels (à implémenter plus tard)
+        for effect in self.effects[:]:
+            # Logique d'animation...
+            pass
+
+        self._update_spatial_index = True
+
+    @profiled("tissue.immune_cells")
+    def _update_immune_cells(self):
+        game_state = self  # Pour la simplicité
+        for cell in self.immune_cells:
+            cell.update(game_state)
+        dead = self._remove_dead_entities(self._immune_cell_pool, self._immune_cell_grid)
+        if dead:
+            # Les projectiles disparaissent avec la cellule qui les a tirés
+            self.projectiles.release_owners([cell.entity_id for cell in dead])
+
+    @profiled("tissue.pathogens")
+    def _update_pathogens(self):
+        if self._pathogen_store is not None:
+            self._update_pathogens_vectorized()
+        else:
+            target = self.pathogen_target()
+            for pathogen in self.pathogens:
+                pathogen.update(self, target)
+            self._remove_dead_entities(self._pathogen_pool, self._pathogen_grid)
+        self.geometry.invalidate()
+
+    @profiled("tissue.spawn")
+    def _update_spawn(self):
         self.pathogen_spawn_cooldown -= 1
         if self.pathogen_spawn_cooldown <= 0 and self.can_add_pathogen():
             # Spawn un nouveau pathogène à une position aléatoire
@@ -65,93 +143,157 @@ class Tissue:
             )
             self.pathogen_spawn_cooldown = self.pathogen_spawn_timer
 
-        # Mise à jour des effets visuels (à implémenter plus tard)
-        for effect in self.effects[:]:
-            # Logique d'animation...
-            pass
-
-        self._update_spatial_index = True
+    @profiled("tissue.ai_decisions")
+    def _decide_ai_actions(self):
+        """
+        Regroupe les cellules IA qui partagent un modèle et évalue chaque groupe en un
+        seul forward (ImmuneCellController.update_batch). Toutes les observations sont
+        prises au début du tick; chaque cellule applique ensuite sa décision dans update.
+        """
+        groups = {}
+        for cell in self.immune_cells:
+            if cell.ai_controlled and cell.controller:
+                groups.setdefault(cell.controller.model_key, []).append(cell)
+
+        for cells in groups.values():
+            if len(cells) == 1:
+                continue  # Une cellule seule garde le chemin direct (ImmuneCellController.update)
+            use_special = cells[0].controller.update_batch(cells, self)
+            for cell, special in zip(cells, use_special.tolist()):
+                cell.ai_decision = {"use_special": special}
+            # Géométrie aux nouvelles positions, lue ensuite par le ciblage de chaque cellule
+            self.geometry.prefetch(cells)
+
+    def _remove_dead_entities(self, pool, grid):
+        """Retire les entités mortes du pool (swap-remove) et de l'index spatial; retourne ces entités"""
+        dead = [entity for entity in pool.items if entity.is_dead()]
+        # Par slots décroissants, comme le PathogenStore: même ordre final pour les deux moteurs
+        for entity in reversed(dead):
+            pool.remove(entity)
+            grid.remove(entity)
+        return dead
+
+    def _update_pathogens_vectorized(self):
+        """Tick de tous les pathogènes en une passe sur les tableaux du store"""
+        store = self._pathogen_store
+        target = self.pathogen_target()
+        if target is not None:
+            # Les bactéries ciblent toujours le lymphocyte
+            store.step_towards(target)
+        else:
+            store.wander()
+        for pathogen in store.remove_dead():
+            self._pathogen_grid.remove(pathogen)
+
+    def _sync_spatial_index(self):
+        """Propage les déplacements depuis le dernier tick dans les grilles (incrémental)"""
+        if not self._update_spatial_index:
+            return
+        if self._pathogen_store is not None:
+            positions, _ = self.get_pathogen_arrays()
+            self._pathogen_grid.move_many(self.pathogens, positions)
+        else:
+            for pathogen in self.pathogens:
+                self._pathogen_grid.move(pathogen, pathogen.x, pathogen.y)
+        for cell in self.immune_cells:
+            self._immune_cell_grid.move(cell, cell.x, cell.y)
+        self._update_spatial_index = False
 
     def get_nearby_pathogens(self, x, y, radius):
-        """Retourne les pathogènes à portée en utilisant KDTree pour efficacité"""
-        # Si peu de pathogènes, utiliser la méthode directe
+        """Retourne les pathogènes à portée en utilisant la grille spatiale"""
+        # Si peu de pathogènes, la méthode directe reste plus rapide que la grille
         if len(self.pathogens) < 10:
-            # Méthode simple originale pour petits nombres
-            nearby = []
-            for pathogen in self.pathogens:
-                dx = pathogen.x - x
-                dy = pathogen.y - y
-                distance = (dx ** 2 + dy ** 2) ** 0.5
-                if distance <= radius:
-                    nearby.append(pathogen)
-            return nearby
-
-        # Pour beaucoup de pathogènes, utiliser KDTree
-        try:
-            # Recalculer l'arbre KD seulement si nécessaire
-            if self._update_spatial_index or self._pathogen_tree is None:
-                positions = np.array([[p.x, p.y] for p in self.pathogens])
-                self._pathogen_tree = cKDTree(positions)
-
-            # Trouver les indices des pathogènes proches
-            indices = self._pathogen_tree.query_ball_point([x, y], radius)
-            return [self.pathogens[i] for i in indices]
-
-        except (ValueError, ImportError) as e:
-            # Fallback en cas d'erreur avec la méthode optimisée
-            print(f"Erreur avec KDTree: {e}, utilisation de la méthode standard")
-            # Utiliser la méthode originale comme fallback
-            nearby = []
-            for pathogen in self.pathogens:
-                dx = pathogen.x - x
-                dy = pathogen.y - y
-                distance = (dx ** 2 + dy ** 2) ** 0.5
-                if distance <= radius:
-                    nearby.append(pathogen)
-            return nearby
+            return _within_radius(self.pathogens, x, y, radius)
+
+        self._sync_spatial_index()
+        return self._pathogen_grid.query_radius(x, y, radius)
 
     def get_nearby_immune_cells(self, x, y, radius):
-        """Retourne les cellules immunitaires à portée en utilisant KDTree pour efficacité"""
-        # Même logique que pour get_nearby_pathogens
+        """Retourne les cellules immunitaires à portée en utilisant la grille spatiale"""
         if len(self.immune_cells) < 10:
-            # Méthode originale comme fallback
-            nearby = []
-            for cell in self.immune_cells:
-                dx = cell.x - x
-                dy = cell.y - y
-                distance = (dx ** 2 + dy ** 2) ** 0.5
-                if distance <= radius:
-                    nearby.append(cell)
-            return nearby
-
-        # Pour plusieurs cellules, utiliser KDTree
-        try:
-            if self._update_spatial_index or self._immune_cell_tree is None:
-                positions = np.array([[c.x, c.y] for c in self.immune_cells])
-                self._immune_cell_tree = cKDTree(positions)
-
-            indices = self._immune_cell_tree.query_ball_point([x, y], radius)
-            return [self.immune_cells[i] for i in indices]
-
-        except (ValueError, ImportError) as e:
-            # Fallback
-            nearby = []
-            for cell in self.immune_cells:
-                dx = cell.x - x
-                dy = cell.y - y
-                distance = (dx ** 2 + dy ** 2) ** 0.5
-                if distance <= radius:
-                    nearby.append(cell)
-            return nearby
+            return _within_radius(self.immune_cells, x, y, radius)
+
+        self._sync_spatial_index()
+        return self._immune_cell_grid.query_radius(x, y, radius)
+
+    def pathogen_target(self):
+        """
+        Cellule ciblée par les pathogènes: la plus ancienne cellule immunitaire présente
+        (le lymphocyte). Suivie par son handle, elle ne change pas quand le swap-remove
+        réordonne self.immune_cells. None s'il n'y a plus de cellule.
+        """
+        target = self._immune_cell_pool.get(self._pathogen_target)
+        if target is None and self.immune_cells:
+            target = min(self.immune_cells, key=lambda cell: cell.spawn_order)
+            self._pathogen_target = target.entity_id
+        return target
+
+    def get_pathogen(self, handle):
+        """Pathogène désigné par un handle stable (entity_id), ou None s'il est mort"""
+        return self._pathogen_pool.get(handle)
+
+    def is_pathogen_alive(self, handle):
+        return self._pathogen_pool.is_alive(handle)
+
+    def get_pathogen_arrays(self):
+        """Positions (n, 2) et rayons (n,) des pathogènes, dans l'ordre de self.pathogens"""
+        if self._pathogen_store is not None:
+            n = self._pathogen_store.count
+            return self._pathogen_store.positions[:n], self._pathogen_store.radius[:n]
+
+        positions = np.array([(p.x, p.y) for p in self.pathogens], dtype=np.float64).reshape(-1, 2)
+        radii = np.array([p.radius for p in self.pathogens], dtype=np.float64)
+        return positions, radii
+
+    def get_pathogen_ids(self):
+        """Handles stables (n,) des pathogènes, dans l'ordre de self.pathogens"""
+        return np.fromiter((p.entity_id for p in self.pathogens), dtype=np.int64, count=len(self.pathogens))
+
+    def get_pathogen_health_ratios(self):
+        """Santé relative (n,) des pathogènes, dans l'ordre de self.pathogens"""
+        if self._pathogen_store is not None:
+            n = self._pathogen_store.count
+            return self._pathogen_store.health[:n] / self._pathogen_store.max_health[:n]
+        return np.array([p.health / p.max_health for p in self.pathogens], dtype=np.float64)
+
+    @profiled("tissue.projectiles")
+    def update_projectiles(self, pool=None):
+        """Avance un pool de projectiles (par défaut le pool partagé) et applique les dégâts"""
+        pool = self.projectiles if pool is None else pool
+        if not pool:
+            return
+
+        positions, radii = self.get_pathogen_arrays()
+        damage = pool.update(self.width, self.height, positions, radii, self.get_pathogen_ids)
+        if damage.any():
+            self.damage_pathogens(damage)
+
+    def damage_pathogens(self, damage):
+        """Applique un vecteur de dégâts aligné sur self.pathogens"""
+        if self._pathogen_store is not None:
+            health = self._pathogen_store.health[:self._pathogen_store.count]
+            np.maximum(health - damage, 0, out=health)
+            return
+
+        for i in np.flatnonzero(damage):
+            self.pathogens[i].take_damage(damage[i].item())
 
     def add_immune_cell(self, x, y, cell_type="t_cell", ai_model_path=None):
-        cell = ImmuneCell(x, y, cell_type, ai_model_path)
-        self.immune_cells.append(cell)
+        cell = ImmuneCell(x, y, cell_type, ai_model_path, projectiles=self.projectiles)
+        cell.spawn_order = self._spawn_order
+        self._spawn_order += 1
+        self._immune_cell_pool.add(cell)
+        self._immune_cell_grid.insert(cell, x, y)
         return cell
 
     def add_pathogen(self, x, y, pathogen_type="bacteria"):
-        pathogen = Pathogen(x, y, pathogen_type)
-        self.pathogens.append(pathogen)
+        if self._pathogen_store is not None:
+            pathogen = self._pathogen_store.add(x, y, pathogen_type)
+        else:
+            pathogen = Pathogen(x, y, pathogen_type)
+            self._pathogen_pool.add(pathogen)
+        self._pathogen_grid.insert(pathogen, x, y)
+        self.geometry.invalidate()
         return pathogen
 
     def can_add_pathogen(self):
@@ -183,6 +325,8 @@ class Tissue:
         for pathogen in self.pathogens:
             pathogen.draw(screen)
 
+        self.projectiles.draw(screen)
+
         # Dessine les effets (à implémenter plus tard)
         for effect in self.effects:
             # Logique de dessin...
@@ -8,9 +8,6 @@ from pathlib import Path
 # Imports relatifs
 from .game.world.tissue import Tissue
 
-# Initialisation de Pygame
-pygame.init()
-
 # Constantes
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -38,14 +35,15 @@ def draw_stats(screen, tissue, font, survival_time=None, steps_survived=None):
     immune_count = len(tissue.immune_cells)
     pathogen_count = len(tissue.pathogens)
 
-    if immune_count > 0:
-        lt_health = tissue.immune_cells[0].health
+    lymphocyte = tissue.pathogen_target()
+    if lymphocyte is not None:
+        lt_health = lymphocyte.health
         health_text = font.render(f"Santé du lymphocyte: {lt_health}", True, (0, 0, 128))
         screen.blit(health_text, (10, 70))
 
         # Afficher l'état de la capacité spéciale
-        if hasattr(tissue.immune_cells[0], 'special_ready'):
-            special_status = "Prête" if tissue.immune_cells[0].special_ready else "En recharge"
+        if hasattr(lymphocyte, 'special_ready'):
+            special_status = "Prête" if lymphocyte.special_ready else "En recharge"
             special_text = font.render(f"Capacité spéciale: {special_status}", True, (128, 0, 128))
             screen.blit(special_text, (10, 100))
 
@@ -98,6 +96,9 @@ def spawn_random_pathogen(tissue):
 
 
 def main(model_path=None):
+    # Initialisation de Pygame (au lancement du jeu, pas à l'import du module)
+    pygame.init()
+
     # Configuration de l'écran
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     caption = "Neural Battler - AI Lymphocyte" if model_path else "Neural Battler - Immune System"
@@ -150,7 +151,8 @@ def main(model_path=None):
                         print("Capacité spéciale utilisée!")
 
         # Vérifier si le lymphocyte est mort
-        if not game_over and (not tissue.immune_cells or tissue.immune_cells[0].is_dead()):
+        lymphocyte = tissue.pathogen_target()
+        if not game_over and (lymphocyte is None or lymphocyte.is_dead()):
             game_over = True
 
         if not game_over:
@@ -0,0 +1,3 @@
+from .histogram import Histogram
+from .metrics import MetricsWriter, RollingStats, read_metrics
+from .profiler import Profiler, profiled, profiler
@@ -0,0 +1,66 @@
+# neural_battler/src/utils/histogram.py
+import bisect
+import math
+
+
+class Histogram:
+    """
+    Histogramme à seaux logarithmiques, en O(1) mémoire et O(log seaux) par valeur.
+
+    Les seaux couvrent [min_value, max_value] avec `buckets_per_decade` seaux par
+    puissance de dix; les valeurs hors bornes tombent dans le premier/dernier seau.
+    Percentiles approchés (borne supérieure du seau), min/max/moyenne exacts.
+    """
+
+    def __init__(self, min_value=1e-6, max_value=10.0, buckets_per_decade=10):
+        decades = math.log10(max_value / min_value)
+        count = int(math.ceil(decades * buckets_per_decade))
+        self.bounds = [min_value * 10 ** (i / buckets_per_decade) for i in range(count + 1)]
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value, n=1):
+        self.counts[bisect.bisect_left(self.bounds, value)] += n
+        self.count += n
+        self.total += value * n
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Valeur sous laquelle tombent p % des observations (borne supérieure du seau)"""
+        if not self.count:
+            return 0.0
+        target = p / 100 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                return min(self.bounds[min(index, len(self.bounds) - 1)], self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else 0.0,
+        }
+
+    def format(self, scale=1.0, unit=""):
+        """Résumé lisible; scale convertit l'unité (ex: 1e3 pour des secondes en ms)"""
+        s = self.summary()
+        return (f"n={s['count']} moy={s['mean'] * scale:.3g}{unit} p50={s['p50'] * scale:.3g}{unit} "
+                f"p90={s['p90'] * scale:.3g}{unit} p99={s['p99'] * scale:.3g}{unit} max={s['max'] * scale:.3g}{unit}")
@@ -0,0 +1,200 @@
+# neural_battler/src/utils/metrics.py
+import glob
+import json
+import math
+import os
+import time
+
+
+class RollingStats:
+    """
+    Moyenne et écart-type glissants sur les `window` dernières valeurs, en O(1) par valeur
+    et O(window) mémoire (tampon circulaire, sommes courantes recalculées à chaque tour
+    du tampon pour borner l'erreur d'arrondi). Compte et moyenne cumulés en plus.
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self._values = [0.0] * self.window
+        self._next = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self.count = 0
+        self.total = 0.0
+        self.last = None
+
+    def record(self, value):
+        value = float(value)
+        if self.count >= self.window:
+            old = self._values[self._next]
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._values[self._next] = value
+        self._sum += value
+        self._sum_sq += value * value
+        self._next = (self._next + 1) % self.window
+        self.count += 1
+        self.total += value
+        self.last = value
+        if self._next == 0:
+            self._sum = math.fsum(self._values)
+            self._sum_sq = math.fsum(v * v for v in self._values)
+
+    @property
+    def size(self):
+        """Nombre de valeurs dans la fenêtre"""
+        return min(self.count, self.window)
+
+    @property
+    def mean(self):
+        return self._sum / self.size if self.count else 0.0
+
+    @property
+    def std(self):
+        if not self.count:
+            return 0.0
+        return math.sqrt(max(self._sum_sq / self.size - self.mean ** 2, 0.0))
+
+    @property
+    def overall_mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {"count": self.count, "last": self.last, "mean": self.mean, "std": self.std,
+                "overall_mean": self.overall_mean}
+
+    def state_dict(self):
+        """État complet (types Python simples), pour reprendre un entraînement interrompu"""
+        return {"window": self.window, "values": list(self._values), "next": self._next,
+                "count": self.count, "total": self.total, "last": self.last}
+
+    def load_state_dict(self, state):
+        if state["window"] != self.window:
+            raise ValueError(f"Fenêtre {state['window']} incompatible avec {self.window}")
+        self._values = [float(v) for v in state["values"]]
+        self._next = state["next"]
+        self.count = state["count"]
+        self.total = state["total"]
+        self.last = state["last"]
+        values = self._values[:self.size]
+        self._sum = math.fsum(values)
+        self._sum_sq = math.fsum(v * v for v in values)
+
+
+def segment_path(prefix, index):
+    return f"{prefix}.{index:04d}.jsonl"
+
+
+def metrics_segments(prefix):
+    """Segments d'un journal de métriques, dans l'ordre d'écriture"""
+    return sorted(glob.glob(glob.escape(prefix) + ".[0-9][0-9][0-9][0-9].jsonl"))
+
+
+def _segment_index(path):
+    return int(path.rsplit(".", 2)[1])
+
+
+class MetricsWriter:
+    """
+    Journal de métriques en JSONL: un enregistrement par ligne ({"kind": ..., "time": ..., champs}).
+
+    Les lignes sont mises en tampon et écrites par paquets de `buffer_size`, ou au plus
+    tard `flush_interval` secondes après la précédente écriture: un entraînement en cours
+    peut être suivi depuis un autre processus. Le fichier change de segment
+    (`<prefix>.0001.jsonl`, ...) au-delà de `max_bytes`; avec `max_files`, les segments les
+    plus anciens sont supprimés. La mémoire du processus reste constante quelle que soit
+    la durée du run. Rouvrir un préfixe existant commence un nouveau segment.
+
+    resume_from: position renvoyée par `mark` lors d'une exécution précédente; les
+    enregistrements écrits après elle sont supprimés et le journal reprend à cet endroit.
+    """
+
+    def __init__(self, prefix, buffer_size=256, flush_interval=5.0, max_bytes=64 * 2 ** 20, max_files=None,
+                 resume_from=None):
+        self.prefix = prefix
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+        existing = metrics_segments(prefix)
+        self._buffer = []
+        self._start = time.time()
+        self._last_flush = time.monotonic()
+        if resume_from is None:
+            self._index = _segment_index(existing[-1]) + 1 if existing else 0
+        else:
+            self._index = resume_from["segment"]
+            for path in existing:
+                if _segment_index(path) > self._index:
+                    os.remove(path)
+            path = segment_path(prefix, self._index)
+            if os.path.exists(path):
+                os.truncate(path, resume_from["offset"])
+            self._start -= resume_from["time"]
+        self._open()
+
+    def _open(self):
+        self.path = segment_path(self.prefix, self._index)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._bytes = os.path.getsize(self.path)
+
+    def mark(self):
+        """Position du journal après écriture du tampon (voir resume_from)"""
+        self.flush()
+        return {"segment": self._index, "offset": self._bytes, "time": time.time() - self._start}
+
+    def log(self, kind, **fields):
+        fields["kind"] = kind
+        fields["time"] = round(time.time() - self._start, 3)
+        self._buffer.append(json.dumps(fields))
+        if len(self._buffer) >= self.buffer_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            data = "\n".join(self._buffer) + "\n"
+            self._buffer.clear()
+            self._file.write(data)
+            self._file.flush()
+            self._bytes += len(data.encode("utf-8"))
+            if self._bytes >= self.max_bytes:
+                self._rotate()
+        self._last_flush = time.monotonic()
+
+    def _rotate(self):
+        self._file.close()
+        self._index += 1
+        self._open()
+        if self.max_files:
+            for old in metrics_segments(self.prefix)[:-self.max_files]:
+                os.remove(old)
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_metrics(prefix, kind=None):
+    """
+    Enregistrements d'un journal (tous les segments), éventuellement filtrés par `kind`.
+    Une dernière ligne incomplète (run en cours d'écriture) est ignorée.
+    """
+    for path in metrics_segments(prefix):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                record = json.loads(line)
+                if kind is None or record["kind"] == kind:
+                    yield record
@@ -0,0 +1,129 @@
+# neural_battler/src/utils/profiler.py
+import functools
+import time
+
+from .histogram import Histogram
+
+
+class _profiled_method:
+    """Marqueur posé par @profiled; remplacé par la fonction d'origine à la création de la classe"""
+
+    def __init__(self, function, name):
+        self.function = function
+        self.name = name
+
+    def __set_name__(self, owner, attribute):
+        setattr(owner, attribute, self.function)
+        profiler.register(owner, attribute, self.name)
+
+
+def profiled(name):
+    """
+    Déclare une méthode comme phase du profileur. Tant que le profileur est désactivé,
+    la classe garde la méthode d'origine: aucun coût à l'appel.
+    """
+    def decorator(function):
+        return _profiled_method(function, name)
+    return decorator
+
+
+class _Phase:
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """
+    Temps par phase (simulation, observation, récompense, sélection d'action,
+    apprentissage, sauvegarde), mesurés avec une horloge monotone dans des Histogram.
+
+    Les méthodes décorées par @profiled("nom") sont enveloppées à l'activation et
+    restaurées à la désactivation. Les phases peuvent s'imbriquer: chaque durée est
+    inclusive, et la part affichée est relative au temps écoulé depuis le dernier reset.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._methods = []  # (classe, attribut, phase)
+        self._histograms = {}
+        self._since = time.perf_counter()
+
+    def register(self, owner, attribute, name):
+        self._methods.append((owner, attribute, name))
+        if self.enabled:
+            self._wrap(owner, attribute, name)
+
+    def _histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = Histogram(min_value=1e-7, max_value=100.0)
+        return histogram
+
+    def _wrap(self, owner, attribute, name):
+        function = owner.__dict__[attribute]
+        record = self._histogram(name).record
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(time.perf_counter() - start)
+
+        wrapper.__profiled__ = function
+        setattr(owner, attribute, wrapper)
+
+    def enable(self):
+        if not self.enabled:
+            self.enabled = True
+            for owner, attribute, name in self._methods:
+                self._wrap(owner, attribute, name)
+            self.reset()
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            for owner, attribute, _ in self._methods:
+                setattr(owner, attribute, owner.__dict__[attribute].__profiled__)
+
+    def phase(self, name):
+        """Contexte mesurant un bloc de code (hors boucles chaudes: le coût reste celui d'un with)"""
+        return _Phase(self._histogram(name))
+
+    def reset(self):
+        for histogram in self._histograms.values():
+            histogram.reset()
+        self._since = time.perf_counter()
+
+    def stats(self):
+        """{phase: résumé de l'histogramme + temps total}, phases les plus coûteuses d'abord"""
+        phases = sorted(self._histograms.items(), key=lambda item: item[1].total, reverse=True)
+        return {name: dict(histogram.summary(), total=histogram.total)
+                for name, histogram in phases if histogram.count}
+
+    def report(self, title="Profil"):
+        stats = self.stats()
+        elapsed = time.perf_counter() - self._since
+        if not stats:
+            return f"{title}: aucune mesure"
+        lines = [f"{title}: {elapsed:.2f}s (durées inclusives: une phase compte ses sous-phases)",
+                 f"{'phase':>22} {'total (s)':>10} {'part':>7} {'appels':>9} {'moy (us)':>9} "
+                 f"{'p50 (us)':>9} {'p99 (us)':>9}"]
+        for name, s in stats.items():
+            lines.append(f"{name:>22} {s['total']:>10.3f} {s['total'] / elapsed:>7.1%} {s['count']:>9} "
+                         f"{s['mean'] * 1e6:>9.1f} {s['p50'] * 1e6:>9.1f} {s['p99'] * 1e6:>9.1f}")
+        return "\n".join(lines)
+
+
+# Profileur du processus, partagé par le jeu et l'entraînement (désactivé par défaut)
+profiler = Profiler()
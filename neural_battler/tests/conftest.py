@@ -0,0 +1,8 @@
+# neural_battler/tests/conftest.py
+import os
+import sys
+
+# Racine du projet (imports `src.`), comme benchmarks/bench.py
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,35 @@
+# neural_battler/tests/test_engines.py
+"""Équivalence des moteurs du Tissue (objet et vectorisé)."""
+import random
+
+import numpy as np
+
+from src.game.world.tissue import Tissue
+
+
+def rollout(engine, ticks=1500, seed=3):
+    """Trace par tick (cible des pathogènes, effectifs, santés) d'une partie à graine fixe"""
+    random.seed(seed)
+    np.random.seed(seed)
+    tissue = Tissue(800, 600, engine=engine)
+    cells = [tissue.add_immune_cell(100 + 150 * i, 300) for i in range(4)]
+    cells[1].health = 1  # Meurt au premier coup reçu: ses projectiles doivent disparaître
+    for _ in range(15):
+        tissue.add_pathogen(random.randint(50, 750), random.randint(50, 550))
+
+    trace = []
+    for _ in range(ticks):
+        tissue.update()
+        target = tissue.pathogen_target()
+        trace.append((
+            target.spawn_order if target else None,
+            len(tissue.immune_cells),
+            len(tissue.pathogens),
+            round(sum(p.health for p in tissue.pathogens), 6),
+            tuple(round(c.health, 6) for c in tissue.immune_cells),
+        ))
+    return trace
+
+
+def test_engines_match():
+    assert rollout("object") == rollout("vectorized")
@@ -0,0 +1,84 @@
+# neural_battler/tests/test_entities.py
+"""EntityPool (handles, swap-remove, générations) et PathogenStore (structure-of-arrays)."""
+import numpy as np
+
+from src.game.entities.immune_cell import ImmuneCell
+from src.game.entities.pathogen import Pathogen
+from src.game.systems.entity_pool import EntityPool
+from src.game.systems.pathogen_store import PathogenStore
+
+
+class Entity:
+    entity_id = None
+
+
+def test_pool_swap_remove_keeps_handles_valid():
+    pool = EntityPool()
+    a, b, c = Entity(), Entity(), Entity()
+    for entity in (a, b, c):
+        pool.add(entity)
+
+    slot, moved = pool.remove(a)
+    assert (slot, moved) == (0, c)
+    assert pool.items == [c, b]
+    assert pool.get(c.entity_id) is c and pool.slot(c.entity_id) == 0
+    assert pool.get(b.entity_id) is b
+    assert not pool.is_alive(a.entity_id) and pool.get(a.entity_id) is None
+
+    # Retirer le dernier élément ne déplace rien
+    assert pool.remove(b) == (1, None)
+    assert pool.items == [c]
+
+
+def test_pool_reused_index_gets_new_generation():
+    pool = EntityPool()
+    old = Entity()
+    pool.add(old)
+    stale = old.entity_id
+    pool.remove(old)
+
+    new = Entity()
+    pool.add(new)
+    # Même index, génération suivante: l'ancien handle ne désigne pas la nouvelle entité
+    assert new.entity_id & 0xFFFFFFFF == stale & 0xFFFFFFFF
+    assert new.entity_id != stale
+    assert pool.get(stale) is None and pool.get(new.entity_id) is new
+    assert not pool.is_alive(None)
+
+
+def test_pathogen_store_matches_pathogen_objects():
+    rng = np.random.default_rng(0)
+    store = PathogenStore(capacity=2)  # Agrandie en cours de route
+    objects = []
+    for x, y in rng.uniform(50, 750, size=(12, 2)).tolist():
+        store.add(x, y)
+        objects.append(Pathogen(x, y))
+    target = ImmuneCell(400, 300)
+    reference = ImmuneCell(400, 300)
+
+    for _ in range(600):
+        store.step_towards(target)
+        for pathogen in objects:
+            pathogen.update(None, reference)
+        assert np.allclose(store.positions[:store.count], [(p.x, p.y) for p in objects])
+        assert target.health == reference.health
+        assert store.attack_cooldown[:store.count].tolist() == [p.attack_cooldown for p in objects]
+    assert target.health < target.max_health  # Les attaques ont bien été comparées
+
+
+def test_pathogen_store_remove_dead_keeps_views_aligned():
+    store = PathogenStore()
+    views = [store.add(10.0 * i, 0.0) for i in range(6)]
+    views[1].health = 0
+    views[4].health = -3
+
+    removed = store.remove_dead()
+    assert sorted(p.x for p in removed) == [10.0, 40.0]
+    assert len(store) == 4 and store.entities == store.pool.items
+    # Chaque vue vivante lit toujours sa propre ligne après les swap-remove
+    for view in store.entities:
+        assert store.positions[view._slot, 0] == view.x
+    assert sorted(view.x for view in store.entities) == [0.0, 20.0, 30.0, 50.0]
+    # Les vues retirées gardent une copie figée de leur état
+    assert {p.health for p in removed} == {0, -3}
+    assert all(store.pool.get(p.entity_id) is None for p in removed)
@@ -0,0 +1,108 @@
+# neural_battler/tests/test_inference.py
+"""Politiques NumPy quantifiées, ModelRegistry (LRU) et InferenceServer."""
+import os
+
+import numpy as np
+import pytest
+
+from src.ai.inference.inference_server import InferenceServer
+from src.ai.inference.model_registry import ModelRegistry, policy_nbytes
+from src.ai.inference.policy import NumpyPolicy
+
+STATE_SIZE, HIDDEN, ACTIONS = 28, 64, 10
+
+
+def random_policy(seed):
+    """MLP aux dimensions de ImmuneCellNetwork, poids (sorties, entrées) comme nn.Linear"""
+    rng = np.random.default_rng(seed)
+    sizes = [STATE_SIZE, HIDDEN, HIDDEN, ACTIONS]
+    weights = [rng.normal(0, 1 / np.sqrt(n_in), size=(n_out, n_in)) for n_in, n_out in zip(sizes, sizes[1:])]
+    return NumpyPolicy(weights, [rng.normal(0, 0.1, size=n_out) for n_out in sizes[1:]])
+
+
+@pytest.mark.parametrize("mode, dtype, min_agreement", [("float16", np.float16, 0.99), ("int8", np.int8, 0.95)])
+def test_quantized_policy_agrees_with_float32(tmp_path, mode, dtype, min_agreement):
+    policy = random_policy(0)
+    path = str(tmp_path / f"policy.{mode}.npz")
+    policy.save(path, quantization=mode)
+    quantized = NumpyPolicy.load(path)
+
+    assert quantized.quantization == mode
+    assert all(weight.dtype == dtype for weight in quantized.weights)
+    states = np.random.default_rng(1).uniform(-1, 1, size=(2000, STATE_SIZE)).astype(np.float32)
+    reference = policy.forward(states)
+    q_values = quantized.forward(states)
+    assert q_values.dtype == np.float32
+    assert np.abs(q_values - reference).max() < 0.05 * np.abs(reference).max()
+    assert (quantized.act_batch(states) == policy.act_batch(states)).mean() >= min_agreement
+    # Le déquantifié relu en float32 redonne exactement les mêmes Q-valeurs
+    dequantized = NumpyPolicy(quantized.float_weights(), quantized.biases)
+    assert np.allclose(dequantized.forward(states), q_values, atol=1e-5)
+
+
+def test_float32_save_load_roundtrip(tmp_path):
+    policy = random_policy(2)
+    path = str(tmp_path / "policy.npz")
+    policy.save(path)
+    state = np.linspace(-1, 1, STATE_SIZE)
+    assert np.array_equal(NumpyPolicy.load(path).forward(state), policy.forward(state))
+
+
+def save_policies(directory, count):
+    paths = []
+    for i in range(count):
+        path = str(directory / f"policy_{i}.npz")
+        random_policy(i).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_registry_shares_policies_and_evicts_least_recent(tmp_path):
+    a, b, c = save_policies(tmp_path, 3)
+    registry = ModelRegistry(max_entries=2)
+
+    policy_a = registry.get(a, "numpy")
+    assert registry.get(a, "numpy") is policy_a
+    assert not policy_a.weights[0].flags.writeable
+    registry.get(b, "numpy")
+    registry.get(a, "numpy")  # a redevient la plus récente
+    registry.get(c, "numpy")
+
+    assert a in registry and c in registry and b not in registry
+    assert registry.stats() == {"entries": 2, "nbytes": 2 * policy_nbytes(policy_a, a), "hits": 2, "misses": 3}
+    # L'éviction n'invalide pas la politique déjà distribuée
+    assert policy_a.act(np.zeros(STATE_SIZE)) == registry.get(a, "numpy").act(np.zeros(STATE_SIZE))
+
+
+def test_registry_respects_byte_budget_and_reloads_changed_file(tmp_path):
+    a, b = save_policies(tmp_path, 2)
+    registry = ModelRegistry(max_bytes=1)
+    first = registry.get(a, "numpy")
+    assert len(registry) == 1  # Une entrée seule dépassant le budget reste servie
+    second = registry.get(b, "numpy")
+    # Au-delà du budget, seule la dernière entrée chargée est gardée
+    assert len(registry) == 1 and b in registry and a not in registry
+    assert registry.nbytes == policy_nbytes(second, b)
+
+    random_policy(7).save(a)
+    stat = os.stat(a)
+    os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    reloaded = registry.get(a, "numpy")
+    assert reloaded is not first
+    assert np.array_equal(reloaded.forward(np.ones(STATE_SIZE)), random_policy(7).forward(np.ones(STATE_SIZE)))
+
+
+def test_inference_server_matches_direct_policy():
+    policy = random_policy(3)
+    states = np.random.default_rng(4).uniform(-1, 1, size=(50, STATE_SIZE)).astype(np.float32)
+    server = InferenceServer(policy, max_batch=16, max_wait=0.001)
+    with pytest.raises(RuntimeError):
+        server.submit(states[0])
+
+    with server:
+        singles = [server.submit(state) for state in states]
+        block = server.submit_batch(states[:20])
+        assert [future.result(timeout=5) for future in singles] == policy.act_batch(states).tolist()
+        assert block.result(timeout=5).tolist() == policy.act_batch(states[:20]).tolist()
+    with pytest.raises(RuntimeError):
+        server.get_action(states[0])
@@ -0,0 +1,81 @@
+# neural_battler/tests/test_observation.py
+"""ObservationEncoder comparé à l'ancien ImmuneCellAgent.get_state (liste Python triée)."""
+import random
+
+import numpy as np
+import pytest
+
+from src.ai.models.observation import ObservationEncoder
+from src.game.world.tissue import Tissue
+
+WIDTH, HEIGHT = 800, 600
+
+
+def legacy_get_state(immune_cell, pathogens, tissue_width, tissue_height):
+    """Implémentation d'origine de get_state (5 pathogènes), en float32"""
+    cell_pos = [immune_cell.x / tissue_width, immune_cell.y / tissue_height]
+    wall_distances = [
+        immune_cell.x / tissue_width,
+        (tissue_width - immune_cell.x) / tissue_width,
+        immune_cell.y / tissue_height,
+        (tissue_height - immune_cell.y) / tissue_height
+    ]
+    pathogen_info = []
+    distances = []
+    for pathogen in pathogens:
+        dx = pathogen.x - immune_cell.x
+        dy = pathogen.y - immune_cell.y
+        distances.append((np.sqrt(dx ** 2 + dy ** 2), dx / tissue_width, dy / tissue_height,
+                          pathogen.health / pathogen.max_health))
+    distances.sort(key=lambda x: x[0])
+    for dist, dx, dy, health_ratio in distances[:5]:
+        pathogen_info.extend([dist / np.sqrt(tissue_width ** 2 + tissue_height ** 2), dx, dy, health_ratio])
+    pathogen_info.extend([0.0] * ((5 - min(5, len(distances))) * 4))
+    health_info = [immune_cell.health / immune_cell.max_health]
+    special_ready = [1.0 if immune_cell.special_ready else 0.0]
+    return np.array(cell_pos + wall_distances + pathogen_info + health_info + special_ready, dtype=np.float32)
+
+
+@pytest.mark.parametrize("num_pathogens", [0, 3, 5, 40])
+@pytest.mark.parametrize("engine", ["object", "vectorized"])
+def test_encoder_matches_legacy_get_state(num_pathogens, engine):
+    random.seed(num_pathogens)
+    tissue = Tissue(WIDTH, HEIGHT, engine=engine)
+    cell = tissue.add_immune_cell(random.uniform(0, WIDTH), random.uniform(0, HEIGHT))
+    cell.health = 73
+    cell.special_ready = False
+    for _ in range(num_pathogens):
+        pathogen = tissue.add_pathogen(random.uniform(0, WIDTH), random.uniform(0, HEIGHT))
+        pathogen.health = random.randint(1, 50)
+
+    expected = legacy_get_state(cell, tissue.pathogens, WIDTH, HEIGHT)
+    encoder = ObservationEncoder()
+    # Sans géométrie (distances recalculées) puis avec le cache du Tissue
+    assert np.allclose(encoder.encode(cell, tissue.pathogens, WIDTH, HEIGHT), expected, atol=1e-6)
+    geometry = tissue.geometry.for_cell(cell)
+    assert np.allclose(encoder.encode(cell, tissue.pathogens, WIDTH, HEIGHT, geometry), expected, atol=1e-6)
+
+
+def test_encode_batch_matches_encode_with_padding_mask():
+    rng = np.random.default_rng(0)
+    tissue = Tissue(WIDTH, HEIGHT)
+    cells = [tissue.add_immune_cell(*rng.uniform(0, [WIDTH, HEIGHT])) for _ in range(4)]
+    for x, y in rng.uniform(0, [WIDTH, HEIGHT], size=(9, 2)).tolist():
+        tissue.add_pathogen(x, y)
+    positions = np.array([(p.x, p.y) for p in tissue.pathogens])
+    health = np.array([p.health / p.max_health for p in tissue.pathogens])
+
+    # Slots vides (masqués) intercalés, comme dans VecTrainingEnvironment
+    slots = len(positions) + 3
+    padded = np.full((len(cells), slots, 2), 1e3)
+    padded[:, 3:] = positions
+    padded_health = np.zeros((len(cells), slots))
+    padded_health[:, 3:] = health
+    mask = np.zeros((len(cells), slots), dtype=bool)
+    mask[:, 3:] = True
+
+    encoder = ObservationEncoder()
+    states = encoder.encode_batch(np.array([(c.x, c.y) for c in cells]), np.ones(len(cells)), np.ones(len(cells)),
+                                  padded, padded_health, mask, WIDTH, HEIGHT)
+    for cell, state in zip(cells, states):
+        assert np.allclose(state, legacy_get_state(cell, tissue.pathogens, WIDTH, HEIGHT), atol=1e-6)
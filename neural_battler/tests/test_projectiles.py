@@ -0,0 +1,54 @@
+# neural_battler/tests/test_projectiles.py
+"""ProjectilePool: slots, croissance, retrait par propriétaire et règle de collision."""
+import numpy as np
+
+from src.game.systems.projectiles import ProjectilePool
+
+
+def test_slots_are_reused_and_pool_grows_when_full():
+    pool = ProjectilePool(capacity=2)
+    slots = [pool.spawn(10.0 * i, 0, 1, 0, 5, 5, owner=i % 2) for i in range(3)]
+    assert slots == [0, 1, 2] and pool.capacity == 4 and len(pool) == 3
+    assert pool.positions[2].tolist() == [20.0, 0.0]  # Données conservées par l'agrandissement
+
+    pool.release([1])
+    assert pool.spawn(0, 0, 0, 0, 5, 5) == 1  # Plus petit slot libre d'abord
+    assert len(pool) == 3
+
+    pool.release_owners([0])
+    assert np.flatnonzero(pool.active).tolist() == [1]
+    pool.clear()
+    assert len(pool) == 0 and not pool.active.any()
+
+
+def test_update_moves_and_drops_out_of_bounds():
+    pool = ProjectilePool()
+    pool.spawn(5, 5, -6, 0, 5, 5)
+    pool.spawn(50, 50, 3, 4, 5, 5)
+    damage = pool.update(100, 100, np.zeros((0, 2)), np.zeros(0))
+    assert damage.tolist() == []
+    assert len(pool) == 1 and pool.active_positions().tolist() == [[53.0, 54.0]]
+
+
+def test_projectile_hits_nearest_target_regardless_of_order():
+    def fire():
+        pool = ProjectilePool()
+        pool.spawn(100, 100, 1, 0, damage=10, radius=5)
+        return pool
+
+    # Deux cibles en contact après le déplacement (x=101): la plus proche prend les dégâts
+    positions = np.array([[110.0, 100.0], [103.0, 100.0]])
+    radii = np.array([10.0, 10.0])
+    assert fire().update(800, 600, positions, radii).tolist() == [0.0, 10.0]
+    assert fire().update(800, 600, positions[::-1], radii).tolist() == [10.0, 0.0]
+
+
+def test_projectile_tie_goes_to_lowest_id():
+    positions = np.array([[106.0, 100.0], [96.0, 100.0]])  # Équidistantes de x=101
+    radii = np.array([10.0, 10.0])
+    for ids, expected in (([7, 3], [0.0, 10.0]), ([3, 7], [10.0, 0.0])):
+        pool = ProjectilePool()
+        pool.spawn(100, 100, 1, 0, damage=10, radius=5)
+        damage = pool.update(800, 600, positions, radii, target_ids=lambda: np.array(ids))
+        assert damage.tolist() == expected
+        assert len(pool) == 0
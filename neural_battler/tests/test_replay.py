@@ -0,0 +1,100 @@
+# neural_battler/tests/test_replay.py
+"""Mémoires d'expériences: tampon circulaire, priorités (SumTree) et store memmap."""
+import numpy as np
+import pytest
+
+from src.ai.models.replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+from src.ai.models.replay_store import MemmapReplayStore
+
+STATE_SIZE = 3
+
+
+def transition(i):
+    return np.full(STATE_SIZE, i, dtype=np.float32), i, float(i), np.full(STATE_SIZE, -i, dtype=np.float32), i % 2
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = ReplayBuffer(4, STATE_SIZE)
+    for i in range(3):
+        buffer.add(*transition(i))
+    buffer.add_batch(*(np.array(column) for column in zip(*(transition(i) for i in range(3, 6)))))
+
+    assert len(buffer) == 4 and buffer.position == 2
+    # Les transitions 0 et 1 ont été écrasées par 4 et 5
+    assert sorted(buffer.actions[:4].ravel().tolist()) == [2, 3, 4, 5]
+    states, actions, rewards, next_states, dones = buffer.get_batch(np.array([1, 0, 3]))
+    assert actions.ravel().tolist() == [5, 4, 3]
+    assert states[:, 0].tolist() == [5.0, 4.0, 3.0] and next_states[:, 0].tolist() == [-5.0, -4.0, -3.0]
+    assert rewards.ravel().tolist() == [5.0, 4.0, 3.0] and dones.ravel().tolist() == [1.0, 0.0, 1.0]
+
+    indices = buffer.sample_indices(4)
+    assert sorted(indices.tolist()) == [0, 1, 2, 3]
+
+
+def test_sum_tree_finds_proportional_leaves():
+    tree = SumTree(5)
+    tree.update(np.arange(5), [1.0, 0.0, 2.0, 3.0, 4.0])
+    assert tree.total == 10.0
+    # Intervalles cumulés: [0,1) → 0, [1,3) → 2, [3,6) → 3, [6,10) → 4; jamais la feuille nulle 1
+    assert tree.find([0.0, 0.5, 1.0, 2.9, 3.5, 6.5, 9.99]).tolist() == [0, 0, 0, 2, 3, 4, 4]
+
+
+def test_prioritized_sampling_follows_priorities():
+    np.random.seed(0)
+    buffer = PrioritizedReplayBuffer(8, STATE_SIZE, alpha=1.0, beta=1.0, beta_increment=0.0)
+    for i in range(5):
+        buffer.add(*transition(i))
+    buffer.update_priorities(np.arange(5), [0.0, 1.0, 0.0, 3.0, np.nan])
+
+    counts = np.zeros(8)
+    for _ in range(2000):
+        indices, weights = buffer.sample_prioritized(8)
+        assert indices.max() < 5  # Jamais une feuille vide
+        assert np.isfinite(weights.numpy()).all() and weights.max() == 1.0
+        np.add.at(counts, indices, 1)
+    frequencies = counts[:5] / counts.sum()
+    priorities = np.array([0.0, 1.0, 0.0, 3.0, 0.0]) + buffer.epsilon
+    assert np.allclose(frequencies, priorities / priorities.sum(), atol=0.02)
+
+
+def test_prioritized_buffer_save_load_roundtrip(tmp_path):
+    buffer = PrioritizedReplayBuffer(8, STATE_SIZE)
+    for i in range(6):
+        buffer.add(*transition(i))
+    buffer.update_priorities([1, 4], [2.0, 0.5])
+    path = str(tmp_path / "memory.npz")
+    buffer.save(path)
+
+    restored = PrioritizedReplayBuffer(8, STATE_SIZE)
+    restored.load(path)
+    assert len(restored) == 6 and restored.max_priority == buffer.max_priority
+    assert np.array_equal(restored.tree.get(np.arange(8)), buffer.tree.get(np.arange(8)))
+
+
+def test_memmap_store_rows_persist_and_follow_request_order(tmp_path):
+    path = str(tmp_path / "replay")
+    store = MemmapReplayStore.create(path, STATE_SIZE, segment_capacity=4, num_segments=2)
+    for i in range(6):  # Le segment 0 déborde: 4 et 5 écrasent 0 et 1
+        store.add(*transition(i))
+    other = MemmapReplayStore.open(path, STATE_SIZE, writer=1)
+    other.add(*transition(9))
+    store.flush()
+    other.flush()
+
+    reopened = MemmapReplayStore.open(path, STATE_SIZE)
+    assert len(reopened) == 5 and reopened.size == 4 and reopened.position == 2
+    states, actions, _, next_states, _ = reopened.get_batch(np.array([4, 1, 3, 0]))
+    assert actions.ravel().tolist() == [9, 5, 3, 4]
+    assert states[:, 0].tolist() == [9.0, 5.0, 3.0, 4.0] and next_states[:, 0].tolist() == [-9.0, -5.0, -3.0, -4.0]
+
+    drawn = reopened.sample_indices(200)
+    assert set(drawn.tolist()) <= {0, 1, 2, 3, 4}
+
+
+def test_memmap_store_create_refuses_to_overwrite(tmp_path):
+    path = str(tmp_path / "replay")
+    MemmapReplayStore.create(path, STATE_SIZE, segment_capacity=4).add(*transition(1))
+    with pytest.raises(FileExistsError):
+        MemmapReplayStore.create(path, STATE_SIZE, segment_capacity=4)
+    assert len(MemmapReplayStore.open(path, STATE_SIZE)) == 1
+    assert len(MemmapReplayStore.create(path, STATE_SIZE, segment_capacity=4, overwrite=True)) == 0
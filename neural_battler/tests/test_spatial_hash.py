@@ -0,0 +1,68 @@
+# neural_battler/tests/test_spatial_hash.py
+"""SpatialHashGrid comparée à une recherche exhaustive."""
+import numpy as np
+import pytest
+
+from src.game.systems.spatial_hash import SpatialHashGrid
+
+
+class Item:
+    pass
+
+
+def brute_radius(positions, point, radius):
+    distance_sq = ((positions - point) ** 2).sum(axis=1)
+    return set(np.flatnonzero(distance_sq <= radius * radius).tolist())
+
+
+def brute_knn_distances(positions, point, k):
+    return np.sort(((positions - point) ** 2).sum(axis=1))[:k]
+
+
+def populated_grid(rng, cell_size, n):
+    """Grille après insertions, déplacements et retraits; retourne (grille, éléments, positions)"""
+    grid = SpatialHashGrid(cell_size)
+    items = [Item() for _ in range(n)]
+    positions = rng.uniform(-100, 900, size=(n, 2))
+    for item, (x, y) in zip(items, positions.tolist()):
+        grid.insert(item, x, y)
+    moved = rng.uniform(0, 800, size=(n // 3, 2))
+    grid.move_many(items[:n // 3], moved)
+    positions[:n // 3] = moved
+    for i in range(0, n, 7):
+        grid.remove(items[i])
+    alive = [i for i in range(n) if i % 7]
+    return grid, [items[i] for i in alive], positions[alive]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_queries_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    grid, items, positions = populated_grid(rng, rng.uniform(20, 150), int(rng.integers(1, 80)))
+    index = {id(item): i for i, item in enumerate(items)}
+    # Points dans et très loin de la zone occupée (recherche par anneaux bornée)
+    points = np.vstack([rng.uniform(-200, 1000, size=(20, 2)), [[1e5, -1e5]]])
+    radius = rng.uniform(0, 300)
+    k = int(rng.integers(1, 12))
+
+    batch_radius = grid.query_radius_batch(points, radius)
+    batch_knn = grid.query_knn_batch(points, k)
+    for point, found_batch, nearest_batch in zip(points, batch_radius, batch_knn):
+        expected = brute_radius(positions, point, radius)
+        assert {index[id(item)] for item in grid.query_radius(*point, radius)} == expected
+        assert {index[id(item)] for item in found_batch} == expected
+
+        distances = brute_knn_distances(positions, point, k)
+        for nearest in (grid.query_knn(*point, k), nearest_batch):
+            found = positions[[index[id(item)] for item in nearest]]
+            assert np.allclose(((found - point) ** 2).sum(axis=1), distances)
+
+
+def test_empty_grid_and_degenerate_queries():
+    grid = SpatialHashGrid(50)
+    assert grid.query_knn(0, 0, 3) == [] and grid.query_radius(0, 0, 10) == []
+    assert grid.query_knn_batch(np.zeros((2, 2)), 3) == [[], []]
+    item = Item()
+    grid.insert(item, 10, 10)
+    assert grid.query_knn(0, 0, 0) == []
+    assert grid.query_knn_batch([[0, 0]], 5) == [[item]]
@@ -0,0 +1,63 @@
+# neural_battler/tests/test_training.py
+"""CheckpointManager (rétention, index) et reprise d'un entraînement depuis un instantané."""
+import json
+import os
+
+import torch
+
+from src.ai.models.checkpoint import CheckpointManager
+from src.ai.models.immune_cell_model import ImmuneCellAgent
+from src.ai.training.train import train_immune_cell
+
+
+def saved_names(manager):
+    return sorted(os.path.basename(c["path"]) for c in manager.checkpoints)
+
+
+def test_checkpoint_retention_keeps_recent_best_and_pinned(tmp_path):
+    agent = ImmuneCellAgent(state_size=8)
+    directory = str(tmp_path)
+    with CheckpointManager(directory, "run", keep_last=2, keep_best=1) as manager:
+        for i, score in enumerate([5.0, 9.0, 1.0, None, 2.0]):
+            manager.save(agent, f"episode_{i}", score=score)
+        manager.save(agent, "final", pinned=True)
+        manager.wait()
+        # Les 2 plus récents (3, 4), le meilleur score (1) et le modèle final épinglé
+        expected = ["run_episode_1.pt", "run_episode_3.pt", "run_episode_4.pt", "run_final.pt"]
+        assert saved_names(manager) == expected
+        assert sorted(name for name in os.listdir(directory) if name.endswith(".pt")) == expected
+        assert manager.best() == manager.path_for("episode_1")
+
+    with open(os.path.join(directory, "run.checkpoints.json"), encoding="utf-8") as f:
+        assert sorted(os.path.basename(c["path"]) for c in json.load(f)) == expected
+    # L'index est relu au redémarrage: la rétention continue sur les checkpoints existants
+    with CheckpointManager(directory, "run", keep_last=2, keep_best=1) as manager:
+        manager.save(agent, "episode_5", score=0.0)
+        manager.wait()
+        assert saved_names(manager) == ["run_episode_1.pt", "run_episode_4.pt", "run_episode_5.pt", "run_final.pt"]
+    loaded = ImmuneCellAgent(state_size=8)
+    loaded.load(os.path.join(directory, "run_final.pt"))
+    assert all(torch.equal(a, b) for a, b in zip(loaded.policy_network.state_dict().values(),
+                                                 agent.policy_network.state_dict().values()))
+
+
+def final_weights(model_path):
+    return torch.load(model_path)["policy_network"]
+
+
+def test_resume_reproduces_uninterrupted_run(tmp_path, monkeypatch):
+    options = dict(batch_size=32, save_interval=2, seed=0, eval_episodes=1)
+    # Chaque run dans son dossier: run_id est horodaté à la seconde
+    for name in ("full", "resumed"):
+        (tmp_path / name).mkdir()
+    monkeypatch.chdir(tmp_path / "full")
+    _, uninterrupted = train_immune_cell(episodes=4, **options)
+    reference = final_weights(uninterrupted)
+
+    monkeypatch.chdir(tmp_path / "resumed")
+    _, interrupted = train_immune_cell(episodes=2, **options)
+    run_id = os.path.basename(interrupted).split("immune_cell_model_")[1].split("_final")[0]
+    _, resumed = train_immune_cell(episodes=4, resume=run_id, **options)
+    weights = final_weights(resumed)
+    assert weights.keys() == reference.keys()
+    assert all(torch.equal(weights[name], reference[name]) for name in reference)
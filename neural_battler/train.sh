@@ -20,4 +20,6 @@ PROJECT_DIR="/gpfs/workdir/usureauc/RLG/neural_battler"
 cd $PROJECT_DIR
 
 # Lancer l'entraînement directement avec le script Python
-python $PROJECT_DIR/train_all.py train --episodes 3000 --batch-size 128 --save-interval 100
\ No newline at end of file
+# --resume latest: un job relancé après préemption reprend le dernier run inachevé
+# (instantanés dans data/resume/), sinon un nouveau run commence
+python $PROJECT_DIR/train_all.py train --episodes 3000 --batch-size 128 --save-interval 100 --resume latest
\ No newline at end of file
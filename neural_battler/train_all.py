@@ -11,17 +11,12 @@ sys.path.insert(0, str(root_dir))
 os.chdir(root_dir)
 
 import argparse
-import torch
-import numpy as np
-import time
-from datetime import datetime
-import json
-import multiprocessing
-
-# Importer directement les fonctions d'entraînement au lieu de les redéfinir
-from src.ai.training.train import train_immune_cell
-from src.ai.training.evaluate import evaluate_model
-from src.ai.training.batch_training import run_batch_training, run_parallel_training
+
+# Seules les constantes des options sont importées ici (modules sans torch);
+# chaque commande importe ses fonctions, et donc torch ou matplotlib, à l'exécution
+from src.ai.training.throughput import HISTORY_PATH
+from src.ai.inference.export import FORMATS
+from src.ai.inference.quantization import MODES
 
 def main():
     # Create argument parser
@@ -34,6 +29,33 @@ def main():
     train_parser.add_argument("--batch-size", type=int, default=64, help="Batch size for training")
     train_parser.add_argument("--save-interval", type=int, default=10, help="Interval for saving the model")
     train_parser.add_argument("--model", type=str, default=None, help="Path to an existing model to continue training")
+    train_parser.add_argument("--engine", type=str, default="object", choices=["object", "vectorized"],
+                              help="Tissue simulation engine")
+    train_parser.add_argument("--num-pathogens", type=int, default=5,
+                              help="Number of nearest pathogens in the observation")
+    train_parser.add_argument("--prioritized", action="store_true", help="Use prioritized experience replay")
+    train_parser.add_argument("--replay-dir", type=str, default=None,
+                              help="Directory of an on-disk replay store (e.g. data/replay/run1)")
+    train_parser.add_argument("--replay-capacity", type=int, default=1_000_000,
+                              help="Capacity of the on-disk replay store")
+    train_parser.add_argument("--action-repeat", type=int, default=1,
+                              help="Simulation ticks each chosen action is repeated for (frame-skip)")
+    train_parser.add_argument("--profile", type=int, default=0, metavar="N",
+                              help="Print a per-phase timing breakdown every N episodes (0 disables)")
+    train_parser.add_argument("--keep-last", type=int, default=3, help="Most recent periodic checkpoints to keep")
+    train_parser.add_argument("--keep-best", type=int, default=2,
+                              help="Periodic checkpoints with the best greedy evaluation reward to keep")
+    train_parser.add_argument("--eval-episodes", type=int, default=3,
+                              help="Greedy evaluation episodes run at each save to score checkpoints (0 disables)")
+    train_parser.add_argument("--resume", type=str, default=None,
+                              help="Resume a run from its snapshot: snapshot directory, run id, or 'latest' "
+                                   "(most recent unfinished run; starts fresh if there is none)")
+    train_parser.add_argument("--snapshot-interval", type=int, default=None,
+                              help="Episodes between full resumable snapshots "
+                                   "(defaults to --save-interval, 0 disables)")
+    train_parser.add_argument("--num-envs", type=int, default=1,
+                              help="Episodes simulated in lockstep by the vectorized environment, one batched "
+                                   "action selection and one update per step (1: single-episode trainer)")
 
     # Parser for 'batch' command
     batch_parser = subparsers.add_parser("batch", help="Run batch training")
@@ -43,12 +65,93 @@ def main():
     batch_parser.add_argument("--save-interval", type=int, default=100, help="Interval for saving the model")
     batch_parser.add_argument("--base-model", type=str, default=None, help="Base model for all sessions")
     batch_parser.add_argument("--parallel", type=int, default=1, help="Number of parallel processes")
+    batch_parser.add_argument("--replay-dir", type=str, default=None,
+                              help="On-disk replay store shared by all processes")
+    batch_parser.add_argument("--replay-capacity", type=int, default=1_000_000,
+                              help="Capacity of the on-disk replay store per process")
+    batch_parser.add_argument("--action-repeat", type=int, default=1,
+                              help="Simulation ticks each chosen action is repeated for (frame-skip)")
+
+    # Parser for 'distributed' command
+    dist_parser = subparsers.add_parser("distributed", help="Train with parallel actor processes and one learner")
+    dist_parser.add_argument("--actors", type=int, default=4, help="Number of actor processes")
+    dist_parser.add_argument("--steps", type=int, default=1_000_000, help="Total environment steps")
+    dist_parser.add_argument("--batch-size", type=int, default=64, help="Batch size for training")
+    dist_parser.add_argument("--sync-interval", type=int, default=100,
+                             help="Learner updates between weight broadcasts to the actors")
+    dist_parser.add_argument("--ring-capacity", type=int, default=4096,
+                             help="Capacity of each actor's shared-memory experience ring")
+    dist_parser.add_argument("--memory-size", type=int, default=100_000, help="Learner replay buffer capacity")
+    dist_parser.add_argument("--model", type=str, default=None, help="Path to an existing model to continue training")
+    dist_parser.add_argument("--engine", type=str, default="object", choices=["object", "vectorized"],
+                             help="Tissue simulation engine")
+    dist_parser.add_argument("--num-pathogens", type=int, default=5,
+                             help="Number of nearest pathogens in the observation")
+    dist_parser.add_argument("--prioritized", action="store_true", help="Use prioritized experience replay")
+    dist_parser.add_argument("--action-repeat", type=int, default=1,
+                             help="Simulation ticks each chosen action is repeated for (frame-skip)")
+    dist_parser.add_argument("--keep-last", type=int, default=3, help="Most recent periodic checkpoints to keep")
+    dist_parser.add_argument("--keep-best", type=int, default=2,
+                             help="Periodic checkpoints with the best greedy evaluation reward to keep")
+    dist_parser.add_argument("--eval-episodes", type=int, default=3,
+                             help="Greedy evaluation episodes run at each save to score checkpoints (0 disables)")
+
+    # Parser for 'bench' command
+    bench_parser = subparsers.add_parser("bench", help="Measure end-to-end training and evaluation throughput")
+    bench_parser.add_argument("--train-steps", type=int, default=5000, help="Environment steps of training")
+    bench_parser.add_argument("--eval-episodes", type=int, default=5, help="Evaluation episodes")
+    bench_parser.add_argument("--eval-steps", type=int, default=1000, help="Maximum steps per evaluation episode")
+    bench_parser.add_argument("--batch-size", type=int, default=64, help="Batch size for training")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Random seed of both slices")
+    bench_parser.add_argument("--engine", type=str, default="object", choices=["object", "vectorized"],
+                              help="Tissue simulation engine")
+    bench_parser.add_argument("--num-envs", type=int, default=1,
+                              help="Train on the vectorized environment with this many episodes in lockstep")
+    bench_parser.add_argument("--threads", type=int, default=None,
+                              help="torch thread count (defaults to torch's own choice)")
+    bench_parser.add_argument("--history", type=str, default=HISTORY_PATH,
+                              help="JSON-lines file each run is appended to")
 
     # Parser for 'evaluate' command
     eval_parser = subparsers.add_parser("evaluate", help="Evaluate a model")
     eval_parser.add_argument("--model", type=str, required=True, help="Path to the model to evaluate")
     eval_parser.add_argument("--episodes", type=int, default=50, help="Number of evaluation episodes")
     eval_parser.add_argument("--steps", type=int, default=1000, help="Maximum number of steps per episode")
+    eval_parser.add_argument("--profile", type=int, default=0, metavar="N",
+                             help="Print a per-phase timing breakdown every N episodes (0 disables)")
+
+    # Parser for 'report' command
+    report_parser = subparsers.add_parser("report", help="Summarize and plot the metrics of a training run")
+    report_parser.add_argument("--run", type=str, default=None,
+                               help="Run id or metrics path prefix (defaults to the most recent run)")
+    report_parser.add_argument("--output", type=str, default=None,
+                               help="Path of the plot (defaults to data/stats/training_performance_<run>.png)")
+    report_parser.add_argument("--window", type=int, default=100, help="Episodes in the rolling means")
+    report_parser.add_argument("--no-plot", action="store_true", help="Only print the summary")
+    report_parser.add_argument("--follow", type=float, default=0, metavar="SECONDS",
+                               help="Reprint the summary every SECONDS while the run trains (Ctrl-C to stop)")
+
+    # Parser for 'export' command
+    export_parser = subparsers.add_parser("export", help="Export a model as frozen inference-only artifacts")
+    export_parser.add_argument("--model", type=str, required=True, help="Path to the checkpoint to export")
+    export_parser.add_argument("--output-dir", type=str, default=None,
+                               help="Output directory (defaults to the checkpoint's directory)")
+    export_parser.add_argument("--formats", type=str, nargs="+", default=list(FORMATS), choices=FORMATS,
+                               help="Artifact formats to write")
+    export_parser.add_argument("--benchmark", action="store_true",
+                               help="Compare load time and per-call latency against the checkpoint path")
+
+    # Parser for 'quantize' command
+    quantize_parser = subparsers.add_parser("quantize", help="Quantize a model and compare it to float32")
+    quantize_parser.add_argument("--model", type=str, required=True, help="Path to the checkpoint to quantize")
+    quantize_parser.add_argument("--modes", type=str, nargs="+", default=list(MODES), choices=MODES,
+                                 help="Quantization modes")
+    quantize_parser.add_argument("--output-dir", type=str, default=None,
+                                 help="Output directory (defaults to the checkpoint's directory)")
+    quantize_parser.add_argument("--episodes", type=int, default=10, help="Evaluation episodes per model")
+    quantize_parser.add_argument("--steps", type=int, default=1000, help="Maximum number of steps per episode")
+    quantize_parser.add_argument("--states", type=int, default=5000,
+                                 help="Rollout states used to measure action agreement")
 
     # Parse arguments
     args = parser.parse_args()
@@ -59,26 +162,67 @@ def main():
         print(f"Episodes: {args.episodes}")
         print(f"Batch size: {args.batch_size}")
         print(f"Save interval: {args.save_interval}")
+        print(f"Action repeat: {args.action_repeat}")
         if args.model:
             print(f"Continuing from model: {args.model}")
+        if args.resume:
+            print(f"Resuming: {args.resume}")
+
+        if args.num_envs > 1:
+            if args.resume or args.replay_dir:
+                parser.error("--num-envs does not support --resume or --replay-dir")
+            print(f"Vectorized environments: {args.num_envs}")
+            from src.ai.training.vec_train import train_vectorized
+            agent, model_path = train_vectorized(
+                episodes=args.episodes,
+                num_envs=args.num_envs,
+                batch_size=args.batch_size,
+                save_interval=args.save_interval,
+                model_path=args.model,
+                num_pathogens=args.num_pathogens,
+                prioritized=args.prioritized,
+                action_repeat=args.action_repeat,
+                keep_last=args.keep_last,
+                keep_best=args.keep_best,
+                eval_episodes=args.eval_episodes,
+            )
+            print(f"Training complete! Model saved to: {model_path}")
+            return
 
+        from src.ai.training.train import train_immune_cell
         agent, model_path = train_immune_cell(
             episodes=args.episodes,
             batch_size=args.batch_size,
             save_interval=args.save_interval,
             model_path=args.model,
+            engine=args.engine,
+            num_pathogens=args.num_pathogens,
+            prioritized=args.prioritized,
+            replay_path=args.replay_dir,
+            replay_capacity=args.replay_capacity,
+            action_repeat=args.action_repeat,
+            profile_interval=args.profile,
+            keep_last=args.keep_last,
+            keep_best=args.keep_best,
+            resume=args.resume,
+            snapshot_interval=args.snapshot_interval,
+            eval_episodes=args.eval_episodes,
         )
 
         print(f"Training complete! Model saved to: {model_path}")
 
     elif args.command == "batch":
         print("=== Batch Training Mode ===")
+        from src.ai.training.batch_training import run_batch_training, run_parallel_training
         config = {
             "num_sessions": args.sessions,
             "episodes": args.episodes,
             "batch_size": args.batch_size,
             "save_interval": args.save_interval,
-            "base_model_path": args.base_model
+            "base_model_path": args.base_model,
+            "replay_path": args.replay_dir,
+            "replay_capacity": args.replay_capacity,
+            "action_repeat": args.action_repeat,
         }
 
         if args.parallel > 1:
@@ -88,6 +232,97 @@ def main():
             print("Running sequentially")
             run_batch_training(config)
 
+    elif args.command == "distributed":
+        print("=== Distributed Training Mode ===")
+        print(f"Actors: {args.actors}")
+        print(f"Total steps: {args.steps}")
+        print(f"Sync interval: {args.sync_interval} updates")
+
+        from src.ai.training.distributed import train_distributed
+        agent, model_path = train_distributed(
+            num_actors=args.actors,
+            total_steps=args.steps,
+            batch_size=args.batch_size,
+            sync_interval=args.sync_interval,
+            ring_capacity=args.ring_capacity,
+            memory_size=args.memory_size,
+            model_path=args.model,
+            engine=args.engine,
+            num_pathogens=args.num_pathogens,
+            prioritized=args.prioritized,
+            action_repeat=args.action_repeat,
+            keep_last=args.keep_last,
+            keep_best=args.keep_best,
+            eval_episodes=args.eval_episodes,
+        )
+
+        print(f"Training complete! Model saved to: {model_path}")
+
+    elif args.command == "bench":
+        print("=== Throughput Benchmark ===")
+        from src.ai.training.throughput import append_history, format_record, load_history, run_throughput_benchmark
+        record = run_throughput_benchmark(
+            train_steps=args.train_steps,
+            eval_episodes=args.eval_episodes,
+            eval_steps=args.eval_steps,
+            batch_size=args.batch_size,
+            seed=args.seed,
+            engine=args.engine,
+            threads=args.threads,
+            num_envs=args.num_envs,
+        )
+        # Dernière mesure de la même configuration sur la même machine, pour repérer les régressions
+        previous = [r for r in load_history(args.history)
+                    if r["config"] == record["config"] and r["machine"]["cpu_model"] == record["machine"]["cpu_model"]
+                    and r["machine"]["torch_threads"] == record["machine"]["torch_threads"]]
+        print(format_record(record, previous[-1] if previous else None))
+        append_history(record, args.history)
+        print(f"Appended to: {args.history}")
+
+    elif args.command == "report":
+        from src.ai.training.report import format_summary, plot_run, resolve_run, summarize_run
+        prefix = resolve_run(args.run)
+        print(f"=== Report: {prefix} ===")
+        print(format_summary(summarize_run(prefix, args.window), args.window))
+        if args.follow > 0:
+            import time
+            try:
+                while True:
+                    time.sleep(args.follow)
+                    print(format_summary(summarize_run(prefix, args.window), args.window))
+            except KeyboardInterrupt:
+                pass
+        if not args.no_plot:
+            print(f"Plot written to: {plot_run(prefix, args.output, args.window)}")
+
+    elif args.command == "export":
+        print("=== Export Mode ===")
+        if not os.path.exists(args.model):
+            print(f"Error: Model file '{args.model}' does not exist.")
+            return
+
+        from src.ai.inference.export import benchmark_loading, export_model
+        manifest_path = export_model(args.model, args.output_dir, args.formats)
+        print(f"Manifest written to: {manifest_path}")
+
+        if args.benchmark:
+            for name, result in benchmark_loading(args.model, manifest_path).items():
+                print(f"{name:>20}: load {result['load_ms']:8.1f} ms, {result['call_us']:7.1f} us/call")
+
+    elif args.command == "quantize":
+        print("=== Quantization Mode ===")
+        if not os.path.exists(args.model):
+            print(f"Error: Model file '{args.model}' does not exist.")
+            return
+
+        from src.ai.inference.quantization import format_report, quantization_report, quantize_model
+        manifests = [quantize_model(args.model, mode, args.output_dir) for mode in args.modes]
+        for manifest_path in manifests:
+            print(f"Manifest written to: {manifest_path}")
+
+        report = quantization_report(args.model, manifests, args.states, args.episodes, args.steps)
+        print(format_report(report))
+
     elif args.command == "evaluate":
         print("=== Evaluation Mode ===")
         print(f"Model: {args.model}")
@@ -98,7 +333,8 @@ def main():
             print(f"Error: Model file '{args.model}' does not exist.")
             return
 
-        results = evaluate_model(args.model, args.episodes, args.steps)
+        from src.ai.training.evaluate import evaluate_model
+        results = evaluate_model(args.model, args.episodes, args.steps, profile_interval=args.profile)
 
     else:
         parser.print_help()